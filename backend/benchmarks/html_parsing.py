@@ -0,0 +1,92 @@
+"""
+Compare full-page parsing with targeted parsing over the saved HTML fixtures.
+
+Run from the backend directory:
+    python -m benchmarks.html_parsing [--repeat N]
+"""
+import argparse
+import os
+import time
+from bs4 import BeautifulSoup
+from services import html_parsing
+from services.bs_scrape_service import (
+    extract_author_profile,
+    extract_author_results,
+    extract_book_description,
+    extract_first_book_path,
+    extract_first_wikiquote_path,
+    extract_quote_of_the_day,
+    extract_wikiquote_quotes,
+)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures", "html")
+
+# (fixture file, parse-only filter, extractor) for each page the scrapers read
+PAGES = [
+    ("openlibrary_search.html", html_parsing.AUTHOR_SEARCH_RESULTS, extract_author_results),
+    ("openlibrary_search.html", html_parsing.BOOK_SEARCH_RESULTS, extract_first_book_path),
+    ("openlibrary_author.html", html_parsing.AUTHOR_PROFILE, extract_author_profile),
+    ("openlibrary_book.html", html_parsing.BOOK_DESCRIPTION, extract_book_description),
+    ("wikiquote_main_page.html", html_parsing.QUOTE_OF_THE_DAY, extract_quote_of_the_day),
+    ("wikiquote_search.html", html_parsing.WIKIQUOTE_SEARCH_RESULTS, extract_first_wikiquote_path),
+    ("wikiquote_author.html", html_parsing.WIKIQUOTE_CONTENT, extract_wikiquote_quotes),
+]
+
+
+def load_fixture(name):
+    """
+    Return the contents of a saved HTML fixture.
+    """
+    with open(os.path.join(FIXTURES_DIR, name), encoding="utf-8") as f:
+        return f.read()
+
+
+def full_parse(markup, extractor):
+    """
+    Extract the way the scrapers used to: a complete html.parser tree of the page.
+    """
+    return extractor(BeautifulSoup(markup, "html.parser"))
+
+
+def targeted_parse(markup, extractor, only):
+    """
+    Extract the way the scrapers do now: the fastest parser, restricted to the needed subtrees.
+    """
+    return extractor(html_parsing.parse_html(markup, only))
+
+
+def best_time(func, repeat):
+    """
+    Return the fastest of `repeat` runs of func, in milliseconds.
+    """
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs targeted HTML parsing.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per page; the fastest is reported.")
+    args = parser.parse_args()
+
+    print(f"Targeted parser: {html_parsing.PARSER}")
+    print(f"{'page':<28}{'extractor':<30}{'size KB':>9}{'full ms':>10}{'targeted ms':>13}{'speedup':>9}  same")
+    mismatches = 0
+    for name, only, extractor in PAGES:
+        markup = load_fixture(name)
+        same = full_parse(markup, extractor) == targeted_parse(markup, extractor, only)
+        mismatches += not same
+        full_ms = best_time(lambda: full_parse(markup, extractor), args.repeat)
+        targeted_ms = best_time(lambda: targeted_parse(markup, extractor, only), args.repeat)
+        print(
+            f"{name:<28}{extractor.__name__:<30}{len(markup) / 1024:>9.0f}"
+            f"{full_ms:>10.1f}{targeted_ms:>13.1f}{full_ms / targeted_ms:>8.1f}x  {'yes' if same else 'NO'}"
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,14 @@
-from .db import get_db_connection, initialize_database  # Expose database connection and initialization
-from .models import add_book_to_library, get_all_books, is_book_in_library_by_title, update_book_status_in_db  # Expose model functions
+from .db import get_db_connection, get_pool_stats, initialize_database  # Expose database connection and initialization
+from .models import add_book_to_library, get_all_books, get_books_page, is_book_in_library_by_title, update_book_status_in_db  # Expose model functions
 
 # Define what is accessible when importing the `database` package
 __all__ = [
     "get_db_connection",
+    "get_pool_stats",
     "initialize_database",
     "add_book_to_library",
     "get_all_books",
+    "get_books_page",
     "is_book_in_library_by_title",
     "update_book_status_in_db",
 ]
\ No newline at end of file
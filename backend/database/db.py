@@ -1,43 +1,434 @@
+import atexit
+import json
+import os
 import sqlite3
+import threading
 import time
-from functools import wraps
+from contextlib import contextmanager
+from database.normalize import author_name_key, author_sort_key, normalize_title
 
-# In-memory rate-limiting storage
-rate_limit_cache = {}
+# Pragmas applied to every pooled connection
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",        # Readers no longer block on writers (persists in the file)
+    "PRAGMA synchronous = NORMAL",      # Safe with WAL and skips an fsync on every commit
+    "PRAGMA cache_size = -20000",       # Roughly 20 MB of page cache per connection
+    "PRAGMA mmap_size = 268435456",     # Memory-map up to 256 MB of the database file
+    "PRAGMA busy_timeout = 5000",       # Wait up to 5 seconds for a lock instead of failing
+    "PRAGMA temp_store = MEMORY",       # Keep temporary sort tables off disk
+)
 
-def rate_limit(limit_seconds):
+
+class ConnectionPool:
+    """
+    A bounded pool of SQLite connections shared between threads.
+    A thread that already holds a connection gets the same one back, so nested
+    calls share a single connection and transaction.
+    """
+
+    def __init__(self, path, max_size=8, timeout=30):
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = []  # LIFO, so the most recently used (warmest) connection is handed out first
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._stats = {"opened": 0, "checkouts": 0, "reused": 0, "nested": 0, "waits": 0}
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Enable dictionary-like row access
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        """
+        Check out a connection, reusing the one this thread already holds if any.
+        """
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            self._local.depth += 1
+            with self._cond:
+                self._stats["checkouts"] += 1
+                self._stats["nested"] += 1
+            return held
+
+        conn = None
+        with self._cond:
+            if self._closed:
+                raise sqlite3.OperationalError("The connection pool has been closed.")
+            self._stats["checkouts"] += 1
+            deadline = time.monotonic() + self.timeout
+            while not self._idle and self._size >= self.max_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise sqlite3.OperationalError("Timed out waiting for a database connection.")
+                self._stats["waits"] += 1
+                self._cond.wait(remaining)
+            if self._idle:
+                conn = self._idle.pop()
+                self._stats["reused"] += 1
+            else:
+                self._size += 1  # Reserve the slot before connecting outside the lock
+
+        if conn is None:
+            try:
+                conn = self._connect()
+            except sqlite3.Error:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._stats["opened"] += 1
+
+        self._local.conn = conn
+        self._local.depth = 1
+        return conn
+
+    def release(self, conn):
+        """
+        Return a connection to the pool once the outermost checkout is done with it.
+        """
+        self._local.depth -= 1
+        if self._local.depth > 0:
+            return
+        self._local.conn = None
+
+        if conn.in_transaction:
+            conn.rollback()  # Never hand out a connection with a half-finished transaction
+
+        with self._cond:
+            if self._closed:
+                conn.close()
+                self._size -= 1
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    def is_outermost(self):
+        """
+        Return True if the calling thread holds exactly one checkout.
+        """
+        return getattr(self._local, "depth", 0) == 1
+
+    def close(self):
+        """
+        Close all idle connections. Connections in use are closed when released.
+        """
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                self._idle.pop().close()
+                self._size -= 1
+            self._cond.notify_all()
+
+    def stats(self):
+        """
+        Return a snapshot of the pool's size and usage counters.
+        """
+        with self._cond:
+            return {
+                "path": self.path,
+                "max_size": self.max_size,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                **self._stats,
+            }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    """
+    Return the process-wide connection pool, creating it on first use.
+    Settings are read lazily so values loaded from .env are picked up.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    os.getenv("DATABASE_PATH", "library.db"),
+                    max_size=int(os.getenv("DB_POOL_SIZE", "8")),
+                )
+    return _pool
+
+
+def configure_database(path=None, pool_size=None):
     """
-    Decorator to enforce rate limiting for a function.
+    Close the current pool and point future connections at a different database.
     """
-    def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            user_key = func.__name__  # Use the function name as the key
-            current_time = time.time()
-            if user_key in rate_limit_cache:
-                last_called = rate_limit_cache[user_key]
-                if current_time - last_called < limit_seconds:
-                    raise Exception(f"Rate limit exceeded. Try again in {limit_seconds - (current_time - last_called):.2f} seconds.")
-            rate_limit_cache[user_key] = current_time
-            return func(*args, **kwargs)
-        return wrapper
-    return decorator
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+        _pool = ConnectionPool(
+            path or os.getenv("DATABASE_PATH", "library.db"),
+            max_size=pool_size or int(os.getenv("DB_POOL_SIZE", "8")),
+        )
+
+
+def close_pool():
+    """
+    Close every idle pooled connection.
+    """
+    if _pool is not None:
+        _pool.close()
+
 
+atexit.register(close_pool)
 
+
+def get_pool_stats():
+    """
+    Return usage statistics for the connection pool.
+    """
+    return _get_pool().stats()
+
+
+@contextmanager
 def get_db_connection():
     """
-    Create and return a database connection.
+    Borrow a pooled database connection for the duration of a `with` block.
+    The outermost block commits on success and rolls back on error. Model functions leave
+    committing to it, so calls made inside an outer block join that block's transaction.
     """
+    pool = _get_pool()
     try:
-        conn = sqlite3.connect("library.db")
-        conn.row_factory = sqlite3.Row  # Enable dictionary-like row access
-        return conn
+        conn = pool.acquire()
     except sqlite3.Error as e:
         print(f"Error connecting to the database: {e}")
         raise
 
+    outermost = pool.is_outermost()
+    try:
+        yield conn
+        if outermost:
+            conn.commit()
+    except BaseException:
+        if outermost:
+            conn.rollback()
+        raise
+    finally:
+        pool.release(conn)
+
+
+def _add_column_if_missing(cursor, table, column, definition):
+    """
+    Add a column to an existing table if it isn't there yet.
+    """
+    columns = {row["name"] for row in cursor.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+
+
+# Authors are grouped by author_name_key(), computed in Python, so the same spellings are one
+# author here and in author resolution. Inserts link authors through link_book_authors();
+# deletes are handled by a trigger, since they need no keys
+AUTHOR_DELETE_TRIGGER = """
+    CREATE TRIGGER IF NOT EXISTS library_authors_ad AFTER DELETE ON library BEGIN
+        DELETE FROM authors
+        WHERE id IN (SELECT author_id FROM book_authors WHERE book_id = old.id)
+          AND NOT EXISTS (SELECT 1 FROM book_authors WHERE author_id = authors.id AND book_id <> old.id);
+        DELETE FROM book_authors WHERE book_id = old.id;
+    END
+"""
+# Triggers from before the keys were computed in Python; they matched on lower(trim(name))
+OLD_AUTHOR_TRIGGERS = ("library_authors_ai", "library_authors_au", "library_authors_ad")
+
+
+def _parse_authors(value):
+    """
+    Return the list of author names stored in a library row's authors column.
+    """
+    try:
+        authors = json.loads(value) if value else []
+    except ValueError:
+        return []
+    return authors if isinstance(authors, list) else [authors]
+
+
+def link_book_authors(cursor, book_id, authors):
+    """
+    Record a book's authors in the authors and book_authors tables.
+    Call inside the same transaction as the insert into library.
+    """
+    for position, name in enumerate(authors):
+        name = name.strip() if isinstance(name, str) else ""
+        name_key = author_name_key(name)
+        if not name_key:
+            continue
+        cursor.execute("INSERT OR IGNORE INTO authors (name, name_key) VALUES (?, ?)", (name, name_key))
+        cursor.execute("""
+            INSERT OR IGNORE INTO book_authors (book_id, author_id, position)
+            SELECT ?, id, ? FROM authors WHERE name_key = ?
+        """, (book_id, position, name_key))
+
+
+def _create_author_tables(cursor):
+    """
+    Create the normalized authors and book_authors tables and their delete trigger.
+    Databases that predate them, or key authors on lower(trim(name)), are rebuilt from the
+    JSON authors column.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS authors (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,  -- Database-generated unique ID
+            name TEXT NOT NULL,                    -- Author name as first added
+            name_key TEXT NOT NULL UNIQUE          -- author_name_key(name), used for lookups
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS book_authors (
+            book_id INTEGER NOT NULL REFERENCES library (id) ON DELETE CASCADE,
+            author_id INTEGER NOT NULL REFERENCES authors (id),
+            position INTEGER NOT NULL,             -- Order of the author on the book
+            PRIMARY KEY (book_id, position)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_book_authors_author ON book_authors (author_id, book_id)")
+
+    keyed = cursor.execute("SELECT 1 FROM library_meta WHERE key = 'author_keys'").fetchone()
+    if not keyed:
+        for trigger in OLD_AUTHOR_TRIGGERS:
+            cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        cursor.execute("DELETE FROM book_authors")
+        cursor.execute("DELETE FROM authors")
+        for row in cursor.execute("SELECT id, authors FROM library ORDER BY id").fetchall():
+            link_book_authors(cursor, row["id"], _parse_authors(row["authors"]))
+        cursor.execute("INSERT INTO library_meta (key, value) VALUES ('author_keys', 1)")
+    cursor.execute(AUTHOR_DELETE_TRIGGER)
+
+
+def _create_title_key_index(cursor):
+    """
+    Create the unique index on title_key. Older databases may already hold titles
+    that differ only by case or spacing; those get a plain index instead.
+    """
+    try:
+        cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_library_title_key ON library (title_key)")
+    except sqlite3.IntegrityError:
+        print("Duplicate titles found; title_key index created without a unique constraint.")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_library_title_key ON library (title_key)")
+
+
+# Keep library_fts in step with every insert, delete, and text update on library
+SEARCH_INDEX_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS library_fts_ai AFTER INSERT ON library BEGIN
+        INSERT INTO library_fts (rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS library_fts_ad AFTER DELETE ON library BEGIN
+        INSERT INTO library_fts (library_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS library_fts_au AFTER UPDATE OF title, authors, description ON library BEGIN
+        INSERT INTO library_fts (library_fts, rowid, title, authors, description)
+        VALUES ('delete', old.id, old.title, old.authors, old.description);
+        INSERT INTO library_fts (rowid, title, authors, description)
+        VALUES (new.id, new.title, new.authors, new.description);
+    END
+    """,
+)
+
+
+def _create_search_index(cursor):
+    """
+    Create the FTS5 index over title, authors, and description and the triggers
+    that keep it in sync with the library table. A new index is built from existing rows.
+    """
+    exists = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'library_fts'"
+    ).fetchone()
+    try:
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS library_fts USING fts5(
+                title, authors, description,
+                content='library', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        print(f"Full-text search unavailable: {e}")
+        return
+
+    for trigger in SEARCH_INDEX_TRIGGERS:
+        cursor.execute(trigger)
+    if not exists:
+        cursor.execute("INSERT INTO library_fts (library_fts) VALUES ('rebuild')")
+
+
+def _create_enrichment_tables(cursor):
+    """
+    Create the enrichment job queue and the tables holding the summaries, bios, and quotes it fetches.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS enrichment_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,                    -- book_summary, author_bio, author_quotes, or cover_art
+            subject TEXT NOT NULL,                 -- Book title, author name, or cover URL to look up
+            subject_key TEXT NOT NULL,             -- Normalized subject, so each is enriched once
+            status TEXT NOT NULL DEFAULT 'pending',  -- pending, running, done, or failed
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            run_after REAL NOT NULL,               -- Unix time before which the job isn't picked up
+            updated_at REAL NOT NULL,
+            UNIQUE (kind, subject_key)
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_enrichment_jobs_pending ON enrichment_jobs (status, run_after)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS book_summaries (
+            title_key TEXT PRIMARY KEY,            -- normalize_title() of the book's title
+            summary TEXT,                          -- NULL when Open Library has no such book
+            fetched_at REAL NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS author_bios (
+            name_key TEXT PRIMARY KEY,             -- author_name_key() of the author's name
+            biography TEXT NOT NULL,
+            image_url TEXT,
+            fetched_at REAL NOT NULL
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS author_quotes (
+            name_key TEXT PRIMARY KEY,             -- author_name_key() of the author's name
+            quotes TEXT NOT NULL,                  -- JSON array of quotes
+            fetched_at REAL NOT NULL
+        )
+    """)
+
+
+def _create_cover_table(cursor):
+    """
+    Create the index of cover images downloaded into the on-disk cover store.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS covers (
+            url TEXT PRIMARY KEY,          -- Remote cover_art URL the image was downloaded from
+            digest TEXT NOT NULL,          -- SHA-256 of the image, which names its file in the store
+            content_type TEXT NOT NULL,
+            size INTEGER NOT NULL,         -- Image size in bytes
+            fetched_at REAL NOT NULL,
+            last_used REAL NOT NULL        -- Unix time the cover was last served, for eviction
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_covers_digest ON covers (digest)")
+
 
-@rate_limit(1)  # Limit to 1 call per second
 def initialize_database():
     """
     Create the library database and table if it doesn't exist.
@@ -53,10 +444,51 @@ def initialize_database():
                     authors TEXT,                          -- Authors as a comma-separated string
                     description TEXT,                      -- Book description
                     cover_art TEXT,                        -- URL for the book's cover art
-                    status TEXT DEFAULT 'unread'           -- Reading status: unread, read, or currently reading
+                    status TEXT DEFAULT 'unread',          -- Reading status: unread, read, or currently reading
+                    author_sort TEXT,                      -- Lowercase last name of the first author, used for ordering
+                    title_key TEXT                         -- Casefolded, whitespace-collapsed title for lookups
                 )
             """)
+
+            # Databases created before author_sort existed get the column and a backfill
+            _add_column_if_missing(cursor, "library", "author_sort", "TEXT")
+            conn.create_function("author_sort_key", 1, author_sort_key, deterministic=True)
+            cursor.execute("UPDATE library SET author_sort = author_sort_key(authors) WHERE author_sort IS NULL")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_library_author_sort ON library (author_sort, id)")
+
+            # Same for title_key, which backs duplicate checks and status updates by title
+            _add_column_if_missing(cursor, "library", "title_key", "TEXT")
+            conn.create_function("normalize_title", 1, normalize_title, deterministic=True)
+            cursor.execute("UPDATE library SET title_key = normalize_title(title) WHERE title_key IS NULL")
+            _create_title_key_index(cursor)
+
+            # Version counter bumped by every library write, used for ETags and cache invalidation,
+            # plus flags recording one-off migrations
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS library_meta (
+                    key TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                )
+            """)
+            cursor.execute("INSERT OR IGNORE INTO library_meta (key, value) VALUES ('version', 0)")
+
+            _create_author_tables(cursor)
+            _create_search_index(cursor)
+
+            # Memo of Open Library author lookups, keyed by author_name_key() of each name variant seen
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS author_resolutions (
+                    name_key TEXT NOT NULL,
+                    source TEXT NOT NULL,        -- Open Library backend that resolved it
+                    author_url TEXT,             -- NULL when no matching author was found
+                    resolved_at REAL NOT NULL,   -- Unix time of the lookup
+                    PRIMARY KEY (name_key, source)
+                )
+            """)
+
+            _create_enrichment_tables(cursor)
+            _create_cover_table(cursor)
             conn.commit()
             print("Database initialized successfully.")
     except sqlite3.Error as e:
-        print(f"Error initializing database: {e}")
\ No newline at end of file
+        print(f"Error initializing database: {e}")
@@ -1,6 +1,36 @@
 import sqlite3
 import json
-from database.db import get_db_connection
+import base64
+import html
+import re
+from database.db import get_db_connection, link_book_authors
+from database.normalize import author_name_key, author_sort_key, normalize_title
+
+BOOK_COLUMNS = "id, isbn, title, authors, description, cover_art, status, author_sort"
+PREFIXED_BOOK_COLUMNS = ", ".join("l." + column.strip() for column in BOOK_COLUMNS.split(","))  # For queries aliasing library as l
+SQLITE_MAX_PARAMS = 900  # Stay under SQLite's default limit on bound parameters per statement
+# Control characters FTS5 wraps matches in; swapped for <mark> tags once the text is HTML-escaped
+MATCH_START, MATCH_END = "\x02", "\x03"
+
+def _bump_library_version(cursor):
+    """
+    Record that the library changed. Call inside the same transaction as the write.
+    """
+    cursor.execute("UPDATE library_meta SET value = value + 1 WHERE key = 'version'")
+
+
+def get_library_version():
+    """
+    Return the library's version counter, which increases on every write.
+    """
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute("SELECT value FROM library_meta WHERE key = 'version'").fetchone()
+            return row["value"] if row else 0
+    except sqlite3.Error as e:
+        print(f"Error reading library version: {e}")
+        raise
+
 
 def add_book_to_library(isbn, title, authors, description, cover_art, status="unread"):
     """
@@ -14,18 +44,121 @@ def add_book_to_library(isbn, title, authors, description, cover_art, status="un
         with get_db_connection() as conn:
             cursor = conn.cursor()
             # Ensure authors is stored as a JSON array
-            authors_json = json.dumps(authors) if isinstance(authors, list) else json.dumps([authors])
+            authors = authors if isinstance(authors, list) else [authors]
             cursor.execute("""
-                INSERT INTO library (isbn, title, authors, description, cover_art, status)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (isbn, title, authors_json, description, cover_art, status))
-            conn.commit()
+                INSERT INTO library (isbn, title, authors, description, cover_art, status, author_sort, title_key)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (isbn, title, json.dumps(authors), description, cover_art, status, author_sort_key(authors), normalize_title(title)))
+            link_book_authors(cursor, cursor.lastrowid, authors)
+            _bump_library_version(cursor)
             print(f"Book '{title}' with ISBN '{isbn}' added to your library with status '{status}'!")
     except sqlite3.Error as e:
         print(f"Error adding book to library: {e}")
         raise
 
 
+def add_books_if_absent(books):
+    """
+    Insert many books in a single transaction, skipping any whose ISBN or normalized title is
+    already in the library. Each book is a dictionary with isbn, title, authors, description,
+    cover_art, and status keys. Returns a list of flags, True for each book inserted.
+    """
+    valid_statuses = ["unread", "read", "currently reading"]
+    rows = []
+    book_authors = []
+    for book in books:
+        if book["status"] not in valid_statuses:
+            raise ValueError(f"Invalid status. Valid statuses are: {', '.join(valid_statuses)}")
+        authors = book["authors"] if isinstance(book["authors"], list) else [book["authors"]]
+        book_authors.append(authors)
+        rows.append((
+            book["isbn"],
+            book["title"],
+            json.dumps(authors),
+            book["description"],
+            book["cover_art"],
+            book["status"],
+            author_sort_key(authors),
+            normalize_title(book["title"]),
+        ))
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            inserted = []
+            # One statement per row so each book reports whether it was new; the duplicate checks
+            # and the insert are a single atomic step, so concurrent adds can't both succeed.
+            # Titles are checked explicitly, since older databases holding duplicate titles
+            # only have a non-unique title_key index
+            for row, authors in zip(rows, book_authors):
+                cursor.execute("""
+                    INSERT INTO library (isbn, title, authors, description, cover_art, status, author_sort, title_key)
+                    SELECT ?, ?, ?, ?, ?, ?, ?, ?
+                    WHERE NOT EXISTS (SELECT 1 FROM library WHERE title_key = ?)
+                    ON CONFLICT DO NOTHING
+                """, row + (row[-1],))
+                inserted.append(cursor.rowcount == 1)
+                if inserted[-1]:
+                    link_book_authors(cursor, cursor.lastrowid, authors)
+            if any(inserted):
+                _bump_library_version(cursor)
+            return inserted
+    except sqlite3.Error as e:
+        print(f"Error adding books to library: {e}")
+        raise
+
+
+def add_book_if_absent(isbn, title, authors, description, cover_art, status="unread"):
+    """
+    Insert a book unless its ISBN or normalized title is already in the library.
+    Returns True if the book was inserted and False if it already existed.
+    """
+    book = {
+        "isbn": isbn,
+        "title": title,
+        "authors": authors,
+        "description": description,
+        "cover_art": cover_art,
+        "status": status,
+    }
+    return add_books_if_absent([book])[0]
+
+
+def _row_to_book(row):
+    """
+    Convert a library row into the dictionary shape returned by the API.
+    """
+    return {
+        "isbn": row["isbn"],
+        "title": row["title"],
+        "authors": json.loads(row["authors"]) if row["authors"] else [],  # Decode JSON
+        "description": row["description"],
+        "cover_art": row["cover_art"],
+        "status": row["status"],
+    }
+
+
+def encode_cursor(sort_key, book_id):
+    """
+    Encode the position of the last book on a page as an opaque cursor string.
+    """
+    raw = json.dumps([sort_key, book_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor into (sort_key, id).
+    """
+    try:
+        sort_key, book_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        if not isinstance(sort_key, str) or not isinstance(book_id, int):
+            raise TypeError
+        return sort_key, book_id
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor.")
+
+
 def get_all_books():
     """
     Retrieve all books from the library database, ordered alphabetically by the last name of the first author.
@@ -33,51 +166,537 @@ def get_all_books():
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT isbn, title, authors, description, cover_art, status
+            # The (author_sort, id) index returns rows already in order, so no sort step is needed
+            cursor.execute(f"""
+                SELECT {BOOK_COLUMNS}
                 FROM library
+                ORDER BY author_sort, id
             """)
-            rows = cursor.fetchall()
-
-            # Convert rows to dictionaries and decode authors field
-            books = []
-            for row in rows:
-                authors = json.loads(row["authors"]) if row["authors"] else []
-                # Use the last word in the first author's name as the last name
-                first_author = authors[0] if authors else ""  # Use the first author if available
-                last_name = first_author.split()[-1] if first_author else ""  # Get the last word
-
-                books.append({
-                    "isbn": row["isbn"],
-                    "title": row["title"],
-                    "authors": authors,  # Decode JSON
-                    "description": row["description"],
-                    "cover_art": row["cover_art"],
-                    "status": row["status"],
-                    "sort_key": last_name.lower()  # Use lowercase last name for sorting
-                })
-
-            # Sort books by the last name of the first author
-            books.sort(key=lambda book: book["sort_key"])
-
-            # Remove the sort_key before returning the books
-            for book in books:
-                book.pop("sort_key", None)
-
-            return books
+            return [_row_to_book(row) for row in cursor.fetchall()]
     except Exception as e:
         print(f"Error retrieving books: {e}")  # Debugging line
         raise
 
 
+def get_books_page(limit, after=None):
+    """
+    Retrieve one page of books in author order, starting after the given cursor.
+    Returns the books and the cursor for the next page (None on the last page).
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # Fetch one extra row to find out whether another page follows
+            if after:
+                sort_key, book_id = decode_cursor(after)
+                cursor.execute(f"""
+                    SELECT {BOOK_COLUMNS}
+                    FROM library
+                    WHERE (author_sort, id) > (?, ?)
+                    ORDER BY author_sort, id
+                    LIMIT ?
+                """, (sort_key, book_id, limit + 1))
+            else:
+                cursor.execute(f"""
+                    SELECT {BOOK_COLUMNS}
+                    FROM library
+                    ORDER BY author_sort, id
+                    LIMIT ?
+                """, (limit + 1,))
+            rows = cursor.fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["author_sort"], rows[-1]["id"])
+
+        return {"books": [_row_to_book(row) for row in rows], "next_cursor": next_cursor}
+    except sqlite3.Error as e:
+        print(f"Error retrieving books: {e}")
+        raise
+
+
+def iter_books(batch_size=500):
+    """
+    Yield every book in author order, reading the cursor in batches so memory stays flat.
+    The pooled connection is held until the generator is exhausted or closed.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {BOOK_COLUMNS}
+                FROM library
+                ORDER BY author_sort, id
+            """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield _row_to_book(row)
+    except sqlite3.Error as e:
+        print(f"Error streaming books: {e}")
+        raise
+
+
+def build_search_query(text, prefix=True):
+    """
+    Turn free-form user input into a safe FTS5 MATCH expression.
+    Each word is quoted so FTS5 operators in the input are treated as text; with
+    `prefix`, every word also matches as a prefix ("tolk" finds "Tolkien").
+    """
+    terms = re.findall(r"\w+", text or "")
+    if not terms:
+        raise ValueError("Search query must contain at least one word.")
+    suffix = "*" if prefix else ""
+    return " ".join(f'"{term}"{suffix}' for term in terms)
+
+
+def _highlight_html(text):
+    """
+    HTML-escape FTS5 highlight() or snippet() output and wrap its matches in <mark> tags.
+    """
+    if text is None:
+        return None
+    return html.escape(text).replace(MATCH_START, "<mark>").replace(MATCH_END, "</mark>")
+
+
+def search_library(text, limit=20, prefix=True):
+    """
+    Full-text search the library, best matches first.
+    Each result includes the book plus highlighted title and description snippet, as
+    HTML-escaped text with matches wrapped in <mark> tags.
+    """
+    match = build_search_query(text, prefix)
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # bm25 weights: title matches count most, then authors, then description
+            cursor.execute(f"""
+                SELECT {PREFIXED_BOOK_COLUMNS},
+                       highlight(library_fts, 0, ?, ?) AS title_highlight,
+                       snippet(library_fts, 2, ?, ?, '…', 16) AS snippet,
+                       bm25(library_fts, 10.0, 5.0, 1.0) AS score
+                FROM library_fts
+                JOIN library AS l ON l.id = library_fts.rowid
+                WHERE library_fts MATCH ?
+                ORDER BY score
+                LIMIT ?
+            """, (MATCH_START, MATCH_END, MATCH_START, MATCH_END, match, limit))
+            results = []
+            for row in cursor.fetchall():
+                book = _row_to_book(row)
+                book["title_highlight"] = _highlight_html(row["title_highlight"])
+                book["snippet"] = _highlight_html(row["snippet"])
+                book["score"] = round(-row["score"], 4)  # bm25 is lower-is-better; flip for readability
+                results.append(book)
+            return results
+    except sqlite3.Error as e:
+        print(f"Error searching library: {e}")
+        raise
+
+
+def get_authors():
+    """
+    Retrieve every author in the library with the number of books by each, ordered by name.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT a.name, COUNT(*) AS book_count
+                FROM authors AS a
+                JOIN book_authors AS ba ON ba.author_id = a.id
+                GROUP BY a.id
+                ORDER BY a.name COLLATE NOCASE
+            """)
+            return [{"name": row["name"], "book_count": row["book_count"]} for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Error retrieving authors: {e}")
+        raise
+
+
+def get_books_by_author(author_name):
+    """
+    Retrieve all books by the given author, ordered by title. Names are matched by
+    author_name_key(), so "Le Guin, Ursula K." finds books by "Ursula K. Le Guin".
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # authors.name_key and book_authors(author_id) make this two index lookups
+            cursor.execute(f"""
+                SELECT {PREFIXED_BOOK_COLUMNS}
+                FROM authors AS a
+                JOIN book_authors AS ba ON ba.author_id = a.id
+                JOIN library AS l ON l.id = ba.book_id
+                WHERE a.name_key = ?
+                ORDER BY l.title_key
+            """, (author_name_key(author_name),))
+            return [_row_to_book(row) for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        print(f"Error retrieving books by author: {e}")
+        raise
+
+
+def get_author_resolutions(name_keys, source):
+    """
+    Look up memoized author resolutions for a backend.
+    Returns a dictionary of name_key -> (author_url, resolved_at) for the keys found.
+    """
+    name_keys = list(name_keys)
+    resolutions = {}
+    try:
+        with get_db_connection() as conn:
+            for start in range(0, len(name_keys), SQLITE_MAX_PARAMS):
+                chunk = name_keys[start:start + SQLITE_MAX_PARAMS]
+                rows = conn.execute(f"""
+                    SELECT name_key, author_url, resolved_at FROM author_resolutions
+                    WHERE source = ? AND name_key IN ({", ".join("?" * len(chunk))})
+                """, (source, *chunk))
+                for row in rows:
+                    resolutions[row["name_key"]] = (row["author_url"], row["resolved_at"])
+        return resolutions
+    except sqlite3.Error as e:
+        print(f"Error reading author resolutions: {e}")
+        raise
+
+
+def save_author_resolution(name_keys, source, author_url, resolved_at):
+    """
+    Memoize that every name key in name_keys resolves to author_url (None if not found).
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO author_resolutions (name_key, source, author_url, resolved_at)
+                VALUES (?, ?, ?, ?)
+            """, [(name_key, source, author_url, resolved_at) for name_key in name_keys])
+    except sqlite3.Error as e:
+        print(f"Error saving author resolution: {e}")
+        raise
+
+
+def enqueue_enrichment_jobs(jobs, now):
+    """
+    Queue enrichment jobs given as (kind, subject, subject_key) tuples. Subjects already
+    queued or enriched are skipped; failed jobs are queued again with their attempts reset.
+    Returns the number of jobs queued.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT INTO enrichment_jobs (kind, subject, subject_key, run_after, updated_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (kind, subject_key) DO UPDATE
+                SET status = 'pending', attempts = 0, last_error = NULL,
+                    run_after = excluded.run_after, updated_at = excluded.updated_at
+                WHERE status = 'failed'
+            """, [(kind, subject, subject_key, now, now) for kind, subject, subject_key in jobs])
+            added = cursor.rowcount
+            return added
+    except sqlite3.Error as e:
+        print(f"Error queueing enrichment jobs: {e}")
+        raise
+
+
+def claim_enrichment_job(now):
+    """
+    Mark the oldest due pending job as running and return it, or None if no job is due.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            while True:
+                row = cursor.execute("""
+                    SELECT id, kind, subject, subject_key, attempts FROM enrichment_jobs
+                    WHERE status = 'pending' AND run_after <= ?
+                    ORDER BY run_after, id
+                    LIMIT 1
+                """, (now,)).fetchone()
+                if row is None:
+                    return None
+                # Another worker may have claimed it since the SELECT
+                cursor.execute("""
+                    UPDATE enrichment_jobs SET status = 'running', attempts = attempts + 1, updated_at = ?
+                    WHERE id = ? AND status = 'pending'
+                """, (now, row["id"]))
+                if cursor.rowcount:
+                    return {**dict(row), "attempts": row["attempts"] + 1}
+    except sqlite3.Error as e:
+        print(f"Error claiming enrichment job: {e}")
+        raise
+
+
+def finish_enrichment_job(job_id, now, error=None, retry_at=None):
+    """
+    Record a job's outcome: done when there is no error, otherwise pending again
+    until `retry_at`, or failed when no retry is scheduled.
+    """
+    status = "done" if error is None else ("pending" if retry_at is not None else "failed")
+    try:
+        with get_db_connection() as conn:
+            conn.execute("""
+                UPDATE enrichment_jobs SET status = ?, last_error = ?, run_after = COALESCE(?, run_after), updated_at = ?
+                WHERE id = ?
+            """, (status, error, retry_at, now, job_id))
+    except sqlite3.Error as e:
+        print(f"Error updating enrichment job: {e}")
+        raise
+
+
+def requeue_interrupted_enrichment_jobs(now):
+    """
+    Return jobs left running by a previous process to the queue.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.execute(
+                "UPDATE enrichment_jobs SET status = 'pending', run_after = ?, updated_at = ? WHERE status = 'running'",
+                (now, now),
+            )
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        print(f"Error requeueing enrichment jobs: {e}")
+        raise
+
+
+def get_enrichment_job_counts():
+    """
+    Return the number of enrichment jobs in each status.
+    """
+    try:
+        with get_db_connection() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) AS count FROM enrichment_jobs GROUP BY status")
+            return {row["status"]: row["count"] for row in rows}
+    except sqlite3.Error as e:
+        print(f"Error counting enrichment jobs: {e}")
+        raise
+
+
+def save_book_summary(title_key, summary, now):
+    """
+    Store the summary fetched for a book (None if Open Library doesn't have it).
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO book_summaries (title_key, summary, fetched_at) VALUES (?, ?, ?)",
+                (title_key, summary, now),
+            )
+    except sqlite3.Error as e:
+        print(f"Error saving book summary: {e}")
+        raise
+
+
+def get_book_summary(title):
+    """
+    Return the stored summary row for a book title as a dictionary, or None if it hasn't been fetched.
+    """
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute(
+                "SELECT summary, fetched_at FROM book_summaries WHERE title_key = ?", (normalize_title(title),)
+            ).fetchone()
+            return dict(row) if row else None
+    except sqlite3.Error as e:
+        print(f"Error reading book summary: {e}")
+        raise
+
+
+def save_author_bio(name_key, biography, image_url, now):
+    """
+    Store the biography and image URL fetched for an author.
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO author_bios (name_key, biography, image_url, fetched_at) VALUES (?, ?, ?, ?)",
+                (name_key, biography, image_url, now),
+            )
+    except sqlite3.Error as e:
+        print(f"Error saving author bio: {e}")
+        raise
+
+
+def get_author_bio(name_key):
+    """
+    Return the stored biography and image URL for an author, or None if they haven't been fetched.
+    """
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute(
+                "SELECT biography, image_url FROM author_bios WHERE name_key = ?", (name_key,)
+            ).fetchone()
+            return dict(row) if row else None
+    except sqlite3.Error as e:
+        print(f"Error reading author bio: {e}")
+        raise
+
+
+def save_author_quotes(name_key, quotes, now):
+    """
+    Store the quotes fetched for an author.
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO author_quotes (name_key, quotes, fetched_at) VALUES (?, ?, ?)",
+                (name_key, json.dumps(quotes), now),
+            )
+    except sqlite3.Error as e:
+        print(f"Error saving author quotes: {e}")
+        raise
+
+
+def get_author_quotes(name_key):
+    """
+    Return the stored list of quotes for an author, or None if they haven't been fetched.
+    """
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute("SELECT quotes FROM author_quotes WHERE name_key = ?", (name_key,)).fetchone()
+            return json.loads(row["quotes"]) if row else None
+    except sqlite3.Error as e:
+        print(f"Error reading author quotes: {e}")
+        raise
+
+
+def get_cover(url):
+    """
+    Return the stored cover downloaded from `url` as a dictionary, or None if it isn't stored.
+    """
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute(
+                "SELECT url, digest, content_type, size, fetched_at, last_used FROM covers WHERE url = ?", (url,)
+            ).fetchone()
+            return dict(row) if row else None
+    except sqlite3.Error as e:
+        print(f"Error reading cover: {e}")
+        raise
+
+
+def save_cover(url, digest, content_type, size, now):
+    """
+    Record a downloaded cover. Returns the digests of image files no cover refers to any more
+    (the one this URL pointed at before, if it changed), which can be deleted.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            previous = cursor.execute("SELECT digest FROM covers WHERE url = ?", (url,)).fetchone()
+            cursor.execute("""
+                INSERT OR REPLACE INTO covers (url, digest, content_type, size, fetched_at, last_used)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (url, digest, content_type, size, now, now))
+            orphaned = []
+            if previous and previous["digest"] != digest:
+                if not cursor.execute("SELECT 1 FROM covers WHERE digest = ?", (previous["digest"],)).fetchone():
+                    orphaned.append(previous["digest"])
+            return orphaned
+    except sqlite3.Error as e:
+        print(f"Error saving cover: {e}")
+        raise
+
+
+def touch_cover(url, now):
+    """
+    Record that a cover was served, so eviction keeps it.
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.execute("UPDATE covers SET last_used = ? WHERE url = ?", (now, url))
+    except sqlite3.Error as e:
+        print(f"Error updating cover: {e}")
+        raise
+
+
+def forget_covers(urls):
+    """
+    Remove covers from the index, along with their finished download jobs so they can be queued again.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            params = [(url,) for url in urls]
+            cursor.executemany("DELETE FROM enrichment_jobs WHERE kind = 'cover_art' AND subject_key = ?", params)
+            cursor.executemany("DELETE FROM covers WHERE url = ?", params)
+    except sqlite3.Error as e:
+        print(f"Error removing covers: {e}")
+        raise
+
+
+def evict_covers(max_bytes):
+    """
+    Remove the least recently used covers until the distinct images they refer to total at most
+    `max_bytes`. Returns the digests of the evicted images, whose files can be deleted.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            digests = [row["digest"] for row in cursor.execute("""
+                SELECT digest FROM (
+                    SELECT digest, SUM(size) OVER (ORDER BY last_used DESC, digest) AS running_size
+                    FROM (SELECT digest, MAX(size) AS size, MAX(last_used) AS last_used FROM covers GROUP BY digest)
+                ) WHERE running_size > ?
+            """, (max_bytes,))]
+            if digests:
+                params = [(digest,) for digest in digests]
+                # Evicted covers are downloaded again the next time they're requested
+                cursor.executemany("""
+                    DELETE FROM enrichment_jobs
+                    WHERE kind = 'cover_art' AND subject_key IN (SELECT url FROM covers WHERE digest = ?)
+                """, params)
+                cursor.executemany("DELETE FROM covers WHERE digest = ?", params)
+            return digests
+    except sqlite3.Error as e:
+        print(f"Error evicting covers: {e}")
+        raise
+
+
+def get_cover_store_size():
+    """
+    Return the number of stored covers and the total size of the distinct images they refer to.
+    """
+    try:
+        with get_db_connection() as conn:
+            count = conn.execute("SELECT COUNT(*) FROM covers").fetchone()[0]
+            size = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM covers GROUP BY digest)"
+            ).fetchone()[0]
+            return {"covers": count, "size_bytes": size}
+    except sqlite3.Error as e:
+        print(f"Error reading cover store size: {e}")
+        raise
+
+
+def get_book_by_isbn(isbn):
+    """
+    Retrieve a single book by its ISBN, or None if it isn't in the library.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {BOOK_COLUMNS} FROM library WHERE isbn = ?", (isbn,))
+            row = cursor.fetchone()
+            return _row_to_book(row) if row else None
+    except sqlite3.Error as e:
+        print(f"Error finding book: {e}")
+        raise
+
+
 def is_book_in_library_by_title(title):
     """
     Check if a book with the given title exists in the library database.
+    Titles match regardless of case and spacing.
     """
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT 1 FROM library WHERE title = ?", (title,))
+            cursor.execute("SELECT 1 FROM library WHERE title_key = ?", (normalize_title(title),))
             return cursor.fetchone() is not None
     except sqlite3.Error as e:
         print(f"Error finding book: {e}")
@@ -98,11 +717,13 @@ def update_book_status_in_db(title, status):
             cursor.execute("""
                 UPDATE library
                 SET status = ?
-                WHERE LOWER(title) = LOWER(?)
-            """, (status, title))
-            conn.commit()
+                WHERE title_key = ?
+            """, (status, normalize_title(title)))
+            updated = cursor.rowcount
+            if updated:
+                _bump_library_version(cursor)
 
-        if cursor.rowcount == 0:
+        if updated == 0:
             print(f"No book found with the title '{title}'.")
         else:
             print(f"Updated the status of '{title}' to '{status}'.")
@@ -110,6 +731,41 @@ def update_book_status_in_db(title, status):
         print(f"Error updating book status: {e}")
 
 
+def update_book_statuses_in_db(updates):
+    """
+    Set the reading status of many books, given as (isbn, status) pairs, in one transaction.
+    Returns the number of books updated and the ISBNs not found in the library.
+    """
+    valid_statuses = ["unread", "read", "currently reading"]
+    for isbn, status in updates:
+        if status not in valid_statuses:
+            raise ValueError(f"Invalid status for ISBN '{isbn}'. Valid statuses are: {', '.join(valid_statuses)}")
+
+    statuses = dict(updates)  # A repeated ISBN keeps its last status
+    isbns = list(statuses)
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            found = set()
+            for start in range(0, len(isbns), SQLITE_MAX_PARAMS):
+                batch = isbns[start:start + SQLITE_MAX_PARAMS]
+                placeholders = ", ".join("?" * len(batch))
+                cursor.execute(f"SELECT isbn FROM library WHERE isbn IN ({placeholders})", batch)
+                found.update(row[0] for row in cursor.fetchall())
+
+            cursor.executemany(
+                "UPDATE library SET status = ? WHERE isbn = ?",
+                [(statuses[isbn], isbn) for isbn in isbns if isbn in found],
+            )
+            updated = cursor.rowcount if found else 0
+            if updated:
+                _bump_library_version(cursor)
+            return {"updated": updated, "not_found": [isbn for isbn in isbns if isbn not in found]}
+    except sqlite3.Error as e:
+        print(f"Error updating book statuses: {e}")
+        raise
+
+
 def delete_book_by_isbn(isbn):
     """
     Delete a book from the library database by its ISBN.
@@ -120,7 +776,7 @@ def delete_book_by_isbn(isbn):
             cursor.execute("DELETE FROM library WHERE isbn = ?", (isbn,))
             if cursor.rowcount == 0:
                 raise ValueError(f"No book found with ISBN '{isbn}'")
-            conn.commit()
+            _bump_library_version(cursor)
             print(f"Book with ISBN '{isbn}' deleted from the database.")  # Debugging line
     except sqlite3.Error as e:
         print(f"Error deleting book from library: {e}")
@@ -0,0 +1,43 @@
+import json
+
+
+def author_sort_key(authors):
+    """
+    Return the lowercase last name of the first author, used to order the library.
+    Accepts a list of names, a single name, or the JSON array stored in the database.
+    """
+    if isinstance(authors, str) and authors.startswith("["):
+        try:
+            authors = json.loads(authors)
+        except ValueError:
+            pass
+    if isinstance(authors, str):
+        authors = [authors]
+
+    first_author = authors[0] if authors else ""  # Use the first author if available
+    last_name = first_author.split()[-1] if first_author and first_author.split() else ""  # Get the last word
+    return last_name.lower()
+
+
+def normalize_title(title):
+    """
+    Return the lookup key for a title: casefolded with runs of whitespace collapsed.
+    """
+    return " ".join((title or "").split()).casefold()
+
+
+def author_name_key(name):
+    """
+    Return the key shared by the common spellings of an author's name. Case, periods and
+    commas are ignored, runs of initials are joined ("J. R. R." and "JRR" both give "jrr"),
+    and word order doesn't matter, so "Le Guin, Ursula K." matches "Ursula K. Le Guin".
+    """
+    tokens = []
+    joining_initials = False
+    for word in (name or "").replace(".", " ").replace(",", " ").casefold().split():
+        if len(word) == 1 and joining_initials:
+            tokens[-1] += word
+        else:
+            tokens.append(word)
+        joining_initials = len(word) == 1
+    return " ".join(sorted(tokens))
@@ -1,13 +1,16 @@
-from flask import Flask
-from flask_cors import CORS
-from routes import library_bp, gapi_bp, bs_scrape_bp
-from database.db import initialize_database  # Import the database initialization function
 import os
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file before the modules that read them are imported
 load_dotenv()
 
+from flask import Flask
+from flask_cors import CORS
+from routes import library_bp, gapi_bp, bs_scrape_bp, metrics_bp
+from database.db import initialize_database  # Import the database initialization function
+from services.quote_service import start_quote_refresher
+from services.enrichment_service import start_enrichment_workers
+
 app = Flask(__name__)
 
 # Get CORS origin from environment variables
@@ -17,10 +20,17 @@ CORS(app, origins=[CORS_ORIGIN])
 # Initialize the database
 initialize_database()
 
+# Fetch the quote of the day in the background so requests never wait on Wikiquote
+start_quote_refresher()
+
+# Fetch summaries, bios, and quotes for newly added books in the background
+start_enrichment_workers()
+
 # Register blueprints
 app.register_blueprint(library_bp)
 app.register_blueprint(gapi_bp)
 app.register_blueprint(bs_scrape_bp)
+app.register_blueprint(metrics_bp)
 
 if __name__ == "__main__":
     app.run(debug=True, port=5001)  # Start the Flask application
\ No newline at end of file
@@ -0,0 +1,100 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from dotenv import load_dotenv
+
+# Load environment variables from .env file before touching the database
+load_dotenv()
+
+from database.db import initialize_database
+from services.library_service import import_books
+from services.author_resolution import RESOLVE_WORKERS, resolve_library_authors
+from services.enrichment_service import enqueue_library_backfill, run_until_empty
+
+
+def read_records(path, file_format=None):
+    """
+    Yield book records from a JSON, JSON Lines, or CSV file.
+    """
+    file_format = file_format or os.path.splitext(path)[1].lstrip(".").lower()
+    with open(path, newline="", encoding="utf-8") as f:
+        if file_format == "json":
+            data = json.load(f)
+            yield from data.get("books", []) if isinstance(data, dict) else data
+        elif file_format in ("jsonl", "ndjson"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        elif file_format == "csv":
+            yield from csv.DictReader(f)
+        else:
+            raise ValueError(f"Unsupported file format '{file_format}'. Use json, jsonl, or csv.")
+
+
+def import_books_command(args):
+    """
+    Import books from a file and print the import report.
+    """
+    report = import_books(read_records(args.path, args.format), chunk_size=args.chunk_size)
+    for failure in report["failed"]:
+        print(f"Row {failure['row']} ({failure['title']}): {failure['error']}")
+    print(
+        f"Imported {report['inserted']} of {report['received']} books "
+        f"({report['duplicates']} duplicates, {len(report['failed'])} failed) "
+        f"in {report['elapsed_seconds']}s ({report['rows_per_second']} rows/sec)."
+    )
+    return 1 if report["failed"] else 0
+
+
+def resolve_authors_command(args):
+    """
+    Resolve every author in the library to their Open Library profile and print the report.
+    """
+    report = resolve_library_authors(workers=args.workers)
+    for failure in report["failed"]:
+        print(f"{failure['author']}: {failure['error']}")
+    print(
+        f"Resolved {report['resolved']} of {report['authors']} authors "
+        f"({report['already_resolved']} already resolved, {report['not_found']} not found, "
+        f"{len(report['failed'])} failed) in {report['elapsed_seconds']}s."
+    )
+    return 1 if report["failed"] else 0
+
+
+def enrich_library_command(args):
+    """
+    Queue enrichment jobs for every book in the library and, unless --queue-only is given, run them.
+    """
+    print(f"Queued {enqueue_library_backfill()} enrichment jobs.")
+    if not args.queue_only:
+        print(f"Ran {run_until_empty()} enrichment jobs.")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MyLibrary management commands.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import-books", help="Bulk-import books from a JSON, JSONL, or CSV file.")
+    import_parser.add_argument("path", help="File to import.")
+    import_parser.add_argument("--format", choices=["json", "jsonl", "ndjson", "csv"], help="File format (defaults to the file extension).")
+    import_parser.add_argument("--chunk-size", type=int, default=500, help="Rows inserted per transaction.")
+    import_parser.set_defaults(handler=import_books_command)
+
+    resolve_parser = subparsers.add_parser("resolve-authors", help="Resolve every author in the library on Open Library.")
+    resolve_parser.add_argument("--workers", type=int, default=RESOLVE_WORKERS, help="Concurrent author lookups.")
+    resolve_parser.set_defaults(handler=resolve_authors_command)
+
+    enrich_parser = subparsers.add_parser("enrich-library", help="Fetch summaries, author bios, and quotes for every book in the library.")
+    enrich_parser.add_argument("--queue-only", action="store_true", help="Only queue the jobs, leaving them to the app's background workers.")
+    enrich_parser.set_defaults(handler=enrich_library_command)
+
+    args = parser.parse_args()
+    initialize_database()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,29 @@
 from flask import Blueprint, request, jsonify
-from services.bs_scrape_service import (
+from services.bs_scrape_service import fetch_book_details
+from services.quote_service import get_quote_of_the_day
+from services.author_resolution import resolve_library_authors
+from services.enrichment_service import get_stored_author_bio, get_stored_book_details, get_stored_book_summary
+from services.open_library import (  # Scrapes or calls the JSON API, depending on OPEN_LIBRARY_BACKEND
     search_open_library_author,
     fetch_open_library_author_bio,
     search_open_library_book,
     fetch_open_library_book_summary,
-    quote_of_the_day,
 )
+from routes.rate_limit import rate_limited
 
 # Create a Blueprint for the scraping service
 bs_scrape_bp = Blueprint("bs_scrape", __name__)
 
+# Each client may scrape at 1 request per second per route, with bursts of 5
+SCRAPE_RATE = 1
+SCRAPE_BURST = 5
+
+# Resolving the whole library fans out to a search per author, so allow it once a minute
+RESOLVE_AUTHORS_RATE = 1 / 60
+RESOLVE_AUTHORS_BURST = 1
+
 @bs_scrape_bp.route("/api/search_author", methods=["GET"])
+@rate_limited(SCRAPE_RATE, SCRAPE_BURST)
 def search_author():
     """
     Search for an author on Open Library and return their profile URL.
@@ -29,22 +42,25 @@ def search_author():
 
 
 @bs_scrape_bp.route("/api/fetch_author_bio", methods=["GET"])
+@rate_limited(SCRAPE_RATE, SCRAPE_BURST)
 def fetch_author_bio():
     """
     Fetch an author's biography and image from Open Library.
+    Biographies stored by the enrichment queue are served without calling Open Library.
     """
     author_name = request.args.get("author_name")
     if not author_name:
         return jsonify({"error": "Author name is required"}), 400
 
     try:
-        bio_data = fetch_open_library_author_bio(author_name)
+        bio_data = get_stored_author_bio(author_name) or fetch_open_library_author_bio(author_name)
         return jsonify(bio_data), 200
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @bs_scrape_bp.route("/api/search_book", methods=["GET"])
+@rate_limited(SCRAPE_RATE, SCRAPE_BURST)
 def search_book():
     """
     Search for a book on Open Library and return its page URL.
@@ -63,15 +79,23 @@ def search_book():
 
 
 @bs_scrape_bp.route("/api/fetch_book_summary", methods=["GET"])
+@rate_limited(SCRAPE_RATE, SCRAPE_BURST)
 def fetch_book_summary():
     """
     Fetch a book's summary from Open Library using the book title.
+    Summaries stored by the enrichment queue are served without calling Open Library.
     """
     book_title = request.args.get("book_title")
     if not book_title:
         return jsonify({"error": "Book title is required"}), 400
 
     try:
+        stored = get_stored_book_summary(book_title)
+        if stored is not None:
+            if stored["summary"] is None:
+                return jsonify({"message": "Book not found"}), 404
+            return jsonify(stored), 200
+
         # Step 1: Search for the book URL using the title
         book_url = search_open_library_book(book_title)
         if not book_url:
@@ -85,12 +109,46 @@ def fetch_book_summary():
 
 
 @bs_scrape_bp.route("/api/quote_of_the_day", methods=["GET"])
+@rate_limited(SCRAPE_RATE, SCRAPE_BURST)
 def get_quote_of_the_day():
     """
-    Fetch the quote of the day from Wikiquote.
+    Return the quote of the day from Wikiquote, cached for the current UTC date.
     """
     try:
-        quote = quote_of_the_day()
+        quote = get_quote_of_the_day()
         return jsonify({"quote": quote}), 200
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@bs_scrape_bp.route("/api/book_details", methods=["GET"])
+@rate_limited(SCRAPE_RATE, SCRAPE_BURST)
+def get_book_details():
+    """
+    Fetch a book's summary plus its author's biography and quotes in one request.
+    Parts stored by the enrichment queue are read from the database; the rest are fetched
+    concurrently, and whatever finishes before the deadline is returned.
+    """
+    book_title = request.args.get("book_title")
+    author_name = request.args.get("author_name")
+    if not book_title:
+        return jsonify({"error": "Book title is required"}), 400
+
+    try:
+        known = get_stored_book_details(book_title, author_name)
+        return jsonify(fetch_book_details(book_title, author_name, known=known)), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bs_scrape_bp.route("/api/resolve_authors", methods=["POST"])
+@rate_limited(RESOLVE_AUTHORS_RATE, RESOLVE_AUTHORS_BURST)
+def resolve_authors():
+    """
+    Resolve every author in the library to their Open Library profile in one pass.
+    Authors resolved before are answered from the memo; returns a report of the results.
+    """
+    try:
+        return jsonify(resolve_library_authors()), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
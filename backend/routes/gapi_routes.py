@@ -1,10 +1,21 @@
-from flask import Blueprint, request, jsonify
-from services.gapi_search_service import search_books  # Import the service function
+import json
+from flask import Blueprint, Response, request, jsonify
+from services.gapi_search_service import search_books, deep_search_books  # Import the service functions
+from routes.rate_limit import rate_limited
 
 # Create a Blueprint for Google Books API routes
 gapi_bp = Blueprint("gapi", __name__)
 
+# Each client may search at 2 requests per second, with bursts of 10
+SEARCH_RATE = 2
+SEARCH_BURST = 10
+
+# A deep search fans out to several upstream requests, so it gets a tighter limit
+DEEP_SEARCH_RATE = 0.5
+DEEP_SEARCH_BURST = 3
+
 @gapi_bp.route('/search_books', methods=['GET'])
+@rate_limited(SEARCH_RATE, SEARCH_BURST)
 def search_books_route():
     """
     Route to search for books using the Google Books API.
@@ -18,4 +29,28 @@ def search_books_route():
         books = search_books(query)
         return jsonify(books)
     except Exception as e:
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+
+@gapi_bp.route('/search_books/deep', methods=['GET'])
+@rate_limited(DEEP_SEARCH_RATE, DEEP_SEARCH_BURST)
+def deep_search_books_route():
+    """
+    Route to search several pages of Google Books results at once.
+    Pages are streamed as newline-delimited JSON in the order they arrive.
+    """
+    query = request.args.get('query')
+    if not query:
+        return jsonify({"error": "Query parameter is required"}), 400
+
+    try:
+        pages = int(request.args.get('pages', 3))
+    except ValueError:
+        return jsonify({"error": "Pages must be an integer"}), 400
+
+    try:
+        results = deep_search_books(query, pages)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return Response((json.dumps(page) + "\n" for page in results), mimetype="application/x-ndjson")
@@ -1,18 +1,41 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, redirect, request, jsonify, send_file
 from services.library_service import (
+    EXPORT_FORMATS,
     add_book,
+    get_author_books,
+    get_book,
     get_books,
+    import_books,
+    library_version,
+    list_authors,
+    search_books_in_library,
+    stream_books,
     is_book_in_library,
     update_book_status,
+    update_book_statuses,
     delete_book
 )
+from services.cover_service import COVER_MAX_AGE, get_cached_cover, is_allowed_cover_url
+from services.enrichment_service import enqueue_cover_download
 
 library_bp = Blueprint("library", __name__)
 
+MAX_PAGE_SIZE = 500  # Largest page /api/get_books will return
+
+def _with_etag(response, etag):
+    """
+    Attach the library ETag and ask clients to revalidate before reusing a cached copy.
+    """
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
 @library_bp.route("/api/add_book", methods=["POST"])
 def add_book_endpoint():
     """
     Add a book to the library.
+    Responds 201 when the book is added and 409 when its ISBN or title is already in the library.
     """
     data = request.json
     if not data:
@@ -40,29 +63,200 @@ def add_book_endpoint():
 
     try:
         # Call the service layer to add the book
-        add_book(isbn, title, authors, description, cover_art, status)
+        if not add_book(isbn, title, authors, description, cover_art, status):
+            return jsonify({"error": f"Book '{title}' already exists in your library!", "inserted": False}), 409
         print(f"Book '{title}' added successfully with status '{status}'.")  # Debugging line
-        return jsonify({"message": f"Book '{title}' with ISBN '{isbn}' added to your library with status '{status}'!"}), 201
+        return jsonify({
+            "message": f"Book '{title}' with ISBN '{isbn}' added to your library with status '{status}'!",
+            "inserted": True,
+        }), 201
     except Exception as e:
         print(f"Error adding book: {e}")  # Debugging line
         return jsonify({"error": str(e)}), 500
 
 
+@library_bp.route("/api/import_books", methods=["POST"])
+def import_books_endpoint():
+    """
+    Add many books to the library in one request.
+    Accepts a JSON list of books (or {"books": [...]}) and returns an import report.
+    """
+    data = request.json
+    if isinstance(data, dict):
+        data = data.get("books")
+    if not isinstance(data, list):
+        return jsonify({"error": "Request body must be a list of books"}), 400
+
+    try:
+        report = import_books(data)
+        print(f"Imported {report['inserted']} of {report['received']} books.")  # Debugging line
+        return jsonify(report), 200
+    except Exception as e:
+        print(f"Error importing books: {e}")  # Debugging line
+        return jsonify({"error": str(e)}), 500
+
+
 @library_bp.route("/api/get_books", methods=["GET"])
 def get_books_endpoint():
     """
-    Retrieve all books from the library.
+    Retrieve books from the library.
+    Pass `limit` (and `after`, the `next_cursor` of the previous page) to page through the results,
+    or `stream=true` to receive the full list as a chunked response.
+    Responses carry an ETag; a matching If-None-Match gets a 304 without reading any books.
     """
     try:
-        books = get_books()
+        etag = f"library-{library_version()}"
+    except Exception as e:
+        print(f"Error in /api/get_books: {e}")
+        return jsonify({"error": str(e)}), 500
+    if request.if_none_match.contains(etag):
+        return _with_etag(Response(status=304), etag)
+
+    if request.args.get("stream", "").lower() in ("1", "true", "yes"):
+        return _with_etag(Response(stream_books("json"), mimetype=EXPORT_FORMATS["json"]), etag)
+
+    limit = request.args.get("limit")
+    after = request.args.get("after")
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            return jsonify({"error": "Limit must be an integer"}), 400
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            return jsonify({"error": f"Limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+    elif after:
+        return jsonify({"error": "The after cursor requires a limit"}), 400
+
+    try:
+        books = get_books(limit, after)
         if not books:
             print("No books found in the library.")  # Debug log
-        return jsonify(books)  # Return an empty list if no books are found
+        return _with_etag(jsonify(books), etag)  # Return an empty list if no books are found
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         print(f"Error in /api/get_books: {e}")
         return jsonify({"error": str(e)}), 500
 
 
+@library_bp.route("/api/get_book/<isbn>", methods=["GET"])
+def get_book_endpoint(isbn):
+    """
+    Retrieve a single book from the library by its ISBN.
+    """
+    try:
+        book = get_book(isbn)
+        if not book:
+            return jsonify({"message": "Book not found"}), 404
+        return jsonify(book), 200
+    except Exception as e:
+        print(f"Error in /api/get_book: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@library_bp.route("/api/covers/<isbn>", methods=["GET"])
+def get_cover_endpoint(isbn):
+    """
+    Serve a library book's cover image from the local cover store.
+    Covers not downloaded yet are queued for download and redirected to their remote URL meanwhile.
+    """
+    try:
+        book = get_book(isbn)
+        # Only covers from known hosts are fetched or redirected to, never arbitrary client-supplied URLs
+        if not book or not book.get("cover_art") or not is_allowed_cover_url(book["cover_art"]):
+            return jsonify({"message": "Cover not found"}), 404
+
+        cover = get_cached_cover(book["cover_art"])
+        if cover is None:
+            enqueue_cover_download(book["cover_art"])
+            return redirect(book["cover_art"])
+
+        # The digest changes whenever the image does, so it doubles as a strong ETag
+        return send_file(
+            cover["path"],
+            mimetype=cover["content_type"],
+            etag=cover["digest"],
+            max_age=COVER_MAX_AGE,
+            conditional=True,
+        )
+    except Exception as e:
+        print(f"Error in /api/covers: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@library_bp.route("/api/export_books", methods=["GET"])
+def export_books_endpoint():
+    """
+    Stream the whole library as a JSON, NDJSON, or CSV download.
+    """
+    export_format = request.args.get("format", "json").lower()
+    try:
+        chunks = stream_books(export_format)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return Response(
+        chunks,
+        mimetype=EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f"attachment; filename=library.{export_format}"},
+    )
+
+
+@library_bp.route("/api/search_library", methods=["GET"])
+def search_library_endpoint():
+    """
+    Full-text search the library with ranked results and highlighted snippets.
+    Words match as prefixes unless `prefix=false` is passed.
+    """
+    query = request.args.get("q")
+    if not query:
+        return jsonify({"error": "The q query parameter is required"}), 400
+
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return jsonify({"error": "Limit must be an integer"}), 400
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({"error": f"Limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+    prefix = request.args.get("prefix", "true").lower() not in ("0", "false", "no")
+
+    try:
+        return jsonify(search_books_in_library(query, limit, prefix)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        print(f"Error in /api/search_library: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@library_bp.route("/api/authors", methods=["GET"])
+def get_authors_endpoint():
+    """
+    List the authors in the library with the number of books by each.
+    """
+    try:
+        return jsonify(list_authors()), 200
+    except Exception as e:
+        print(f"Error in /api/authors: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
+@library_bp.route("/api/books_by_author", methods=["GET"])
+def get_books_by_author_endpoint():
+    """
+    Retrieve all books in the library by one author.
+    """
+    author_name = request.args.get("author_name")
+    if not author_name:
+        return jsonify({"error": "Author name is required"}), 400
+
+    try:
+        return jsonify(get_author_books(author_name)), 200
+    except Exception as e:
+        print(f"Error in /api/books_by_author: {e}")
+        return jsonify({"error": str(e)}), 500
+
+
 @library_bp.route("/api/is_book_in_library", methods=["GET"])
 def is_book_in_library_endpoint():
     """
@@ -106,6 +300,27 @@ def update_book_status_endpoint():
         return jsonify({"error": str(e)}), 500
     
 
+@library_bp.route("/api/update_book_statuses", methods=["PUT"])
+def update_book_statuses_endpoint():
+    """
+    Update the reading status of many books by ISBN in one transaction.
+    Accepts a JSON list of {"isbn", "status"} objects (or {"updates": [...]}) and reports
+    how many books were updated and which ISBNs were not found.
+    """
+    data = request.json
+    if isinstance(data, dict):
+        data = data.get("updates")
+    if not isinstance(data, list):
+        return jsonify({"error": "Request body must be a list of updates"}), 400
+
+    try:
+        return jsonify(update_book_statuses(data)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @library_bp.route("/api/delete_book/<isbn>", methods=["DELETE"])
 def delete_book_endpoint(isbn):
     """
@@ -0,0 +1,39 @@
+from flask import Blueprint, jsonify
+from database.db import get_pool_stats
+from services.library_service import get_library_cache_stats
+from services import http_client
+from services.http_cache import get_http_cache_stats
+from services.quote_service import get_quote_cache_stats
+from services.author_resolution import get_author_resolution_stats
+from services.single_flight import get_single_flight_stats
+from services.circuit_breaker import get_breaker_stats
+from services.enrichment_service import get_enrichment_stats
+from services.cover_service import get_cover_cache_stats
+from services.gapi_search_service import get_search_cache_stats
+from routes.rate_limit import get_rate_limit_stats
+
+# Create a Blueprint for runtime metrics
+metrics_bp = Blueprint("metrics", __name__)
+
+@metrics_bp.route("/api/metrics", methods=["GET"])
+def get_metrics():
+    """
+    Return runtime statistics for the backend's pools and caches.
+    """
+    try:
+        return jsonify({
+            "db_pool": get_pool_stats(),
+            "library_cache": get_library_cache_stats(),
+            "rate_limits": get_rate_limit_stats(),
+            "http_client": http_client.get_stats(),
+            "search_cache": get_search_cache_stats(),
+            "http_cache": get_http_cache_stats(),
+            "quote_of_the_day": get_quote_cache_stats(),
+            "author_resolution": get_author_resolution_stats(),
+            "single_flight": get_single_flight_stats(),
+            "circuit_breakers": get_breaker_stats(),
+            "enrichment": get_enrichment_stats(),
+            "cover_cache": get_cover_cache_stats(),
+        }), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
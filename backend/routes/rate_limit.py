@@ -0,0 +1,109 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import request, jsonify
+
+# Every limiter created by rate_limited, so their stats can be reported
+_limiters = {}
+
+
+class TokenBucketLimiter:
+    """
+    A thread-safe token bucket per key. Each bucket holds up to `capacity` tokens and
+    refills at `rate` tokens per second; a request spends one token.
+    Buckets idle long enough to have refilled completely are dropped, and at most
+    `max_keys` buckets are kept (least recently used first out).
+    """
+
+    def __init__(self, rate, capacity, max_keys=10000):
+        self.rate = rate
+        self.capacity = capacity
+        self.max_keys = max_keys
+        self.idle_ttl = capacity / rate  # After this long a bucket is full again, so forgetting it changes nothing
+        self._buckets = OrderedDict()  # key -> (tokens, last_seen), oldest first
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+
+    def acquire(self, key, now=None):
+        """
+        Try to spend a token for key. Returns (allowed, retry_after_seconds).
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._expire(now)
+            tokens, last_seen = self._buckets.pop(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - last_seen) * self.rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+                retry_after = 0.0
+                self.allowed += 1
+            else:
+                retry_after = (1 - tokens) / self.rate
+                self.rejected += 1
+
+            self._buckets[key] = (tokens, now)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            return allowed, retry_after
+
+    def _expire(self, now):
+        # Buckets are ordered by last use, so stop at the first one that is still active
+        while self._buckets:
+            _, (_, last_seen) = next(iter(self._buckets.items()))
+            if now - last_seen < self.idle_ttl:
+                break
+            self._buckets.popitem(last=False)
+
+    def stats(self):
+        """
+        Return the limiter's settings and counters.
+        """
+        with self._lock:
+            return {
+                "rate": self.rate,
+                "capacity": self.capacity,
+                "tracked_clients": len(self._buckets),
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+            }
+
+
+def client_identity():
+    """
+    Identify the caller for rate limiting purposes.
+    """
+    return request.remote_addr or "unknown"
+
+
+def rate_limited(rate, burst):
+    """
+    Decorator limiting each client to `rate` requests per second on a route,
+    with bursts of up to `burst` requests. Excess requests get a 429 with Retry-After.
+    """
+    def decorator(func):
+        limiter = TokenBucketLimiter(rate, burst)
+        _limiters[func.__name__] = limiter
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            allowed, retry_after = limiter.acquire(client_identity())
+            if not allowed:
+                response = jsonify({"error": f"Rate limit exceeded. Try again in {retry_after:.2f} seconds."})
+                response.status_code = 429
+                response.headers["Retry-After"] = str(math.ceil(retry_after))
+                return response
+            return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_rate_limit_stats():
+    """
+    Return stats for every rate-limited route.
+    """
+    return {name: limiter.stats() for name, limiter in _limiters.items()}
@@ -0,0 +1,45 @@
+from rapidfuzz import fuzz, process
+
+# Minimum score for a search result to count as the requested author
+MATCH_THRESHOLD = 70
+NAME_PARTS_BOOST = 20  # Added when every part of the requested name appears in the candidate
+
+
+def normalize_author_name(author_name):
+    """
+    Drop periods and commas and collapse whitespace, so "J.R.R. Tolkien" and "J R R  Tolkien"
+    compare alike and the parts of "Le Guin, Ursula K." are whole words.
+    """
+    normalized_name = author_name.replace(".", "").replace(",", " ").strip()  # Remove periods and commas
+    return " ".join(normalized_name.split())  # Ensure single spaces between words
+
+
+def best_author_match(author_name, candidates):
+    """
+    Pick the candidate whose name best matches author_name, or None if none is close enough.
+    `candidates` is a list of (name, value) pairs; the matching pair is returned.
+    """
+    normalized_name = normalize_author_name(author_name)
+
+    # Split the normalized name into parts for better matching
+    name_parts = normalized_name.lower().split()
+
+    # Score every candidate in one call; those too far below the threshold for the boost to help are skipped
+    choices = [name for name, _ in candidates]
+    scored = process.extract(
+        normalized_name,
+        choices,
+        scorer=fuzz.partial_ratio,
+        processor=str.lower,
+        limit=None,
+        score_cutoff=MATCH_THRESHOLD - NAME_PARTS_BOOST,
+    )
+
+    # Ties go to the candidate listed first, as the search ranks them
+    best_score, best_index = MATCH_THRESHOLD, None
+    for choice, score, index in scored:
+        if all(part in choice.lower() for part in name_parts):
+            score += NAME_PARTS_BOOST
+        if score > best_score or (score == best_score and best_index is not None and index < best_index):
+            best_score, best_index = score, index
+    return candidates[best_index] if best_index is not None else None
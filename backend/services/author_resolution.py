@@ -0,0 +1,103 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from database.models import get_authors, get_author_resolutions, save_author_resolution
+from database.normalize import author_name_key
+from . import open_library
+from .author_matching import best_author_match
+
+# Found authors are remembered indefinitely; misses are retried after this many seconds
+NOT_FOUND_TTL = int(os.getenv("AUTHOR_NOT_FOUND_TTL", "604800"))
+RESOLVE_WORKERS = int(os.getenv("AUTHOR_RESOLVE_WORKERS", "4"))  # Concurrent lookups when resolving the whole library
+
+_stats = {"memo_hits": 0, "lookups": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(stat):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def _is_current(resolution):
+    author_url, resolved_at = resolution
+    return author_url is not None or time.time() - resolved_at < NOT_FOUND_TTL
+
+
+def resolve_author(author_name, source, search_candidates):
+    """
+    Return the profile URL of the Open Library author matching author_name, or None.
+    Answers come from the memo when this name (or a variant of it) was resolved before;
+    otherwise search_candidates(author_name) supplies (name, url) pairs to match against,
+    and the outcome is memoized under both the requested and the matched name.
+    """
+    key = author_name_key(author_name)
+    try:
+        resolution = get_author_resolutions([key], source).get(key)
+    except sqlite3.Error:
+        resolution = None  # The memo only saves work; resolve without it
+    if resolution is not None and _is_current(resolution):
+        _count("memo_hits")
+        return resolution[0]
+
+    _count("lookups")
+    candidates = search_candidates(author_name)
+    match = best_author_match(author_name, candidates) if candidates else None
+    if not candidates:
+        print("No authors found in the response.")  # Log if no authors are found
+    elif not match:
+        print("No sufficiently good match found.")  # Log if no good match is found
+
+    keys = {key, author_name_key(match[0])} if match else {key}
+    author_url = match[1] if match else None
+    try:
+        save_author_resolution(keys, source, author_url, time.time())
+    except sqlite3.Error:
+        pass
+    return author_url
+
+
+def resolve_library_authors(workers=RESOLVE_WORKERS):
+    """
+    Resolve every author in the library with the configured Open Library backend in one pass.
+    Authors already in the memo are skipped; the rest are looked up concurrently.
+    Returns a report of how many were already resolved, newly resolved, not found, or failed.
+    """
+    started = time.perf_counter()
+    source = open_library.OPEN_LIBRARY_BACKEND
+    names = [author["name"] for author in get_authors()]
+
+    # Names sharing a key are one lookup
+    pending = {}
+    for name in names:
+        pending.setdefault(author_name_key(name), name)
+    report = {"authors": len(pending), "already_resolved": 0, "resolved": 0, "not_found": 0, "failed": []}
+    memo = get_author_resolutions(pending.keys(), source)
+    for key in list(pending):
+        if key in memo and _is_current(memo[key]):
+            del pending[key]
+            report["already_resolved"] += 1
+
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="author-resolve") as executor:
+        futures = {executor.submit(open_library.search_open_library_author, name): name for name in pending.values()}
+        for future, name in futures.items():
+            try:
+                report["resolved" if future.result() else "not_found"] += 1
+            except Exception as e:
+                report["failed"].append({"author": name, "error": str(e)})
+
+    report["elapsed_seconds"] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def get_author_resolution_stats():
+    """
+    Return how many author lookups were answered from the memo.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    total = stats["memo_hits"] + stats["lookups"]
+    stats["hit_rate"] = round(stats["memo_hits"] / total, 4) if total else None
+    return stats
@@ -1,83 +1,49 @@
+import os
 import random
-from bs4 import BeautifulSoup
-import requests
-from rapidfuzz import fuzz
-
-
-def search_open_library_author(author_name):
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from . import http_cache, open_library
+from .author_resolution import resolve_author
+from .single_flight import coalesced
+from .html_parsing import (
+    AUTHOR_PROFILE,
+    AUTHOR_SEARCH_RESULTS,
+    BOOK_DESCRIPTION,
+    BOOK_SEARCH_RESULTS,
+    QUOTE_OF_THE_DAY,
+    WIKIQUOTE_CONTENT,
+    WIKIQUOTE_SEARCH_RESULTS,
+    parse_html,
+)
+
+# Placeholder quote lists returned when Wikiquote has nothing for an author
+NO_QUOTES_FOUND = "No quotes found for this author on Wikiquote."
+NO_QUOTES_AVAILABLE = "No quotes available for this author."
+
+# Book detail lookups run their parts concurrently on a shared pool under one deadline
+BOOK_DETAILS_TIMEOUT = float(os.getenv("BOOK_DETAILS_TIMEOUT", "8"))
+_details_executor = ThreadPoolExecutor(max_workers=int(os.getenv("BOOK_DETAILS_WORKERS", "12")), thread_name_prefix="book-details")
+
+
+def _extract(response, extractor, only):
     """
-    Search Open Library for an author and return the URL of their profile page.
-    Handles cases where initials are separated by spaces or periods and reversed names.
+    Parse the needed part of a response and run an extractor over it.
+    The result is cached alongside the response and reused until the page changes.
     """
-    # Normalize the author name
-    normalized_name = author_name.replace(".", "").strip()  # Remove periods
-    normalized_name = " ".join(normalized_name.split())  # Ensure single spaces between words
-
-    # Construct the search URL using the normalized name
-    search_url = f"https://openlibrary.org/search?q={author_name.replace(' ', '+')}"
-    response = requests.get(search_url)
-    if response.status_code != 200:
-        raise Exception("Failed to fetch Open Library author search results.")
-
-    soup = BeautifulSoup(response.text, "html.parser")
-
-    # Locate all author links in the search results
-    author_results = soup.select(".bookauthor a")
-    if not author_results:
-        print("No authors found in the response.")  # Log if no authors are found
-        return None
-
-    # Split the normalized name into parts for better matching
-    name_parts = normalized_name.lower().split()
-
-    # Iterate through all results and find the best match
-    best_match = None
-    highest_score = 0
-    for author_link in author_results:
-        author_name_text = author_link.text.strip()
-        author_name_lower = author_name_text.lower()
-
-        # Calculate a base fuzzy match score
-        score = fuzz.partial_ratio(normalized_name.lower(), author_name_lower)
-
-        # Boost the score if all parts of the input name are present in the result
-        if all(part in author_name_lower for part in name_parts):
-            score += 20  # Boost score for containing all parts of the name
+    return http_cache.parsed(response, extractor.__name__, lambda: extractor(parse_html(response.text, only)))
 
-        if score > highest_score:
-            highest_score = score
-            best_match = author_link
 
-    # If a sufficiently good match is found, return the author's profile URL
-    if best_match and highest_score > 70:  # Lower the threshold slightly to account for reversed names
-        author_url = f"https://openlibrary.org{best_match['href']}"
-        return author_url
-
-    print("No sufficiently good match found.")  # Log if no good match is found
-    return None
-
-
-def fetch_open_library_author_bio(author_name):
+def extract_author_results(soup):
     """
-    Fetch the author's biography and image from Open Library using their name.
-    Return a dictionary containing the biography text, source link, and image URL.
+    Return (name, href) for every author link on an Open Library search results page.
     """
-    # Step 1: Search for the author's profile page
-    author_url = search_open_library_author(author_name)
-    if not author_url:
-        return {
-            "biography": "No biography found for this author on Open Library.",
-            "image_url": None,
-        }
-
-    # Step 2: Fetch the biography and image from the author's profile page
-    response = requests.get(author_url)
-    if response.status_code != 200:
-        raise Exception("Failed to fetch Open Library author page.")
-        
+    return [(link.text.strip(), link["href"]) for link in soup.select(".bookauthor a")]
 
-    soup = BeautifulSoup(response.text, "html.parser")
 
+def extract_author_profile(soup):
+    """
+    Return the biography and image URL from an Open Library author page.
+    """
     # Locate the biography section (if available)
     bio_section = soup.select_one('div[itemprop="description"]')
     if not bio_section:
@@ -107,21 +73,149 @@ def fetch_open_library_author_bio(author_name):
     }
 
 
+def extract_first_book_path(soup):
+    """
+    Return the link to the first result on an Open Library search results page.
+    """
+    first_result = soup.select_one(".searchResultItem a")
+    return first_result["href"] if first_result else None
+
+
+def extract_book_description(soup):
+    """
+    Return the description text from an Open Library book page, or None if it has none.
+    """
+    description_element = soup.select_one(".book-description")
+    if not description_element:
+        return None
+
+    # Extract the text content of the description, excluding any "Read more" or "Read less" buttons
+    for button in description_element.select(".read-more__toggle"):
+        button.extract()  # Remove the button elements
+
+    return description_element.text.strip()
+
+
+def extract_quote_of_the_day(soup):
+    """
+    Return the quote of the day and its author from Wikiquote's Main Page.
+    """
+    # Locate the "Quote of the Day" section
+    quote_section = soup.select_one("table[align='center'] td[align='center']")
+    if not quote_section:
+        return {"error": "No quote of the day found."}
+
+    # Extract the text of the quote
+    quote = quote_section.get_text(separator=" ").strip()
+
+    # Locate the author (if available)
+    author_section = soup.select_one("table[align='center'] td[style='font-size:smaller;']")
+    author = author_section.get_text(separator=" ").strip() if author_section else "Unknown Author"
+
+    # Clean up the quote and author
+    quote = " ".join(quote.split())  # Remove extra whitespace
+    author = " ".join(author.split())  # Remove extra whitespace
+
+    # Ensure the author name does not have extra "~" characters
+    if author.startswith("~") and author.endswith("~"):
+        author = author.strip("~").strip()
+
+    # Remove the author's name from the quote if it appears at the end
+    # This handles cases where the author's name is appended to the quote in the HTML
+    if quote.endswith(f"~ {author} ~"):
+        quote = quote[: -len(f"~ {author} ~")].strip()
+
+    # Return the quote and author as a dictionary
+    return {"quote": quote, "author": author}
+
+
+def extract_first_wikiquote_path(soup):
+    """
+    Return the link to the first result on a Wikiquote search results page.
+    """
+    first_result = soup.select_one(".mw-search-result-heading a")
+    return first_result["href"] if first_result else None
+
+
+def extract_wikiquote_quotes(soup):
+    """
+    Return every quote listed in the main content of a Wikiquote author page.
+    """
+    quotes = []
+
+    # Extract quotes from the main content
+    for quote in soup.select(".mw-parser-output ul > li"):
+        # Remove any nested <ul> elements to avoid metadata or links
+        for nested_ul in quote.find_all("ul"):
+            nested_ul.decompose()  # Completely remove nested <ul> elements
+
+        # Extract the cleaned text of the main <li> element
+        text = quote.get_text(separator=" ").strip()
+
+        if text:
+            quotes.append(text)
+
+    return quotes
+
+
+def search_author_candidates(author_name):
+    """
+    Search Open Library for an author and return (name, profile URL) for every author in the results.
+    """
+    search_url = f"https://openlibrary.org/search?q={author_name.replace(' ', '+')}"
+    response = http_cache.get(search_url)
+    if response.status_code != 200:
+        raise Exception("Failed to fetch Open Library author search results.")
+
+    # Locate all author links in the search results
+    author_results = _extract(response, extract_author_results, AUTHOR_SEARCH_RESULTS)
+    return [(name, f"https://openlibrary.org{href}") for name, href in author_results]
+
+
+def search_open_library_author(author_name):
+    """
+    Search Open Library for an author and return the URL of their profile page.
+    Handles cases where initials are separated by spaces or periods and reversed names.
+    Resolved names are memoized, so repeat lookups skip the search.
+    """
+    return resolve_author(author_name, "html", search_author_candidates)
+
+
+def fetch_open_library_author_bio(author_name):
+    """
+    Fetch the author's biography and image from Open Library using their name.
+    Return a dictionary containing the biography text, source link, and image URL.
+    """
+    # Step 1: Search for the author's profile page
+    author_url = search_open_library_author(author_name)
+    if not author_url:
+        return {
+            "biography": open_library.NO_BIOGRAPHY,
+            "image_url": None,
+        }
+
+    # Step 2: Fetch the biography and image from the author's profile page
+    response = http_cache.get(author_url)
+    if response.status_code != 200:
+        raise Exception("Failed to fetch Open Library author page.")
+
+    return _extract(response, extract_author_profile, AUTHOR_PROFILE)
+
+
 def search_open_library_book(book_title):
     """
     Search Open Library for a book by title and return the URL of the book's page.
     """
     search_url = f"https://openlibrary.org/search?q={book_title.replace(' ', '+')}"
-    response = requests.get(search_url)
+    response = http_cache.get(search_url)
     if response.status_code != 200:
         raise Exception("Failed to fetch Open Library book search results.")
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    first_result = soup.select_one(".searchResultItem a")
-    if not first_result:
+    book_path = _extract(response, extract_first_book_path, BOOK_SEARCH_RESULTS)
+    if not book_path:
         return None  # No book found
 
-    book_url = f"https://openlibrary.org{first_result['href']}"
+    book_url = f"https://openlibrary.org{book_path}"
     return book_url
 
 
@@ -129,27 +223,15 @@ def fetch_open_library_book_summary(book_url):
     """
     Fetch the book summary from the Open Library book page.
     """
-    response = requests.get(book_url)
+    response = http_cache.get(book_url)
     if response.status_code != 200:
         raise Exception("Failed to fetch Open Library book page.")
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    description_element = soup.select_one(".book-description")
-    if not description_element:
-        return "No Summary Available."
-    
-    # Extract the text content of the description, excluding any "Read more" or "Read less" buttons
-    for button in description_element.select(".read-more__toggle"):
-        button.extract()  # Remove the button elements
-
-    return description_element.text.strip()
-
-
-import requests
-from bs4 import BeautifulSoup
+    description = _extract(response, extract_book_description, BOOK_DESCRIPTION)
+    if description is None:
+        return open_library.NO_SUMMARY
+    return description
 
-import requests
-from bs4 import BeautifulSoup
 
 def quote_of_the_day():
     """
@@ -157,39 +239,12 @@ def quote_of_the_day():
     """
     url = "https://en.wikiquote.org/wiki/Main_Page"
     try:
-        response = requests.get(url)
+        # Changes daily, so always revalidate, and never pass off yesterday's page as today's
+        response = http_cache.get(url, max_age=0, stale_if_error=False)
         if response.status_code != 200:
             return {"error": "Failed to fetch the quote of the day."}
 
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        # Locate the "Quote of the Day" section
-        quote_section = soup.select_one("table[align='center'] td[align='center']")
-        if not quote_section:
-            return {"error": "No quote of the day found."}
-
-        # Extract the text of the quote
-        quote = quote_section.get_text(separator=" ").strip()
-
-        # Locate the author (if available)
-        author_section = soup.select_one("table[align='center'] td[style='font-size:smaller;']")
-        author = author_section.get_text(separator=" ").strip() if author_section else "Unknown Author"
-
-        # Clean up the quote and author
-        quote = " ".join(quote.split())  # Remove extra whitespace
-        author = " ".join(author.split())  # Remove extra whitespace
-
-        # Ensure the author name does not have extra "~" characters
-        if author.startswith("~") and author.endswith("~"):
-            author = author.strip("~").strip()
-
-        # Remove the author's name from the quote if it appears at the end
-        # This handles cases where the author's name is appended to the quote in the HTML
-        if quote.endswith(f"~ {author} ~"):
-            quote = quote[: -len(f"~ {author} ~")].strip()
-
-        # Return the quote and author as a dictionary
-        return {"quote": quote, "author": author}
+        return _extract(response, extract_quote_of_the_day, QUOTE_OF_THE_DAY)
     except Exception as e:
         return {"error": f"Error fetching the quote of the day: {e}"}
 
@@ -200,7 +255,7 @@ def search_wikiquote_author(author_name):
     """
     search_url = f"https://en.wikiquote.org/w/index.php?search={author_name.replace(' ', '+')}"
 
-    response = requests.get(search_url)
+    response = http_cache.get(search_url)
     if response.status_code != 200:
         raise Exception("Failed to fetch Wikiquote search results.")
 
@@ -208,14 +263,12 @@ def search_wikiquote_author(author_name):
     if "/wiki/" in response.url:
         return response.url
 
-    soup = BeautifulSoup(response.text, "html.parser")
-
     # Look for the first search result
-    first_result = soup.select_one(".mw-search-result-heading a")
-    if not first_result:
+    author_path = _extract(response, extract_first_wikiquote_path, WIKIQUOTE_SEARCH_RESULTS)
+    if not author_path:
         return None  # No author page found
 
-    author_url = f"https://en.wikiquote.org{first_result['href']}"
+    author_url = f"https://en.wikiquote.org{author_path}"
     return author_url
 
 
@@ -223,26 +276,27 @@ def scrape_wikiquote_quotes(author_url):
     """
     Scrape famous quotes from an author's Wikiquote page.
     """
-    response = requests.get(author_url)
+    response = http_cache.get(author_url)
     if response.status_code != 200:
         raise Exception("Failed to fetch Wikiquote author page.")
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    quotes = []
-
-    # Extract quotes from the main content
-    for quote in soup.select(".mw-parser-output ul > li"):
-        # Remove any nested <ul> elements to avoid metadata or links
-        for nested_ul in quote.find_all("ul"):
-            nested_ul.decompose()  # Completely remove nested <ul> elements
+    quotes = _extract(response, extract_wikiquote_quotes, WIKIQUOTE_CONTENT)
+    return quotes[:5]  # Limit to the first 10 quotes for better coverage
 
-        # Extract the cleaned text of the main <li> element
-        text = quote.get_text(separator=" ").strip()
 
-        if text:
-            quotes.append(text)
+@coalesced
+def find_wikiquote_quotes(author_name):
+    """
+    Search Wikiquote for an author and fetch their famous quotes, raising if Wikiquote fails.
+    """
+    # Step 1: Search for the author's Wikiquote page
+    author_url = search_wikiquote_author(author_name)
+    if not author_url:
+        return [NO_QUOTES_FOUND]
 
-    return quotes[:5]  # Limit to the first 10 quotes for better coverage
+    # Step 2: Scrape quotes from the author's page
+    quotes = scrape_wikiquote_quotes(author_url)
+    return quotes if quotes else [NO_QUOTES_AVAILABLE]
 
 
 def fetch_quotes_from_wikiquote(author_name):
@@ -250,13 +304,72 @@ def fetch_quotes_from_wikiquote(author_name):
     Search Wikiquote for an author and fetch their famous quotes.
     """
     try:
-        # Step 1: Search for the author's Wikiquote page
-        author_url = search_wikiquote_author(author_name)
-        if not author_url:
-            return ["No quotes found for this author on Wikiquote."]
-
-        # Step 2: Scrape quotes from the author's page
-        quotes = scrape_wikiquote_quotes(author_url)
-        return quotes if quotes else ["No quotes available for this author."]
+        return find_wikiquote_quotes(author_name)
     except Exception as e:
-        return [f"Error fetching quotes: {str(e)}"]
\ No newline at end of file
+        return [f"Error fetching quotes: {str(e)}"]
+
+
+def _part_status(name, data):
+    """
+    Return "ok", or "not_found" when a book details part holds nothing or only a placeholder.
+    """
+    if data is None:
+        return "not_found"
+    if name == "summary" and data == open_library.NO_SUMMARY:
+        return "not_found"
+    if name == "author_bio" and data.get("biography") == open_library.NO_BIOGRAPHY:
+        return "not_found"
+    if name == "quotes" and data in ([NO_QUOTES_FOUND], [NO_QUOTES_AVAILABLE]):
+        return "not_found"
+    return "ok"
+
+
+def _timed(func, *args):
+    """
+    Run func and return (result, error, elapsed seconds).
+    """
+    started = time.perf_counter()
+    try:
+        return func(*args), None, time.perf_counter() - started
+    except Exception as e:
+        return None, e, time.perf_counter() - started
+
+
+def fetch_book_details(book_title, author_name=None, timeout=BOOK_DETAILS_TIMEOUT, known=None):
+    """
+    Fetch a book's summary and its author's biography and quotes concurrently.
+    Everything that finishes within `timeout` seconds is returned; each part reports
+    its status ("ok", "not_found", "error", or "timeout"), data, and elapsed time.
+    Parts already in `known` (by part name) are returned as is instead of fetched.
+    """
+    known = known or {}
+    parts = {"summary": (open_library.fetch_book_summary_by_title, book_title)}
+    if author_name:
+        parts["author_bio"] = (open_library.fetch_open_library_author_bio, author_name)
+        parts["quotes"] = (find_wikiquote_quotes, author_name)  # Raises, so failures report as errors
+
+    results = {}
+    for name in list(parts):
+        if name in known:
+            del parts[name]
+            data = known[name]
+            results[name] = {"status": _part_status(name, data), "data": data, "elapsed_ms": 0}
+
+    started = time.perf_counter()
+    futures = {_details_executor.submit(_timed, func, arg): name for name, (func, arg) in parts.items()}
+    done, _ = wait(futures, timeout=timeout)
+
+    for future, name in futures.items():
+        if future not in done:
+            future.cancel()  # Only stops parts that haven't started yet
+            results[name] = {"status": "timeout", "data": None, "elapsed_ms": round(timeout * 1000)}
+            continue
+        data, error, elapsed = future.result()
+        if error is not None:
+            results[name] = {"status": "error", "error": str(error), "data": None}
+        else:
+            results[name] = {"status": _part_status(name, data), "data": data}
+        results[name]["elapsed_ms"] = round(elapsed * 1000)
+
+    results["elapsed_ms"] = round((time.perf_counter() - started) * 1000)
+    return results
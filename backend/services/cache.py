@@ -0,0 +1,341 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+# Returned by cache lookups when a key isn't cached, so None can be cached as a value
+MISSING = object()
+
+
+class LRUCache:
+    """
+    A thread-safe, size-bounded mapping that evicts the least recently used entry.
+    Entries may optionally expire after a time-to-live, given per cache or per entry.
+    Keeps hit, miss, and eviction counters.
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at or None, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=MISSING):
+        """
+        Return the cached value for key and mark it as recently used.
+        Expired entries are removed and count as misses.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """
+        Cache a value, evicting the least recently used entry if the cache is full.
+        `ttl` overrides the cache's default time-to-live for this entry.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        """
+        Remove a key from the cache if present.
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """
+        Return the cache's size and hit/miss counters.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+class SQLiteCache:
+    """
+    A persistent key/value cache stored in its own SQLite file, so entries survive restarts.
+    Values are stored as JSON and expire after a per-entry time-to-live; once more than
+    `max_entries` are stored, the entries closest to expiry are dropped.
+    """
+
+    def __init__(self, path, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,      -- JSON-encoded value
+                expires_at REAL NOT NULL  -- Unix time after which the entry is stale
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache (expires_at)")
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=MISSING):
+        """
+        Return the cached value for key, or `default` if it is missing or expired.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return json.loads(row[0])
+
+    def get_with_ttl(self, key, default=MISSING):
+        """
+        Return (value, seconds until the entry expires) for key, or `default` if it is missing or expired.
+        """
+        with self._lock:
+            now = time.time()
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return json.loads(row[0]), row[1] - now
+
+    def set(self, key, value, ttl):
+        """
+        Store a JSON-serializable value for `ttl` seconds.
+        """
+        with self._lock:
+            now = time.time()
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), now + ttl),
+                )
+                self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+                self._conn.execute("""
+                    DELETE FROM cache WHERE key IN (
+                        SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.max_entries,))
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM cache")
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """
+        Return the number of stored entries and hit/miss counters.
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+            return {
+                "path": self.path,
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class ResponseCache:
+    """
+    A persistent cache of upstream HTTP responses, keyed by request URL and stored in its own
+    SQLite file. Each body keeps its ETag/Last-Modified validators for conditional requests and
+    the results parsed from it, which stay valid for as long as the body is unchanged.
+    Once bodies total more than `max_bytes`, the least recently used responses are dropped.
+    """
+
+    def __init__(self, path, max_bytes=100 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,      -- Request URL, including the query string
+                url TEXT NOT NULL,         -- Final URL after redirects
+                body TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                version TEXT NOT NULL,     -- Hash of the body; parsed results are tied to it
+                fetched_at REAL NOT NULL,  -- Unix time the body was last confirmed current
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL      -- Body size in bytes
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used)")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS parsed (
+                key TEXT NOT NULL,
+                name TEXT NOT NULL,        -- Which parser produced the value
+                version TEXT NOT NULL,     -- Version of the body it was parsed from
+                value TEXT NOT NULL,       -- JSON-encoded result
+                PRIMARY KEY (key, name)
+            )
+        """)
+        self._conn.commit()
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        Return the stored response for key as a dictionary, or None, and mark it as recently used.
+        """
+        with self._lock:
+            with self._conn:
+                row = self._conn.execute("SELECT * FROM responses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            return dict(row)
+
+    def put(self, key, url, body, etag=None, last_modified=None):
+        """
+        Store a response body with its validators, evicting old responses if over the size cap.
+        Returns the stored entry.
+        """
+        now = time.time()
+        entry = {
+            "key": key,
+            "url": url,
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "version": hashlib.sha1(body.encode("utf-8")).hexdigest(),
+            "fetched_at": now,
+            "last_used": now,
+            "size": len(body.encode("utf-8")),
+        }
+        with self._lock:
+            with self._conn:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO responses (key, url, body, etag, last_modified, version, fetched_at, last_used, size)
+                    VALUES (:key, :url, :body, :etag, :last_modified, :version, :fetched_at, :last_used, :size)
+                """, entry)
+                self._conn.execute("DELETE FROM parsed WHERE key = ? AND version != ?", (key, entry["version"]))
+                self._evict()
+        return entry
+
+    def _evict(self):
+        # Keep the most recently used responses whose sizes fit under the cap
+        cursor = self._conn.execute("""
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM (
+                    SELECT key, SUM(size) OVER (ORDER BY last_used DESC, key) AS running_size FROM responses
+                ) WHERE running_size > ?
+            )
+        """, (self.max_bytes,))
+        if cursor.rowcount > 0:
+            self.evictions += cursor.rowcount
+            self._conn.execute("DELETE FROM parsed WHERE key NOT IN (SELECT key FROM responses)")
+
+    def mark_revalidated(self, key, etag=None, last_modified=None):
+        """
+        Record that the upstream confirmed the stored body is still current (a 304 response).
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("""
+                    UPDATE responses
+                    SET fetched_at = ?, etag = COALESCE(?, etag), last_modified = COALESCE(?, last_modified)
+                    WHERE key = ?
+                """, (time.time(), etag, last_modified, key))
+
+    def get_parsed(self, key, name, version, default=MISSING):
+        """
+        Return the result `name` parsed from version `version` of a response, or `default`.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM parsed WHERE key = ? AND name = ? AND version = ?", (key, name, version)
+            ).fetchone()
+        return json.loads(row[0]) if row is not None else default
+
+    def set_parsed(self, key, name, version, value):
+        """
+        Store a JSON-serializable result parsed from version `version` of a response.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO parsed (key, name, version, value) VALUES (?, ?, ?, ?)",
+                    (key, name, version, json.dumps(value)),
+                )
+
+    def clear(self):
+        """
+        Remove every stored response and parsed result.
+        """
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.execute("DELETE FROM parsed")
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Return the number and total size of stored responses.
+        """
+        with self._lock:
+            count, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            parsed = self._conn.execute("SELECT COUNT(*) FROM parsed").fetchone()[0]
+        return {
+            "path": self.path,
+            "responses": count,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "parsed_results": parsed,
+            "evictions": self.evictions,
+        }
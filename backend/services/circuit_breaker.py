@@ -0,0 +1,126 @@
+import math
+import os
+import threading
+import time
+
+# A host's circuit opens after this many consecutive failed or slow calls
+FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))  # Seconds an open circuit waits before a trial call
+SLOW_CALL_SECONDS = float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "5"))  # Successful calls slower than this count as failures
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of calling a host whose circuit is open.
+    """
+
+    def __init__(self, host, retry_after):
+        super().__init__(f"{host} is temporarily unavailable. Try again in {math.ceil(retry_after)} seconds.")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Tracks the health of one upstream host. After `failure_threshold` consecutive failures
+    the circuit opens and calls are rejected for `reset_timeout` seconds; then a single
+    trial call is let through, which closes the circuit on success or reopens it on failure.
+    """
+
+    def __init__(self, host, failure_threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0  # Consecutive failures
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_call(self, now=None):
+        """
+        Raise CircuitOpenError if a call to the host should not be made right now.
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self.state == OPEN:
+                retry_after = self.opened_at + self.reset_timeout - now
+                if retry_after > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, retry_after)
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN:
+                if self._trial_in_flight:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.host, self.reset_timeout)
+                self._trial_in_flight = True
+
+    def record_success(self):
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, now=None):
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.times_opened += 1
+                self.state = OPEN
+                self.opened_at = now
+            self._trial_in_flight = False
+
+    def stats(self):
+        """
+        Return the circuit's state and counters.
+        """
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = round(max(self.opened_at + self.reset_timeout - time.monotonic(), 0), 1)
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+                "retry_in_seconds": retry_in,
+            }
+
+
+def breaker_for(host):
+    """
+    Return the circuit breaker for a host, creating it on first use.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = _breakers[host] = CircuitBreaker(host)
+        return breaker
+
+
+def reset_breakers():
+    """
+    Forget every host's circuit state.
+    """
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def get_breaker_stats():
+    """
+    Return the state of every host's circuit.
+    """
+    with _breakers_lock:
+        breakers = dict(_breakers)
+    return {host: breaker.stats() for host, breaker in breakers.items()}
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+from database.models import evict_covers, forget_covers, get_cover, get_cover_store_size, save_cover, touch_cover
+from . import http_client
+
+# Cover images are downloaded once into a content-addressed store: each file is named by the
+# SHA-256 of its bytes, so books sharing a cover share one file
+COVER_CACHE_DIR = os.path.abspath(os.getenv("COVER_CACHE_DIR", "covers"))
+COVER_CACHE_MAX_MB = float(os.getenv("COVER_CACHE_MAX_MB", "200"))
+COVER_MAX_BYTES = int(os.getenv("COVER_MAX_BYTES", str(5 * 1024 * 1024)))  # Larger downloads are rejected
+COVER_MAX_AGE = int(os.getenv("COVER_MAX_AGE", str(30 * 24 * 3600)))  # Seconds browsers may reuse a served cover
+# Hosts covers may be downloaded from or redirected to; "*." entries match any subdomain.
+# cover_art comes from clients, so anything else (internal or loopback hosts) is refused
+COVER_HOSTS = [host.strip().lower() for host in os.getenv(
+    "COVER_HOSTS", "books.google.com,*.googleusercontent.com,covers.openlibrary.org"
+).split(",") if host.strip()]
+COVER_MAX_REDIRECTS = 3
+COVER_CHUNK_SIZE = 64 * 1024  # Bytes read at a time while downloading a cover
+COVER_TOUCH_INTERVAL = 3600  # Record a cover's use at most once an hour, to keep reads from writing
+
+_store_lock = threading.Lock()  # Held while files are written or deleted, so eviction can't race a download
+
+
+def cover_path(digest):
+    """
+    Return the path of the stored image with the given digest.
+    """
+    return os.path.join(COVER_CACHE_DIR, digest[:2], digest)
+
+
+def _remove_files(digests):
+    for digest in digests:
+        try:
+            os.remove(cover_path(digest))
+        except FileNotFoundError:
+            pass
+
+
+def is_allowed_cover_url(url):
+    """
+    Return True if `url` is an http(s) URL on one of the COVER_HOSTS.
+    """
+    try:
+        parts = urlsplit(url)
+    except (TypeError, ValueError):
+        return False
+    host = (parts.hostname or "").lower()
+    if parts.scheme not in ("http", "https") or not host:
+        return False
+    return any(
+        host.endswith(allowed[1:]) if allowed.startswith("*.") else host == allowed
+        for allowed in COVER_HOSTS
+    )
+
+
+def _read_limited(response):
+    """
+    Read a streamed response body, raising as soon as it exceeds COVER_MAX_BYTES.
+    """
+    too_large = Exception(f"Cover art is larger than {COVER_MAX_BYTES} bytes.")
+    length = response.headers.get("Content-Length")
+    if length and length.isdigit() and int(length) > COVER_MAX_BYTES:
+        raise too_large
+
+    body = bytearray()
+    for chunk in response.iter_content(chunk_size=COVER_CHUNK_SIZE):
+        body.extend(chunk)
+        if len(body) > COVER_MAX_BYTES:
+            raise too_large
+    return bytes(body)
+
+
+def _get_cover_response(url):
+    """
+    Start streaming the cover at `url`, following redirects only to allowed cover hosts.
+    """
+    for _ in range(COVER_MAX_REDIRECTS + 1):
+        if not is_allowed_cover_url(url):
+            raise ValueError(f"Cover art URL '{url}' is not on an allowed cover host.")
+        response = http_client.get(url, stream=True, allow_redirects=False)
+        if not response.is_redirect:
+            return response
+        url = urljoin(url, response.headers.get("Location", ""))
+        response.close()
+    raise Exception("Too many redirects fetching cover art.")
+
+
+def download_cover(url, now=None):
+    """
+    Download the cover image at `url` into the store, evicting the least recently used
+    covers if the store grows past COVER_CACHE_MAX_MB. Raises if the download fails.
+    """
+    now = time.time() if now is None else now
+    response = _get_cover_response(url)
+    try:
+        if response.status_code != 200:
+            raise Exception(f"Failed to fetch cover art (status {response.status_code}).")
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip()
+        if not content_type.startswith("image/"):
+            raise Exception(f"Cover art URL returned '{content_type}' instead of an image.")
+        body = _read_limited(response)
+    finally:
+        response.close()
+
+    digest = hashlib.sha256(body).hexdigest()
+    path = cover_path(digest)
+    with _store_lock:
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(body)
+            os.replace(temp_path, path)  # Readers never see a partly written file
+        _remove_files(save_cover(url, digest, content_type, len(body), now))
+        _remove_files(evict_covers(int(COVER_CACHE_MAX_MB * 1024 * 1024)))
+    return digest
+
+
+def get_cached_cover(url):
+    """
+    Return the stored cover for `url` with the path of its file, or None if it hasn't been downloaded.
+    """
+    cover = get_cover(url)
+    if cover is None:
+        return None
+    path = cover_path(cover["digest"])
+    if not os.path.isfile(path):
+        forget_covers([url])  # The file was removed behind our back; download it again
+        return None
+
+    now = time.time()
+    if now - cover["last_used"] > COVER_TOUCH_INTERVAL:
+        touch_cover(url, now)
+    return {**cover, "path": path}
+
+
+def get_cover_cache_stats():
+    """
+    Return the size of the cover store and its cap.
+    """
+    return {
+        **get_cover_store_size(),
+        "max_bytes": int(COVER_CACHE_MAX_MB * 1024 * 1024),
+        "path": COVER_CACHE_DIR,
+    }
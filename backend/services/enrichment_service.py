@@ -0,0 +1,264 @@
+import os
+import sqlite3
+import threading
+import time
+from database.models import (
+    claim_enrichment_job,
+    enqueue_enrichment_jobs,
+    finish_enrichment_job,
+    get_author_bio,
+    get_author_quotes,
+    get_book_summary,
+    get_enrichment_job_counts,
+    iter_books,
+    requeue_interrupted_enrichment_jobs,
+    save_author_bio,
+    save_author_quotes,
+    save_book_summary,
+)
+from database.normalize import author_name_key, normalize_title
+from . import open_library
+from .cover_service import download_cover, is_allowed_cover_url
+from .bs_scrape_service import find_wikiquote_quotes
+
+# Books added to the library get their summary, author bio, quotes, and cover image fetched in
+# the background and stored, so reads come from SQLite instead of Open Library and Wikiquote
+ENRICHMENT_WORKERS = int(os.getenv("ENRICHMENT_WORKERS", "2"))
+ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "4"))
+ENRICHMENT_RETRY_DELAY = float(os.getenv("ENRICHMENT_RETRY_DELAY", "60"))  # Doubles after each failed attempt
+ENRICHMENT_POLL_INTERVAL = float(os.getenv("ENRICHMENT_POLL_INTERVAL", "30"))  # Idle workers check for due retries this often
+BACKFILL_CHUNK_SIZE = 500  # Jobs queued per transaction during a backfill
+
+_stats = {"completed": 0, "retried": 0, "failed": 0}
+_stats_lock = threading.Lock()
+_wake = threading.Event()  # Set when new jobs are queued
+_stop = threading.Event()
+_workers = []
+
+
+def _now():
+    return time.time()
+
+
+def _count(stat):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def _enrich_book_summary(title, now):
+    save_book_summary(normalize_title(title), open_library.fetch_book_summary_by_title(title), now)
+
+
+def _enrich_author_bio(author_name, now):
+    bio = open_library.fetch_open_library_author_bio(author_name)
+    save_author_bio(author_name_key(author_name), bio["biography"], bio["image_url"], now)
+
+
+def _enrich_author_quotes(author_name, now):
+    save_author_quotes(author_name_key(author_name), find_wikiquote_quotes(author_name), now)
+
+
+def _enrich_cover_art(url, now):
+    download_cover(url, now)
+
+
+# Job kind -> function fetching and storing the data for a subject; raising schedules a retry
+JOB_KINDS = {
+    "book_summary": _enrich_book_summary,
+    "author_bio": _enrich_author_bio,
+    "author_quotes": _enrich_author_quotes,
+    "cover_art": _enrich_cover_art,
+}
+
+
+def _book_jobs(title, authors, cover_art=None):
+    """
+    Return the (kind, subject, subject_key) jobs enriching a book and its authors.
+    """
+    jobs = [("book_summary", title, normalize_title(title))]
+    if cover_art and is_allowed_cover_url(cover_art):
+        jobs.append(("cover_art", cover_art, cover_art))
+    for author in authors if isinstance(authors, list) else [authors]:
+        name_key = author_name_key(author) if author else ""
+        if name_key:
+            jobs.append(("author_bio", author, name_key))
+            jobs.append(("author_quotes", author, name_key))
+    return jobs
+
+
+def enqueue_book_enrichment(title, authors, cover_art=None):
+    """
+    Queue the jobs fetching a book's summary and cover and its authors' bios and quotes.
+    Subjects already queued or stored are skipped. Returns the number of jobs queued.
+    """
+    added = enqueue_enrichment_jobs(_book_jobs(title, authors, cover_art), _now())
+    if added:
+        _wake.set()
+    return added
+
+
+def enqueue_books_enrichment(books):
+    """
+    Queue enrichment jobs for many books (dictionaries with title, authors, and cover_art keys)
+    in one transaction. Returns the number of jobs queued.
+    """
+    jobs = [job for book in books for job in _book_jobs(book["title"], book["authors"], book.get("cover_art"))]
+    added = enqueue_enrichment_jobs(jobs, _now()) if jobs else 0
+    if added:
+        _wake.set()
+    return added
+
+
+def enqueue_cover_download(url):
+    """
+    Queue a download of the cover image at `url` unless one is already queued or stored.
+    URLs outside the allowed cover hosts are ignored.
+    """
+    if not is_allowed_cover_url(url):
+        return 0
+    added = enqueue_enrichment_jobs([("cover_art", url, url)], _now())
+    if added:
+        _wake.set()
+    return added
+
+
+def enqueue_library_backfill(chunk_size=BACKFILL_CHUNK_SIZE):
+    """
+    Queue enrichment jobs for every book already in the library, giving failed jobs a fresh
+    set of attempts. Returns the number of jobs queued.
+    """
+    added = 0
+    jobs = []
+    for book in iter_books():
+        jobs.extend(_book_jobs(book["title"], book["authors"], book["cover_art"]))
+        if len(jobs) >= chunk_size:
+            added += enqueue_enrichment_jobs(jobs, _now())
+            jobs = []
+    if jobs:
+        added += enqueue_enrichment_jobs(jobs, _now())
+    if added:
+        _wake.set()
+    return added
+
+
+def run_next_job():
+    """
+    Claim and run one due job. Failed jobs are retried with exponential backoff until
+    ENRICHMENT_MAX_ATTEMPTS is reached. Returns False if no job was due.
+    """
+    job = claim_enrichment_job(_now())
+    if job is None:
+        return False
+
+    try:
+        JOB_KINDS[job["kind"]](job["subject"], _now())
+    except Exception as e:
+        now = _now()
+        if job["attempts"] < ENRICHMENT_MAX_ATTEMPTS:
+            retry_at = now + ENRICHMENT_RETRY_DELAY * 2 ** (job["attempts"] - 1)
+            finish_enrichment_job(job["id"], now, error=str(e), retry_at=retry_at)
+            _count("retried")
+        else:
+            print(f"Giving up on {job['kind']} for '{job['subject']}' after {job['attempts']} attempts: {e}")
+            finish_enrichment_job(job["id"], now, error=str(e))
+            _count("failed")
+        return True
+
+    finish_enrichment_job(job["id"], _now())
+    _count("completed")
+    return True
+
+
+def run_until_empty():
+    """
+    Run due jobs in the calling thread until none are left. Returns the number of jobs run.
+    """
+    ran = 0
+    while run_next_job():
+        ran += 1
+    return ran
+
+
+def _run_worker():
+    while not _stop.is_set():
+        try:
+            if run_next_job():
+                continue
+        except sqlite3.Error as e:
+            print(f"Enrichment worker error: {e}")
+        _wake.wait(ENRICHMENT_POLL_INTERVAL)
+        _wake.clear()
+
+
+def start_enrichment_workers(workers=ENRICHMENT_WORKERS):
+    """
+    Start the background threads that work through the enrichment queue. Jobs left
+    running by a previous process are queued again first.
+    """
+    if any(worker.is_alive() for worker in _workers):
+        return
+    requeue_interrupted_enrichment_jobs(_now())
+    _stop.clear()
+    _workers.clear()
+    for i in range(workers):
+        worker = threading.Thread(target=_run_worker, name=f"enrichment-{i}", daemon=True)
+        worker.start()
+        _workers.append(worker)
+
+
+def stop_enrichment_workers():
+    """
+    Stop the background enrichment threads once their current jobs finish.
+    """
+    _stop.set()
+    _wake.set()
+    for worker in _workers:
+        worker.join(timeout=5)
+    _workers.clear()
+
+
+def get_stored_book_summary(title):
+    """
+    Return the stored summary row for a book ({"summary": ...}), or None if it hasn't been fetched yet.
+    A stored summary of None means Open Library doesn't have the book.
+    """
+    row = get_book_summary(title)
+    return {"summary": row["summary"]} if row else None
+
+
+def get_stored_author_bio(author_name):
+    """
+    Return the stored biography and image URL for an author, or None if they haven't been fetched yet.
+    """
+    return get_author_bio(author_name_key(author_name))
+
+
+def get_stored_book_details(book_title, author_name=None):
+    """
+    Return the parts of a book's details already stored, keyed like fetch_book_details' results.
+    """
+    known = {}
+    summary = get_stored_book_summary(book_title)
+    if summary is not None:
+        known["summary"] = summary["summary"]
+    if author_name:
+        bio = get_stored_author_bio(author_name)
+        if bio is not None:
+            known["author_bio"] = bio
+        quotes = get_author_quotes(author_name_key(author_name))
+        if quotes is not None:
+            known["quotes"] = quotes
+    return known
+
+
+def get_enrichment_stats():
+    """
+    Return queue sizes by status and completed, retried, and failed job counters.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    return {
+        **stats,
+        "queue": get_enrichment_job_counts(),
+        "workers": sum(worker.is_alive() for worker in _workers),
+    }
@@ -1,63 +1,201 @@
-import requests
+import os
+import threading
 import urllib.parse  # Import for encoding the query
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from . import http_client
+from .cache import LRUCache, SQLiteCache, MISSING
+from .single_flight import coalesced
 
-def search_books(query, max_results=40):
+# Search results are cached by normalized query and max_results
+SEARCH_CACHE_TTL = int(os.getenv("GAPI_CACHE_TTL", "21600"))  # 6 hours for searches with results
+SEARCH_CACHE_NEGATIVE_TTL = int(os.getenv("GAPI_CACHE_NEGATIVE_TTL", "300"))  # 5 minutes for empty results
+SEARCH_CACHE_SIZE = int(os.getenv("GAPI_CACHE_SIZE", "512"))
+SEARCH_CACHE_PATH = os.getenv("GAPI_CACHE_PATH")  # Optional SQLite file for a cache that survives restarts
+
+# Deep search fetches several result pages at once
+DEEP_SEARCH_MAX_PAGES = 10
+DEEP_SEARCH_WORKERS = int(os.getenv("GAPI_DEEP_SEARCH_WORKERS", "4"))  # Upstream requests in flight per deep search
+
+_memory_cache = LRUCache(SEARCH_CACHE_SIZE)
+_last_good = LRUCache(SEARCH_CACHE_SIZE)  # Latest results per search, kept past their TTL to serve while the API is unavailable
+_persistent_cache = SQLiteCache(SEARCH_CACHE_PATH) if SEARCH_CACHE_PATH else None
+_cache_stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "stale_hits": 0}
+_cache_stats_lock = threading.Lock()
+
+
+def _cache_key(query, max_results, start_index=0):
+    """
+    Build the cache key for a search: the casefolded, whitespace-collapsed query and page position.
+    """
+    key = f"{' '.join(query.split()).casefold()}|{max_results}"
+    return f"{key}|{start_index}" if start_index else key
+
+
+def _count(stat):
+    with _cache_stats_lock:
+        _cache_stats[stat] += 1
+
+
+def search_books(query, max_results=40, start_index=0):
     """
     Search for books using the Google Books API and return results.
+    `start_index` selects a later page of results.
+    Results are served from the in-memory cache, then the persistent cache, before calling the API.
+    If the call fails (or the API's circuit is open), the last results seen for the search are returned.
     """
     if not query:
         raise ValueError("Query parameter is required")
-    
-    try:
-        # Encode the query to handle spaces and special characters
-        encoded_query = urllib.parse.quote(query)
-        
-        # Ensure max_results is within the allowed range (1-40)
-        max_results = min(max(max_results, 1), 40)
-
-        # Construct the API URL
-        url = f"https://www.googleapis.com/books/v1/volumes?q={encoded_query}&maxResults={max_results}"
-        print(f"Fetching books from URL: {url}")  # Log the API URL for debugging
-
-        response = requests.get(url)
-        if response.status_code != 200:
-            print(f"Error: Received status code {response.status_code}")
-            return []
-
-        # Parse the API response
-        data = response.json()
-        books = data.get("items", [])
-
-        # Extract book details
-        results = []
-        for book in books:
-            volume_info = book.get("volumeInfo", {})
-            title = volume_info.get("title", "No Title")
-            authors = volume_info.get("authors", ["Unknown Author"])
-            description = volume_info.get("description", "No Description Available")
-            image_links = volume_info.get("imageLinks", {})
-            cover_art = image_links.get("thumbnail", "No Cover Art Available")
-
-            # Extract ISBN
-            industry_identifiers = volume_info.get("industryIdentifiers", [])
-            isbn = "No ISBN Available"
-            for identifier in industry_identifiers:
-                if identifier.get("type") == "ISBN_13":
-                    isbn = identifier.get("identifier")
-                    break
-                elif identifier.get("type") == "ISBN_10" and isbn == "No ISBN Available":
-                    isbn = identifier.get("identifier")
-
-            results.append({
-                "isbn": isbn,
-                "title": title,
-                "authors": authors,
-                "description": description,
-                "cover_art": cover_art
-            })
-
-        return results
 
+    # Ensure max_results is within the allowed range (1-40)
+    max_results = min(max(max_results, 1), 40)
+    start_index = max(start_index, 0)
+    key = _cache_key(query, max_results, start_index)
+
+    books = _memory_cache.get(key)
+    if books is not MISSING:
+        _count("memory_hits")
+        return books
+    if _persistent_cache is not None:
+        entry = _persistent_cache.get_with_ttl(key)
+        if entry is not MISSING:
+            _count("persistent_hits")
+            books, ttl = entry
+            _memory_cache.set(key, books, ttl)  # Expire together with the persistent entry
+            return books
+    _count("misses")
+
+    try:
+        books = _fetch_books(query, max_results, start_index)
     except Exception as e:
         print(f"Error occurred: {e}")
-        return []
\ No newline at end of file
+        stale = _last_good.get(key)
+        if stale is not MISSING:
+            _count("stale_hits")
+            return stale
+        return []  # Failures are not cached
+
+    # Empty results are cached too, but only briefly
+    ttl = SEARCH_CACHE_TTL if books else SEARCH_CACHE_NEGATIVE_TTL
+    _memory_cache.set(key, books, ttl)
+    if _persistent_cache is not None:
+        _persistent_cache.set(key, books, ttl)
+    if books:
+        _last_good.set(key, books)
+    return books
+
+
+def deep_search_books(query, pages=3, max_results=40):
+    """
+    Fetch several pages of Google Books results concurrently and yield them as they arrive.
+    Yields one dictionary per page with its start index and the books not already seen on
+    an earlier-arriving page (matched by ISBN, or by title and authors when there is no ISBN).
+    """
+    if not query:
+        raise ValueError("Query parameter is required")
+    if not 1 <= pages <= DEEP_SEARCH_MAX_PAGES:
+        raise ValueError(f"Pages must be between 1 and {DEEP_SEARCH_MAX_PAGES}")
+    max_results = min(max(max_results, 1), 40)
+
+    return _deep_search_pages(query, pages, max_results)
+
+
+def _deep_search_pages(query, pages, max_results):
+    seen = set()
+    executor = ThreadPoolExecutor(max_workers=min(DEEP_SEARCH_WORKERS, pages))
+    try:
+        futures = {
+            executor.submit(search_books, query, max_results, page * max_results): page * max_results
+            for page in range(pages)
+        }
+        for future in as_completed(futures):
+            new_books = []
+            for book in future.result():
+                key = book["isbn"] if book["isbn"] != "No ISBN Available" else (book["title"], tuple(book["authors"]))
+                if key not in seen:
+                    seen.add(key)
+                    new_books.append(book)
+            yield {"start_index": futures[future], "books": new_books}
+    finally:
+        # If the client goes away mid-stream, don't start the pages still queued
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def clear_search_cache():
+    """
+    Empty both search cache tiers and reset the counters.
+    """
+    _memory_cache.clear()
+    _last_good.clear()
+    if _persistent_cache is not None:
+        _persistent_cache.clear()
+    with _cache_stats_lock:
+        for stat in _cache_stats:
+            _cache_stats[stat] = 0
+
+
+def get_search_cache_stats():
+    """
+    Return hit/miss counters and the overall hit rate for the search cache.
+    """
+    with _cache_stats_lock:
+        stats = dict(_cache_stats)
+    lookups = stats["memory_hits"] + stats["persistent_hits"] + stats["misses"]
+    hits = stats["memory_hits"] + stats["persistent_hits"]
+    stats["hit_rate"] = round(hits / lookups, 4) if lookups else None
+    stats["memory"] = _memory_cache.stats()
+    stats["persistent"] = _persistent_cache.stats() if _persistent_cache is not None else None
+    return stats
+
+
+@coalesced
+def _fetch_books(query, max_results, start_index=0):
+    """
+    Call the Google Books API and return the parsed results.
+    Raises an exception if the API doesn't answer successfully.
+    """
+    # Encode the query to handle spaces and special characters
+    encoded_query = urllib.parse.quote(query)
+
+    # Construct the API URL
+    url = f"https://www.googleapis.com/books/v1/volumes?q={encoded_query}&maxResults={max_results}"
+    if start_index:
+        url += f"&startIndex={start_index}"
+    print(f"Fetching books from URL: {url}")  # Log the API URL for debugging
+
+    response = http_client.get(url)
+    if response.status_code != 200:
+        raise Exception(f"Received status code {response.status_code}")
+
+    # Parse the API response
+    data = response.json()
+    books = data.get("items", [])
+
+    # Extract book details
+    results = []
+    for book in books:
+        volume_info = book.get("volumeInfo", {})
+        title = volume_info.get("title", "No Title")
+        authors = volume_info.get("authors", ["Unknown Author"])
+        description = volume_info.get("description", "No Description Available")
+        image_links = volume_info.get("imageLinks", {})
+        cover_art = image_links.get("thumbnail", "No Cover Art Available")
+
+        # Extract ISBN
+        industry_identifiers = volume_info.get("industryIdentifiers", [])
+        isbn = "No ISBN Available"
+        for identifier in industry_identifiers:
+            if identifier.get("type") == "ISBN_13":
+                isbn = identifier.get("identifier")
+                break
+            elif identifier.get("type") == "ISBN_10" and isbn == "No ISBN Available":
+                isbn = identifier.get("identifier")
+
+        results.append({
+            "isbn": isbn,
+            "title": title,
+            "authors": authors,
+            "description": description,
+            "cover_art": cover_art
+        })
+
+    return results
\ No newline at end of file
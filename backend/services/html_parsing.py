@@ -0,0 +1,59 @@
+import importlib.util
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.filter import ElementFilter
+
+# lxml builds trees several times faster than the pure-Python parser; use it when it's installed
+PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+
+class AnyOf(ElementFilter):
+    """
+    Parse-only filter that keeps the subtrees matched by any of the given strainers,
+    for pages where the data we need lives in more than one place.
+    """
+
+    def __init__(self, *strainers):
+        super().__init__()
+        self.strainers = strainers
+
+    @property
+    def includes_everything(self):
+        return False
+
+    @property
+    def excludes_everything(self):
+        return all(strainer.excludes_everything for strainer in self.strainers)
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return any(strainer.allow_tag_creation(nsprefix, name, attrs) for strainer in self.strainers)
+
+    def allow_string_creation(self, string):
+        return any(strainer.allow_string_creation(string) for strainer in self.strainers)
+
+
+def has_class(name):
+    """
+    Attribute rule matching elements whose class list includes `name`. Strainers see the
+    raw class attribute during parsing, so multi-class elements need a token match.
+    """
+    return lambda value: value is not None and name in value.split()
+
+
+# The parts of each scraped page the scrapers read; everything outside them is skipped while parsing
+AUTHOR_SEARCH_RESULTS = SoupStrainer(class_=has_class("bookauthor"))
+AUTHOR_PROFILE = AnyOf(
+    SoupStrainer(attrs={"itemprop": "description"}),
+    SoupStrainer(class_=has_class("SRPCover")),
+)
+BOOK_SEARCH_RESULTS = SoupStrainer(class_=has_class("searchResultItem"))
+BOOK_DESCRIPTION = SoupStrainer(class_=has_class("book-description"))
+QUOTE_OF_THE_DAY = SoupStrainer("table", attrs={"align": "center"})
+WIKIQUOTE_SEARCH_RESULTS = SoupStrainer(class_=has_class("mw-search-result-heading"))
+WIKIQUOTE_CONTENT = SoupStrainer(class_=has_class("mw-parser-output"))
+
+
+def parse_html(markup, only=None, parser=PARSER):
+    """
+    Parse markup with the fastest available parser, keeping only the subtrees matched by `only`.
+    """
+    return BeautifulSoup(markup, parser, parse_only=only)
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+import time
+import requests
+from . import http_client
+from .cache import ResponseCache, MISSING
+
+# Scraped pages and API documents are stored on disk when HTTP_CACHE_PATH is set
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH")
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_MB", "100")) * 1024 * 1024
+HTTP_CACHE_FRESH_FOR = int(os.getenv("HTTP_CACHE_FRESH_FOR", "86400"))  # Seconds a stored response is used without revalidating
+
+_cache = ResponseCache(HTTP_CACHE_PATH, HTTP_CACHE_MAX_BYTES) if HTTP_CACHE_PATH else None
+_stats = {"fresh_hits": 0, "revalidated": 0, "stale_hits": 0, "misses": 0, "parsed_hits": 0, "parsed_misses": 0}
+_stats_lock = threading.Lock()
+
+
+class CachedResponse:
+    """
+    A stored response, with the attributes the scrapers read from a requests Response.
+    """
+
+    status_code = 200
+
+    def __init__(self, entry):
+        self.url = entry["url"]
+        self.text = entry["body"]
+        self.cache_key = entry["key"]
+        self.cache_version = entry["version"]
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def _count(stat):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def get(url, params=None, max_age=None, stale_if_error=True, **kwargs):
+    """
+    GET a URL through the response cache. Stored responses younger than `max_age` seconds
+    are returned without a request; older ones are revalidated with If-None-Match /
+    If-Modified-Since and reused on a 304. Only 200 responses are stored.
+    With `stale_if_error`, the last stored response is served when the host's circuit is
+    open, the request fails, or the host answers with a server error.
+    """
+    if _cache is None:
+        return http_client.get(url, params=params, **kwargs)
+
+    key = requests.Request("GET", url, params=params).prepare().url
+    max_age = HTTP_CACHE_FRESH_FOR if max_age is None else max_age
+    entry = _cache.get(key)
+    if entry is not None and time.time() - entry["fetched_at"] < max_age:
+        _count("fresh_hits")
+        return CachedResponse(entry)
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry is not None:
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    try:
+        response = http_client.get(key, headers=headers, **kwargs)
+    except Exception:
+        if entry is None or not stale_if_error:
+            raise
+        _count("stale_hits")
+        return CachedResponse(entry)
+
+    if entry is not None and response.status_code == 304:
+        _cache.mark_revalidated(key, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        _count("revalidated")
+        return CachedResponse(entry)
+
+    if entry is not None and stale_if_error and response.status_code >= 500:
+        _count("stale_hits")
+        return CachedResponse(entry)
+
+    _count("misses")
+    if response.status_code != 200:
+        return response  # Errors are not cached
+    entry = _cache.put(key, response.url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return CachedResponse(entry)
+
+
+def parsed(response, name, parse):
+    """
+    Return parse() for a response, reusing the stored result while the response body is unchanged.
+    `name` identifies the parser; results must be JSON-serializable.
+    """
+    if _cache is None or not isinstance(response, CachedResponse):
+        return parse()
+
+    value = _cache.get_parsed(response.cache_key, name, response.cache_version)
+    if value is not MISSING:
+        _count("parsed_hits")
+        return value
+    _count("parsed_misses")
+    value = parse()
+    _cache.set_parsed(response.cache_key, name, response.cache_version, value)
+    return value
+
+
+def clear_http_cache():
+    """
+    Remove every stored response and reset the counters.
+    """
+    if _cache is not None:
+        _cache.clear()
+    with _stats_lock:
+        for stat in _stats:
+            _stats[stat] = 0
+
+
+def get_http_cache_stats():
+    """
+    Return hit/revalidation/miss counters and the size of the response cache.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["enabled"] = _cache is not None
+    stats["store"] = _cache.stats() if _cache is not None else None
+    return stats
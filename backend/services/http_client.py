@@ -0,0 +1,114 @@
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from .circuit_breaker import SLOW_CALL_SECONDS, breaker_for
+
+# Connect/read timeouts in seconds for every upstream request
+CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "10"))  # Keep-alive connections kept per host
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+USER_AGENT = "MyLibrary/1.0"
+
+_stats = {"requests": 0, "retries": 0}
+_stats_lock = threading.Lock()
+
+
+class CountingRetry(Retry):
+    """
+    urllib3 Retry policy that records every retry it allows and waits at most
+    READ_TIMEOUT for a Retry-After header, so one upstream can't stall a request for minutes.
+    """
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, READ_TIMEOUT)
+
+    def increment(self, *args, **kwargs):
+        new_retry = super().increment(*args, **kwargs)  # Raises once retries are exhausted
+        with _stats_lock:
+            _stats["retries"] += 1
+        return new_retry
+
+
+def _build_adapter():
+    retry = CountingRetry(
+        total=MAX_RETRIES,
+        backoff_factor=0.5,  # 0.5s, 1s, 2s between attempts
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=["GET", "HEAD"],
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Hand back the last response so callers can check status_code
+    )
+    return HTTPAdapter(pool_connections=10, pool_maxsize=POOL_MAXSIZE, max_retries=retry)
+
+
+# One adapter (and so one set of per-host connection pools) shared by all threads.
+# Each thread gets its own Session on top of it, since Session state isn't thread-safe.
+_adapter = _build_adapter()
+_local = threading.local()
+
+
+def get_session():
+    """
+    Return this thread's Session, which reuses the shared keep-alive connection pools.
+    """
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers["User-Agent"] = USER_AGENT
+        session.mount("https://", _adapter)
+        session.mount("http://", _adapter)
+        _local.session = session
+    return session
+
+
+def get(url, **kwargs):
+    """
+    Perform a GET request through the shared pools with default timeouts and retries.
+    Raises CircuitOpenError without calling the host while its circuit is open; errors,
+    5xx/429 responses (after retries), and slow responses count against the circuit.
+    """
+    kwargs.setdefault("timeout", (CONNECT_TIMEOUT, READ_TIMEOUT))
+    breaker = breaker_for(urlsplit(url).netloc)
+    breaker.before_call()
+    with _stats_lock:
+        _stats["requests"] += 1
+
+    started = time.monotonic()
+    try:
+        response = get_session().get(url, **kwargs)
+    except Exception:
+        breaker.record_failure()
+        raise
+    if response.status_code in RETRY_STATUSES or time.monotonic() - started > SLOW_CALL_SECONDS:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def get_stats():
+    """
+    Return request, retry, and connection reuse counters for upstream HTTP calls.
+    """
+    opened = 0
+    sent = 0
+    pools = _adapter.poolmanager.pools
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is not None:
+            opened += pool.num_connections
+            sent += pool.num_requests
+    with _stats_lock:
+        return {
+            **_stats,
+            "connections_opened": opened,
+            "connections_reused": max(sent - opened, 0),
+            "hosts": len(pools),
+        }
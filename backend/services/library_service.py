@@ -1,34 +1,201 @@
+import csv
+import io
+import json
+import os
+import sqlite3
+import time
+from database.normalize import normalize_title
 from database.models import (
-    add_book_to_library,
+    add_book_if_absent,
+    add_books_if_absent,
+    validate_input,
     get_all_books,
+    get_authors,
+    get_book_by_isbn,
+    get_books_by_author,
+    get_books_page,
+    get_library_version,
+    iter_books,
+    search_library,
     is_book_in_library_by_title,
     update_book_status_in_db,
+    update_book_statuses_in_db,
     delete_book_by_isbn,
 )
+from .cache import LRUCache, MISSING
+from .enrichment_service import enqueue_book_enrichment, enqueue_books_enrichment
+
+VALID_STATUSES = ["unread", "read", "currently reading"]
+IMPORT_CHUNK_SIZE = 500  # Rows inserted per transaction during bulk imports
+
+EXPORT_FORMATS = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+CSV_FIELDS = ["isbn", "title", "authors", "description", "cover_art", "status"]
+STREAM_CHUNK_ROWS = 100  # Books serialized per yielded chunk
+
+
+# Read-through cache for library reads. Keys include the library version stored in the
+# database, which every write bumps (from any process), so stale entries are never served
+# and simply age out. It is the same version /api/get_books builds its ETag from.
+_cache = LRUCache(int(os.getenv("LIBRARY_CACHE_SIZE", "1024")))
+
+
+def _cached(key, loader):
+    """
+    Return the cached value for key at the current library version, loading it on a miss.
+    Cached values are shared between callers and must be treated as read-only.
+    """
+    cache_key = (get_library_version(),) + key
+    value = _cache.get(cache_key)
+    if value is MISSING:
+        value = loader()
+        _cache.set(cache_key, value)
+    return value
+
+
+def invalidate_library_cache():
+    """
+    Drop every cached read, e.g. after pointing the app at a different database.
+    """
+    _cache.clear()
+
+
+def get_library_cache_stats():
+    """
+    Return hit/miss counters for the library read cache.
+    """
+    return _cache.stats()
+
 
 def add_book(isbn, title, authors, description, cover_art, status):
     """
-    Add a book to the library.
-    Handles validation and checks before interacting with the database.
+    Add a book to the library unless a book with the same ISBN or title is already there.
+    Returns True if the book was added and False if it already existed.
+    """
+    if not add_book_if_absent(isbn, title, authors, description, cover_art, status):
+        return False
+
+    # The book is saved either way; a failure here only delays its enrichment until a backfill
+    try:
+        enqueue_book_enrichment(title, authors, cover_art)
+    except sqlite3.Error as e:
+        print(f"Error queueing enrichment for '{title}': {e}")
+    return True
+
+
+def get_books(limit=None, after=None):
+    """
+    Retrieve books from the library.
+    Returns every book, or a single page with a next cursor when a limit is given.
+    """
+    if limit is None:
+        return _cached(("books",), get_all_books)
+    return _cached(("books", limit, after), lambda: get_books_page(limit, after))
+
+
+def get_book(isbn):
+    """
+    Retrieve a single book by its ISBN, or None if it isn't in the library.
+    """
+    return _cached(("isbn", isbn), lambda: get_book_by_isbn(isbn))
+
+
+def stream_books(export_format="json"):
+    """
+    Return a generator of text chunks serializing the whole library in the given format.
+    Books are read from the database incrementally, so memory use doesn't grow with library size.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Invalid format. Valid formats are: {', '.join(EXPORT_FORMATS)}")
+
+    if export_format == "json":
+        return _stream_json_array()
+    if export_format == "ndjson":
+        return _stream_ndjson()
+    return _stream_csv()
+
+
+def _chunked(books, size=STREAM_CHUNK_ROWS):
+    """
+    Group an iterator of books into lists of at most `size` items.
+    """
+    chunk = []
+    for book in books:
+        chunk.append(book)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _stream_json_array():
+    yield "["
+    separator = ""
+    for chunk in _chunked(iter_books()):
+        yield separator + ",".join(json.dumps(book) for book in chunk)
+        separator = ","
+    yield "]"
+
+
+def _stream_ndjson():
+    for chunk in _chunked(iter_books()):
+        yield "".join(json.dumps(book) + "\n" for book in chunk)
+
+
+def _stream_csv():
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_FIELDS)
+    for chunk in _chunked(iter_books()):
+        for book in chunk:
+            writer.writerow([
+                "; ".join(book["authors"]) if field == "authors" else book[field]
+                for field in CSV_FIELDS
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()  # Header only, for an empty library
+
+
+def search_books_in_library(query, limit=20, prefix=True):
+    """
+    Search the local library by title, authors, and description.
     """
-    if is_book_in_library(title):
-        raise Exception(f"Book '{title}' already exists in your library!")
+    return search_library(query, limit, prefix)
 
-    add_book_to_library(isbn, title, authors, description, cover_art, status)
 
+def library_version():
+    """
+    Return the library's version counter, which changes whenever any book is written.
+    """
+    return get_library_version()
 
-def get_books():
+
+def list_authors():
+    """
+    Retrieve every author in the library with their book counts.
+    """
+    return get_authors()
+
+
+def get_author_books(author_name):
     """
-    Retrieve all books from the library.
+    Retrieve all books in the library by the given author.
     """
-    return get_all_books()
+    return get_books_by_author(author_name)
 
 
 def is_book_in_library(title):
     """
     Check if a book exists in the library by title.
     """
-    return is_book_in_library_by_title(title)  # Call the correct database function
+    return _cached(("exists", normalize_title(title)), lambda: is_book_in_library_by_title(title))  # Call the correct database function
 
 
 def update_book_status(title, status):
@@ -43,6 +210,31 @@ def update_book_status(title, status):
     update_book_status_in_db(title, status)
 
 
+def update_book_statuses(updates):
+    """
+    Update the reading status of many books by ISBN in one transaction.
+    `updates` is a list of {"isbn": ..., "status": ...} dictionaries; every entry is validated
+    before any is applied. Returns the number of books updated and the ISBNs not found.
+    """
+    pairs = []
+    errors = []
+    for index, update in enumerate(updates):
+        isbn = update.get("isbn") if isinstance(update, dict) else None
+        status = update.get("status") if isinstance(update, dict) else None
+        if not isinstance(isbn, str) or not isbn.strip():
+            errors.append(f"Update {index}: ISBN is required")
+        elif not isinstance(status, str) or status.lower() not in VALID_STATUSES:
+            errors.append(f"Update {index}: invalid status. Valid statuses are: {', '.join(VALID_STATUSES)}")
+        else:
+            pairs.append((isbn.strip(), status.lower()))
+    if errors:
+        raise ValueError("; ".join(errors))
+    if not pairs:
+        return {"updated": 0, "not_found": []}
+
+    return update_book_statuses_in_db(pairs)
+
+
 def delete_book(isbn):
     """
     Service layer function to delete a book by its ISBN.
@@ -52,4 +244,95 @@ def delete_book(isbn):
     except ValueError as e:
         raise ValueError(str(e))  # Re-raise the ValueError for not found books
     except Exception as e:
-        raise Exception(f"An error occurred while deleting the book: {e}")
\ No newline at end of file
+        raise Exception(f"An error occurred while deleting the book: {e}")
+
+
+def _prepare_import_record(record):
+    """
+    Normalize and validate one imported record, returning the row to insert.
+    Raises ValueError describing the first problem found.
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Each record must be an object.")
+
+    title = record.get("title")
+    authors = record.get("authors") or []
+    description = record.get("description")
+    status = (record.get("status") or "unread").lower()
+
+    # Accept authors as a list or a delimited string, and clean up the "By " prefix
+    if isinstance(authors, str):
+        separator = ";" if ";" in authors else ","
+        authors = authors.split(separator)
+    if not isinstance(authors, list) or not all(isinstance(author, str) for author in authors):
+        raise ValueError("Authors must be a string or a list of strings.")
+    authors = [author.replace("By ", "").strip() for author in authors if author.strip()]
+
+    validate_input(title, ", ".join(authors), description)
+    if status not in VALID_STATUSES:
+        raise ValueError(f"Invalid status. Valid statuses are: {', '.join(VALID_STATUSES)}")
+
+    return {
+        "isbn": record.get("isbn") or None,
+        "title": title.strip(),
+        "authors": authors,
+        "description": description,
+        "cover_art": record.get("cover_art"),
+        "status": status,
+    }
+
+
+def import_books(records, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Bulk-import books from an iterable of dictionaries.
+    Records are validated, de-duplicated by ISBN and normalized title (within the import and against
+    the library), and inserted in chunked transactions; new books are queued for enrichment.
+    Returns a report with counts, per-row failures, and throughput.
+    """
+    started = time.perf_counter()
+    report = {"received": 0, "inserted": 0, "duplicates": 0, "failed": []}
+    seen_isbns, seen_titles = set(), set()
+
+    def flush(chunk):
+        # Books already in the library are skipped by the insert itself, so there's no
+        # separate existence check to race with other writers
+        books = [book for _, book in chunk]
+        inserted = add_books_if_absent(books)
+        report["inserted"] += sum(inserted)
+        report["duplicates"] += len(inserted) - sum(inserted)
+
+        # The books are saved either way; a failure here only delays their enrichment until a backfill
+        try:
+            enqueue_books_enrichment([book for book, added in zip(books, inserted) if added])
+        except sqlite3.Error as e:
+            print(f"Error queueing enrichment for imported books: {e}")
+
+    chunk = []
+    for index, record in enumerate(records):
+        report["received"] += 1
+        try:
+            book = _prepare_import_record(record)
+        except ValueError as e:
+            title = record.get("title") if isinstance(record, dict) else None
+            report["failed"].append({"row": index, "title": title, "error": str(e)})
+            continue
+
+        title_key = normalize_title(book["title"])
+        if (book["isbn"] and book["isbn"] in seen_isbns) or title_key in seen_titles:
+            report["duplicates"] += 1
+            continue
+        if book["isbn"]:
+            seen_isbns.add(book["isbn"])
+        seen_titles.add(title_key)
+
+        chunk.append((index, book))
+        if len(chunk) >= chunk_size:
+            flush(chunk)
+            chunk = []
+    if chunk:
+        flush(chunk)
+
+    elapsed = time.perf_counter() - started
+    report["elapsed_seconds"] = round(elapsed, 3)
+    report["rows_per_second"] = round(report["inserted"] / elapsed, 1) if elapsed > 0 else None
+    return report
@@ -0,0 +1,69 @@
+import importlib
+import os
+from .single_flight import coalesced
+
+# Open Library lookups are served by one of these modules, chosen with OPEN_LIBRARY_BACKEND:
+# "html" scrapes the website, "api" uses the JSON endpoints
+BACKENDS = {
+    "html": "bs_scrape_service",
+    "api": "openlibrary_api_service",
+}
+OPEN_LIBRARY_BACKEND = os.getenv("OPEN_LIBRARY_BACKEND", "html")
+
+# Placeholder values the backends return when Open Library has nothing for a lookup
+NO_BIOGRAPHY = "No biography found for this author on Open Library."
+NO_SUMMARY = "No Summary Available."
+
+
+def get_backend():
+    """
+    Return the module implementing the configured Open Library backend.
+    """
+    module_name = BACKENDS.get(OPEN_LIBRARY_BACKEND)
+    if module_name is None:
+        raise ValueError(f"Unknown Open Library backend '{OPEN_LIBRARY_BACKEND}'. Use one of: {', '.join(BACKENDS)}.")
+    return importlib.import_module(f".{module_name}", __package__)
+
+
+# Each lookup is coalesced: concurrent requests for the same author or book share one upstream fetch
+@coalesced
+def search_open_library_author(author_name):
+    """
+    Search Open Library for an author and return the URL of their profile page.
+    """
+    return get_backend().search_open_library_author(author_name)
+
+
+@coalesced
+def fetch_open_library_author_bio(author_name):
+    """
+    Fetch the author's biography and image URL from Open Library.
+    """
+    return get_backend().fetch_open_library_author_bio(author_name)
+
+
+@coalesced
+def search_open_library_book(book_title):
+    """
+    Search Open Library for a book by title and return the URL of the book's page.
+    """
+    return get_backend().search_open_library_book(book_title)
+
+
+@coalesced
+def fetch_open_library_book_summary(book_url):
+    """
+    Fetch the summary of the Open Library book at book_url.
+    """
+    return get_backend().fetch_open_library_book_summary(book_url)
+
+
+@coalesced
+def fetch_book_summary_by_title(book_title):
+    """
+    Search Open Library for a book and fetch its summary, or return None if the book isn't found.
+    """
+    book_url = search_open_library_book(book_title)
+    if not book_url:
+        return None
+    return fetch_open_library_book_summary(book_url)
@@ -0,0 +1,117 @@
+import os
+from . import http_cache, open_library
+from .author_matching import normalize_author_name
+from .author_resolution import resolve_author
+
+# Base URLs for Open Library's JSON API and its cover images
+OPEN_LIBRARY_URL = os.getenv("OPEN_LIBRARY_URL", "https://openlibrary.org").rstrip("/")
+COVERS_URL = os.getenv("OPEN_LIBRARY_COVERS_URL", "https://covers.openlibrary.org").rstrip("/")
+AUTHOR_SEARCH_LIMIT = 20
+
+
+def _get_json(path, error_message, params=None):
+    """
+    GET a path on the Open Library API and return the decoded JSON body.
+    """
+    response = http_cache.get(f"{OPEN_LIBRARY_URL}{path}", params=params)
+    if response.status_code != 200:
+        raise Exception(error_message)
+    return response.json()
+
+
+def _text_value(value):
+    """
+    Return the text of an Open Library text field, which is either a string or {"type": "/type/text", "value": ...}.
+    """
+    if isinstance(value, dict):
+        value = value.get("value")
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _paragraphs(text):
+    """
+    Rejoin text on blank lines the way the HTML scraper joins <p> elements.
+    """
+    blocks = text.replace("\r\n", "\n").split("\n\n")
+    return "\n\n".join(block.strip() for block in blocks if block.strip())
+
+
+def search_author_candidates(author_name):
+    """
+    Search Open Library's author index and return (name, profile URL) for every result.
+    """
+    data = _get_json(
+        "/search/authors.json",
+        "Failed to fetch Open Library author search results.",
+        params={"q": normalize_author_name(author_name), "limit": AUTHOR_SEARCH_LIMIT},
+    )
+    return [
+        (doc["name"], f"{OPEN_LIBRARY_URL}/authors/{doc['key'].rsplit('/', 1)[-1]}")
+        for doc in data.get("docs", [])
+        if doc.get("key") and doc.get("name")
+    ]
+
+
+def search_open_library_author(author_name):
+    """
+    Search Open Library for an author and return the URL of their profile page.
+    Resolved names are memoized, so repeat lookups skip the search.
+    """
+    return resolve_author(author_name, "api", search_author_candidates)
+
+
+def fetch_open_library_author_bio(author_name):
+    """
+    Fetch the author's biography and image from Open Library using their name.
+    Return a dictionary containing the biography text and image URL.
+    """
+    author_url = search_open_library_author(author_name)
+    if not author_url:
+        return {
+            "biography": open_library.NO_BIOGRAPHY,
+            "image_url": None,
+        }
+
+    author = _get_json(f"{author_url[len(OPEN_LIBRARY_URL):]}.json", "Failed to fetch Open Library author page.")
+    biography = _paragraphs(_text_value(author.get("bio"))) or "No biography available for this author."
+
+    # Photo IDs of -1 mark deleted images
+    photo_id = next((photo for photo in author.get("photos", []) if photo and photo > 0), None)
+    image_url = f"{COVERS_URL}/a/id/{photo_id}-M.jpg" if photo_id else None
+
+    return {
+        "biography": biography,
+        "image_url": image_url,
+    }
+
+
+def search_open_library_book(book_title):
+    """
+    Search Open Library for a book by title and return the URL of the book's page.
+    """
+    data = _get_json(
+        "/search.json",
+        "Failed to fetch Open Library book search results.",
+        params={"q": book_title, "fields": "key", "limit": 1},
+    )
+    docs = data.get("docs", [])
+    if not docs or not docs[0].get("key"):
+        return None  # No book found
+    return f"{OPEN_LIBRARY_URL}{docs[0]['key']}"
+
+
+def fetch_open_library_book_summary(book_url):
+    """
+    Fetch the book summary from Open Library. Editions without a description
+    fall back to the description of their work.
+    """
+    path = book_url[len(OPEN_LIBRARY_URL):] if book_url.startswith(OPEN_LIBRARY_URL) else book_url
+    book = _get_json(f"{path}.json", "Failed to fetch Open Library book page.")
+    description = _text_value(book.get("description"))
+
+    works = book.get("works") or []
+    if not description and works and works[0].get("key"):
+        work = _get_json(f"{works[0]['key']}.json", "Failed to fetch Open Library book page.")
+        description = _text_value(work.get("description"))
+
+    return description or open_library.NO_SUMMARY
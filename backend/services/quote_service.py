@@ -0,0 +1,142 @@
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from .bs_scrape_service import quote_of_the_day
+
+# Wikiquote picks a new quote at midnight UTC; we fetch it a few minutes later
+QUOTE_REFRESH_DELAY = int(os.getenv("QUOTE_REFRESH_DELAY", "300"))
+QUOTE_RETRY_INTERVAL = int(os.getenv("QUOTE_RETRY_INTERVAL", "900"))  # Seconds between attempts after a failed refresh
+
+_current = {"date": None, "quote": None, "fetched_at": None, "error": None, "failed_at": None}
+_lock = threading.Lock()
+_refreshing = threading.Lock()  # Held while a scrape is in progress, so only one runs at a time
+_stop = threading.Event()
+_refresher = None
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _quote_date(now):
+    """
+    Return the date whose quote should be served at `now`: the UTC date, rolling over
+    QUOTE_REFRESH_DELAY seconds after midnight.
+    """
+    return (now - timedelta(seconds=QUOTE_REFRESH_DELAY)).date().isoformat()
+
+
+def _seconds_until_rollover(now):
+    """
+    Return the number of seconds until the next quote date begins.
+    """
+    rollover = datetime.combine(now.date(), datetime.min.time(), timezone.utc) + timedelta(seconds=QUOTE_REFRESH_DELAY)
+    if rollover <= now:
+        rollover += timedelta(days=1)
+    return (rollover - now).total_seconds()
+
+
+def _retry_due(now):
+    """
+    Return False while the last failed scrape is less than QUOTE_RETRY_INTERVAL seconds old.
+    Call with _lock held.
+    """
+    failed_at = _current["failed_at"]
+    return failed_at is None or (now - failed_at).total_seconds() >= QUOTE_RETRY_INTERVAL
+
+
+def refresh_quote_of_the_day(wait=False, force=False):
+    """
+    Scrape the current quote of the day and cache it under today's date. Returns True on success.
+    On failure the previously cached quote is kept, and unless `force` is set no new scrape is
+    attempted for QUOTE_RETRY_INTERVAL seconds. Unless `wait` is set, returns False straight
+    away if another refresh is already running.
+    """
+    if not _refreshing.acquire(blocking=wait):
+        return False
+    try:
+        now = _now()
+        date = _quote_date(now)
+        with _lock:
+            if _current["date"] == date:
+                return True  # Refreshed while we were waiting
+            if not force and not _retry_due(now):
+                return False
+        quote = quote_of_the_day()
+        with _lock:
+            if "error" in quote:
+                print(f"Failed to refresh the quote of the day: {quote['error']}")
+                _current.update(error=quote["error"], failed_at=_now())
+                return False
+            _current.update(date=date, quote=quote, fetched_at=time.time(), error=None, failed_at=None)
+            return True
+    finally:
+        _refreshing.release()
+
+
+def get_quote_of_the_day():
+    """
+    Return the cached quote of the day without waiting on Wikiquote. A quote from an earlier
+    day is returned while a background refresh fetches today's; only the very first
+    request, before anything is cached, waits for the scrape. After a failed scrape, requests
+    don't trigger another one until QUOTE_RETRY_INTERVAL has passed.
+    """
+    now = _now()
+    with _lock:
+        date, quote = _current["date"], _current["quote"]
+        retry_due = _retry_due(now)
+    if quote is None:
+        if retry_due:
+            refresh_quote_of_the_day(wait=True)
+        with _lock:
+            return _current["quote"] or {"error": _current["error"] or "No quote of the day found."}
+
+    if date != _quote_date(now) and retry_due and not _refreshing.locked():
+        threading.Thread(target=refresh_quote_of_the_day, name="quote-refresh", daemon=True).start()
+    return quote
+
+
+def _run_refresher():
+    while not _stop.is_set():
+        with _lock:
+            up_to_date = _current["date"] == _quote_date(_now())
+        if up_to_date or refresh_quote_of_the_day(wait=True, force=True):
+            delay = _seconds_until_rollover(_now())
+        else:
+            delay = QUOTE_RETRY_INTERVAL
+        _stop.wait(delay)
+
+
+def start_quote_refresher():
+    """
+    Start the background thread that fetches each day's quote shortly after rollover.
+    """
+    global _refresher
+    if _refresher is not None and _refresher.is_alive():
+        return
+    _stop.clear()
+    _refresher = threading.Thread(target=_run_refresher, name="quote-refresher", daemon=True)
+    _refresher.start()
+
+
+def stop_quote_refresher():
+    """
+    Stop the background refresh thread.
+    """
+    _stop.set()
+    if _refresher is not None:
+        _refresher.join(timeout=5)
+
+
+def get_quote_cache_stats():
+    """
+    Return the date and age of the cached quote and the last refresh error.
+    """
+    with _lock:
+        fetched_at = _current["fetched_at"]
+        return {
+            "date": _current["date"],
+            "age_seconds": round(time.time() - fetched_at) if fetched_at else None,
+            "last_error": _current["error"],
+        }
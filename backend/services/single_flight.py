@@ -0,0 +1,78 @@
+import threading
+from concurrent.futures import Future
+from functools import wraps
+
+# Every group created by coalesced(), so their stats can be reported
+_groups = {}
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time. Callers arriving while a call for their key
+    is in flight wait for it and share its result (or exception) instead of starting their own.
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> Future of the in-flight call
+        self._lock = threading.Lock()
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """
+        Call func(*args, **kwargs), or wait for the identical call already in flight for key.
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.executions += 1
+            else:
+                self.coalesced += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = func(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+    def stats(self):
+        """
+        Return how many calls ran and how many were served by another caller's call.
+        """
+        with self._lock:
+            calls = self.executions + self.coalesced
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+                "coalesced_rate": round(self.coalesced / calls, 4) if calls else None,
+            }
+
+
+def coalesced(func):
+    """
+    Decorator sharing one in-flight call among concurrent callers passing the same arguments.
+    """
+    group = _groups[func.__qualname__] = SingleFlight()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return group.do((args, tuple(sorted(kwargs.items()))), func, *args, **kwargs)
+    return wrapper
+
+
+def get_single_flight_stats():
+    """
+    Return stats for every coalesced function.
+    """
+    return {name: group.stats() for name, group in _groups.items()}
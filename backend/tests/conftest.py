@@ -0,0 +1,30 @@
+import threading
+from http.server import ThreadingHTTPServer
+import pytest
+from database.db import configure_database, initialize_database
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    # Point the connection pool at a fresh database for each test
+    configure_database(str(tmp_path / "library.db"), pool_size=2)
+    initialize_database()
+    yield
+    configure_database(str(tmp_path / "unused.db"))
+
+
+@pytest.fixture
+def start_stub_server():
+    # Call with a BaseHTTPRequestHandler subclass to serve it on a free local port; returns the base URL
+    servers = []
+
+    def start(handler):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,54 @@
+from unittest.mock import patch
+import pytest
+from database.models import add_book_to_library, save_author_resolution
+from database.normalize import author_name_key
+from backend.services.author_matching import best_author_match
+from backend.services.author_resolution import resolve_library_authors
+
+
+pytestmark = pytest.mark.usefixtures("temp_db")
+
+
+def test_author_name_key_matches_common_variants():
+    assert author_name_key("J.R.R. Tolkien") == author_name_key("J R R  Tolkien") == author_name_key("Tolkien, JRR")
+    assert author_name_key("Ursula K. Le Guin") == author_name_key("Le Guin, Ursula K.")
+    assert author_name_key("Ursula K. Le Guin") != author_name_key("Ursula Le Guin")
+
+
+def test_best_author_match_scores_candidates_in_one_batch():
+    candidates = [("Ursula Le Guin Society", "society"), ("Ursula K. Le Guin", "author"), ("Le Guin Estate", "estate")]
+    assert best_author_match("Ursula K. Le Guin", candidates) == ("Ursula K. Le Guin", "author")
+    assert best_author_match("Tolkien", [("Tolkien", "first"), ("Tolkien", "second")]) == ("Tolkien", "first")
+    assert best_author_match("Jane Austen", [("Charles Dickens", "dickens")]) is None
+
+
+def test_resolve_library_authors_resolves_each_author_once():
+    add_book_to_library("1", "A Wizard of Earthsea", ["Ursula K. Le Guin"], "", "")
+    add_book_to_library("2", "The Dispossessed", ["Le Guin, Ursula K."], "", "")
+    add_book_to_library("3", "The Hobbit", ["J.R.R. Tolkien", "Nobody Known"], "", "")
+    add_book_to_library("4", "Broken Book", ["Broken Author"], "", "")
+    save_author_resolution([author_name_key("J.R.R. Tolkien")], "html", "https://openlibrary.org/authors/OL26320A", 0)
+
+    searched = []
+
+    def fake_candidates(author_name):
+        searched.append(author_name)
+        if author_name == "Broken Author":
+            raise Exception("Failed to fetch Open Library author search results.")
+        return [("Ursula K. Le Guin", "https://openlibrary.org/authors/OL26320A/Ursula_K._Le_Guin")]
+
+    with patch("backend.services.bs_scrape_service.search_author_candidates", side_effect=fake_candidates):
+        report = resolve_library_authors(workers=2)
+        assert sorted(searched) == ["Broken Author", "Nobody Known", "Ursula K. Le Guin"]  # One lookup per name key
+
+        # A second pass finds everything but the failure in the memo
+        searched.clear()
+        second = resolve_library_authors(workers=2)
+        assert searched == ["Broken Author"]
+
+    assert report["authors"] == 4
+    assert report["already_resolved"] == 1
+    assert report["resolved"] == 1
+    assert report["not_found"] == 1
+    assert report["failed"] == [{"author": "Broken Author", "error": "Failed to fetch Open Library author search results."}]
+    assert second["already_resolved"] == 3
@@ -1,3 +1,4 @@
+import time
 import pytest
 from unittest.mock import MagicMock, patch
 from backend.services.bs_scrape_service import (
@@ -7,11 +8,15 @@ from backend.services.bs_scrape_service import (
     fetch_open_library_book_summary,
     quote_of_the_day,
     fetch_quotes_from_wikiquote,
+    fetch_book_details,
 )
 
+# Resolved authors are memoized in the database, so give each test a fresh one
+pytestmark = pytest.mark.usefixtures("temp_db")
+
 @pytest.fixture
 def mock_requests_get():
-    with patch("backend.services.bs_scrape_service.requests.get") as mock_get:
+    with patch("backend.services.http_client.get") as mock_get:
         yield mock_get
 
 def test_search_open_library_author(mock_requests_get):
@@ -152,4 +157,61 @@ def test_fetch_quotes_from_wikiquote(mock_requests_get):
     ]
 
     quotes = fetch_quotes_from_wikiquote("Author Name")
-    assert quotes == ["Quote 1", "Quote 2"]
\ No newline at end of file
+    assert quotes == ["Quote 1", "Quote 2"]
+
+
+def test_fetch_book_details_returns_partial_results_at_deadline():
+    def slow_quotes(author_name):
+        time.sleep(1)
+        return ["Too late"]
+
+    def failing_bio(author_name):
+        raise Exception("Failed to fetch Open Library author page.")
+
+    with patch("backend.services.open_library.fetch_book_summary_by_title", return_value="A summary."), \
+         patch("backend.services.open_library.fetch_open_library_author_bio", side_effect=failing_bio), \
+         patch("backend.services.bs_scrape_service.find_wikiquote_quotes", side_effect=slow_quotes):
+        started = time.perf_counter()
+        details = fetch_book_details("Book Title", "Author Name", timeout=0.2)
+
+    assert time.perf_counter() - started < 0.9
+    assert details["summary"] == {"status": "ok", "data": "A summary.", "elapsed_ms": details["summary"]["elapsed_ms"]}
+    assert details["author_bio"]["status"] == "error"
+    assert details["quotes"]["status"] == "timeout"
+
+
+def test_fetch_book_details_reports_placeholders_and_quote_failures():
+    with patch("backend.services.open_library.fetch_book_summary_by_title", return_value="No Summary Available."), \
+         patch("backend.services.open_library.fetch_open_library_author_bio",
+               return_value={"biography": "No biography found for this author on Open Library.", "image_url": None}), \
+         patch("backend.services.bs_scrape_service.search_wikiquote_author",
+               side_effect=Exception("Failed to fetch Wikiquote search results.")):
+        details = fetch_book_details("Book Title", "Author Name")
+
+    assert details["summary"]["status"] == "not_found"
+    assert details["author_bio"]["status"] == "not_found"
+    assert details["quotes"]["status"] == "error"
+    assert details["quotes"]["error"] == "Failed to fetch Wikiquote search results."
+
+    stored = fetch_book_details("Book Title", "Author Name", known={
+        "summary": None, "author_bio": {"biography": "Wrote books.", "image_url": None},
+        "quotes": ["No quotes found for this author on Wikiquote."],
+    })
+    assert [stored[part]["status"] for part in ("summary", "author_bio", "quotes")] == ["not_found", "ok", "not_found"]
+
+
+def test_search_open_library_author_memoizes_name_variants(mock_requests_get):
+    mock_requests_get.return_value.status_code = 200
+    mock_requests_get.return_value.text = """
+    <html>
+        <body>
+            <div class="bookauthor"><a href="/authors/OL26320A">Ursula K. Le Guin</a></div>
+            <div class="bookauthor"><a href="/authors/OL1A">Ursula Le Guin Society</a></div>
+        </body>
+    </html>
+    """
+
+    assert search_open_library_author("Ursula K. Le Guin") == "https://openlibrary.org/authors/OL26320A"
+    assert search_open_library_author("Le Guin, Ursula K.") == "https://openlibrary.org/authors/OL26320A"
+    assert search_open_library_author("ursula k le guin") == "https://openlibrary.org/authors/OL26320A"
+    assert mock_requests_get.call_count == 1
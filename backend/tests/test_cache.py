@@ -0,0 +1,48 @@
+from unittest.mock import patch
+from services.cache import LRUCache, SQLiteCache, MISSING
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is MISSING
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_lru_cache_entries_expire():
+    cache = LRUCache(max_size=10, ttl=60)
+    with patch("services.cache.time.monotonic", return_value=1000):
+        cache.set("short", "value", ttl=5)
+        cache.set("default", "value")
+    with patch("services.cache.time.monotonic", return_value=1010):
+        assert cache.get("short") is MISSING
+        assert cache.get("default") == "value"
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / "cache.db")
+    SQLiteCache(path).set("key", {"books": [1, 2]}, ttl=60)
+
+    reopened = SQLiteCache(path)
+    assert reopened.get("key") == {"books": [1, 2]}
+    assert reopened.get("other") is MISSING
+
+def test_sqlite_cache_caps_entries(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"), max_entries=2)
+    for i in range(4):
+        cache.set(f"key{i}", i, ttl=60 + i)
+
+    assert cache.stats()["size"] == 2
+    assert cache.get("key0") is MISSING
+    assert cache.get("key3") == 3
+
+def test_sqlite_cache_reports_remaining_ttl(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    with patch("services.cache.time.time", return_value=1000):
+        cache.set("key", ["book"], ttl=60)
+    with patch("services.cache.time.time", return_value=1045):
+        assert cache.get_with_ttl("key") == (["book"], 15)
+    with patch("services.cache.time.time", return_value=1060):
+        assert cache.get_with_ttl("key") is MISSING
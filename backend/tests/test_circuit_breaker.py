@@ -0,0 +1,88 @@
+from unittest.mock import MagicMock, patch
+import pytest
+import requests
+from backend.services import circuit_breaker, http_cache, http_client
+from backend.services.cache import ResponseCache
+from backend.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.services.gapi_search_service import _memory_cache, clear_search_cache, get_search_cache_stats, search_books
+
+
+@pytest.fixture(autouse=True)
+def fresh_breakers():
+    circuit_breaker.reset_breakers()
+    yield
+    circuit_breaker.reset_breakers()
+
+
+def test_circuit_opens_after_consecutive_failures_and_recovers():
+    breaker = CircuitBreaker("openlibrary.org", failure_threshold=3, reset_timeout=30)
+    for _ in range(2):
+        breaker.before_call(now=0)
+        breaker.record_failure(now=0)
+    breaker.before_call(now=0)
+    breaker.record_success()  # A success resets the count
+    for _ in range(3):
+        breaker.before_call(now=1)
+        breaker.record_failure(now=1)
+    assert breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError, match="openlibrary.org is temporarily unavailable"):
+        breaker.before_call(now=10)
+
+    # After the reset timeout one trial call goes through; others keep failing fast
+    breaker.before_call(now=31)
+    assert breaker.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call(now=31)
+    breaker.record_failure(now=32)
+    assert breaker.state == "open"
+
+    breaker.before_call(now=62)
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.stats()["times_opened"] == 2
+    assert breaker.stats()["rejected"] == 2
+
+
+def test_http_client_fails_fast_while_circuit_is_open():
+    circuit_breaker._breakers["upstream.test"] = CircuitBreaker("upstream.test", failure_threshold=2, reset_timeout=60)
+    session = MagicMock()
+    session.get.side_effect = requests.ConnectionError("Connection refused")
+
+    with patch.object(http_client, "get_session", return_value=session):
+        for _ in range(2):
+            with pytest.raises(requests.ConnectionError):
+                http_client.get("http://upstream.test/page")
+        with pytest.raises(CircuitOpenError):
+            http_client.get("http://upstream.test/page")
+
+    assert session.get.call_count == 2
+    assert circuit_breaker.get_breaker_stats()["upstream.test"]["state"] == "open"
+
+
+def test_http_cache_serves_last_good_response_while_circuit_is_open(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "http_cache.db"))
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    cache.put("http://upstream.test/page", "http://upstream.test/page", "<p>Last good copy.</p>")
+    breaker = circuit_breaker._breakers["upstream.test"] = CircuitBreaker("upstream.test", failure_threshold=1)
+    breaker.record_failure()
+
+    response = http_cache.get("http://upstream.test/page", max_age=0)
+    assert response.text == "<p>Last good copy.</p>"
+    assert http_cache.get_http_cache_stats()["stale_hits"] >= 1
+    with pytest.raises(CircuitOpenError):
+        http_cache.get("http://upstream.test/page", max_age=0, stale_if_error=False)
+
+
+@patch("backend.services.gapi_search_service.http_client.get")
+def test_search_serves_last_good_results_when_api_fails(mock_get):
+    clear_search_cache()
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {"items": [{"volumeInfo": {"title": "Example Book"}}]}
+    assert search_books("The Hobbit")[0]["title"] == "Example Book"
+
+    _memory_cache.clear()  # As if the cached results had expired
+    mock_get.side_effect = CircuitOpenError("www.googleapis.com", 30)
+    assert search_books("The Hobbit")[0]["title"] == "Example Book"
+    assert get_search_cache_stats()["stale_hits"] == 1
+    assert search_books("Never searched") == []
@@ -0,0 +1,133 @@
+import os
+from unittest.mock import MagicMock, patch
+import pytest
+from flask import Flask
+from database.models import add_book_to_library, get_cover
+from backend.services import cover_service
+from services import cover_service as route_cover_service
+from backend.services.cover_service import cover_path, download_cover, get_cached_cover
+from backend.services.enrichment_service import enqueue_book_enrichment, run_until_empty
+from services.enrichment_service import run_until_empty as route_run_until_empty
+
+
+@pytest.fixture(autouse=True)
+def temp_store(temp_db, tmp_path, monkeypatch):
+    # The routes import the services package without the backend prefix, as a separate module
+    for module in (cover_service, route_cover_service):
+        monkeypatch.setattr(module, "COVER_CACHE_DIR", str(tmp_path / "covers"))
+
+
+def image_response(body, content_type="image/jpeg", headers=None):
+    response = MagicMock(status_code=200, is_redirect=False)
+    response.headers = {"Content-Type": content_type, **(headers or {})}
+    response.iter_content.side_effect = lambda chunk_size: (body[i:i + chunk_size] for i in range(0, len(body), chunk_size))
+    return response
+
+
+def test_covers_are_stored_by_content():
+    images = {"http://books.google.com/a/1.jpg": b"same", "http://books.google.com/b/2.jpg": b"same", "https://lh3.googleusercontent.com/c/3.jpg": b"other"}
+    with patch("backend.services.http_client.get", side_effect=lambda url, **kwargs: image_response(images[url])):
+        digests = [download_cover(url, now=i) for i, url in enumerate(images)]
+
+    assert digests[0] == digests[1] != digests[2]  # Identical images share one file
+    assert sorted(os.listdir(os.path.dirname(cover_path(digests[0])))) == [digests[0]]
+    with open(get_cached_cover("http://books.google.com/b/2.jpg")["path"], "rb") as f:
+        assert f.read() == b"same"
+
+
+def test_store_evicts_least_recently_used_images(monkeypatch):
+    monkeypatch.setattr(cover_service, "COVER_CACHE_MAX_MB", 10 / (1024 * 1024))  # Room for ten bytes
+    images = {"http://books.google.com/a/1.jpg": b"aaaa", "http://books.google.com/b/2.jpg": b"bbbb", "https://lh3.googleusercontent.com/c/3.jpg": b"cccc"}
+    with patch("backend.services.http_client.get", side_effect=lambda url, **kwargs: image_response(images[url])):
+        first = download_cover("http://books.google.com/a/1.jpg", now=1)
+        download_cover("http://books.google.com/b/2.jpg", now=2)
+        download_cover("https://lh3.googleusercontent.com/c/3.jpg", now=3)
+
+    assert get_cover("http://books.google.com/a/1.jpg") is None
+    assert not os.path.exists(cover_path(first))
+    assert get_cached_cover("http://books.google.com/b/2.jpg") is not None
+    assert get_cached_cover("https://lh3.googleusercontent.com/c/3.jpg") is not None
+
+
+def test_non_image_responses_are_rejected():
+    with patch("backend.services.http_client.get", return_value=image_response(b"<html>", "text/html")):
+        with pytest.raises(Exception, match="instead of an image"):
+            download_cover("http://books.google.com/a/missing.jpg")
+    assert get_cover("http://books.google.com/a/missing.jpg") is None
+
+
+def test_cover_endpoint_serves_stored_cover_with_cache_headers():
+    from routes.library_routes import library_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(library_bp)
+    client = app.test_client()
+    add_book_to_library("123", "Cover Book", ["Author"], "", "http://books.google.com/a/cover.jpg")
+
+    # Not downloaded yet: queued and redirected to the remote image
+    response = client.get("/api/covers/123")
+    assert response.status_code == 302
+    assert response.headers["Location"] == "http://books.google.com/a/cover.jpg"
+
+    with patch("services.http_client.get", return_value=image_response(b"cover")):
+        assert route_run_until_empty() == 1
+
+    response = client.get("/api/covers/123")
+    assert response.status_code == 200
+    assert response.data == b"cover"
+    assert response.mimetype == "image/jpeg"
+    assert f"max-age={cover_service.COVER_MAX_AGE}" in response.headers["Cache-Control"]
+
+    revalidated = client.get("/api/covers/123", headers={"If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+    assert client.get("/api/covers/999").status_code == 404
+
+
+def test_added_books_queue_their_cover():
+    with patch("backend.services.http_client.get", return_value=image_response(b"cover")), \
+         patch("backend.services.open_library.fetch_book_summary_by_title", return_value=None):
+        assert enqueue_book_enrichment("Cover Book", [], "http://books.google.com/a/cover.jpg") == 2
+        assert run_until_empty() == 2
+    assert get_cached_cover("http://books.google.com/a/cover.jpg")["size"] == 5
+
+
+def test_oversized_covers_are_rejected_while_streaming(monkeypatch):
+    monkeypatch.setattr(cover_service, "COVER_MAX_BYTES", 10)
+    monkeypatch.setattr(cover_service, "COVER_CHUNK_SIZE", 4)
+    declared = image_response(b"small", headers={"Content-Length": "11"})
+    with patch("backend.services.http_client.get", return_value=declared):
+        with pytest.raises(Exception, match="larger than 10 bytes"):
+            download_cover("http://books.google.com/big.jpg")
+    declared.iter_content.assert_not_called()
+
+    undeclared = image_response(b"x" * 100)
+    with patch("backend.services.http_client.get", return_value=undeclared):
+        with pytest.raises(Exception, match="larger than 10 bytes"):
+            download_cover("http://books.google.com/big.jpg")
+    assert get_cover("http://books.google.com/big.jpg") is None
+
+
+def test_only_known_cover_hosts_are_fetched():
+    redirect = MagicMock(status_code=302, is_redirect=True)
+    redirect.headers = {"Location": "http://127.0.0.1/admin"}
+    with patch("backend.services.http_client.get", return_value=redirect) as mock_get:
+        for url in ("http://127.0.0.1/cover.jpg", "file:///etc/passwd", "http://evilgoogleusercontent.com/x.jpg"):
+            with pytest.raises(ValueError, match="not on an allowed cover host"):
+                download_cover(url)
+        mock_get.assert_not_called()
+
+        # Redirects are followed only to allowed hosts
+        with pytest.raises(ValueError, match="not on an allowed cover host"):
+            download_cover("http://books.google.com/redirect.jpg")
+        assert mock_get.call_count == 1
+
+    assert enqueue_book_enrichment("Local Book", [], "http://localhost/cover.jpg") == 1  # Summary only
+
+
+def test_cover_endpoint_refuses_unknown_hosts():
+    from routes.library_routes import library_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(library_bp)
+    add_book_to_library("456", "Metadata Book", ["Author"], "", "http://169.254.169.254/latest/meta-data")
+    assert app.test_client().get("/api/covers/456").status_code == 404
@@ -0,0 +1,262 @@
+import pytest
+import sqlite3
+from database.db import configure_database, get_db_connection, get_pool_stats, initialize_database
+from database.models import (
+    add_book_if_absent,
+    add_book_to_library,
+    add_books_if_absent,
+    delete_book_by_isbn,
+    get_all_books,
+    get_authors,
+    get_books_by_author,
+    get_books_page,
+    get_library_version,
+    is_book_in_library_by_title,
+    search_library,
+    update_book_status_in_db,
+    update_book_statuses_in_db,
+)
+
+def test_connections_are_reused(temp_db):
+    with get_db_connection() as conn:
+        first = conn
+    with get_db_connection() as conn:
+        second = conn
+
+    assert first is second
+    stats = get_pool_stats()
+    assert stats["opened"] == 1
+    assert stats["reused"] >= 1
+
+def test_nested_checkout_shares_connection(temp_db):
+    with get_db_connection() as outer:
+        with get_db_connection() as inner:
+            assert inner is outer
+        assert get_pool_stats()["in_use"] == 1
+    assert get_pool_stats()["in_use"] == 0
+
+def test_model_calls_nested_in_a_block_share_its_transaction(temp_db):
+    with pytest.raises(RuntimeError):
+        with get_db_connection():
+            _add_books(("1", "Emma", ["Jane Austen"]))
+            delete_book_by_isbn("1")
+            _add_books(("2", "Dracula", ["Bram Stoker"]))
+            raise RuntimeError("boom")
+
+    assert get_all_books() == []
+    assert get_library_version() == 0  # The version bumps were rolled back too
+
+def test_wal_mode_enabled(temp_db):
+    with get_db_connection() as conn:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert journal_mode == "wal"
+
+def test_rollback_on_error(temp_db):
+    with pytest.raises(RuntimeError):
+        with get_db_connection() as conn:
+            conn.execute("INSERT INTO library (isbn, title) VALUES ('1', 'Lost')")
+            raise RuntimeError("boom")
+
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM library").fetchone()[0] == 0
+
+def _add_books(*books):
+    for isbn, title, authors in books:
+        add_book_to_library(isbn, title, authors, "A description", "cover.jpg")
+
+def test_get_all_books_ordered_by_author_last_name(temp_db):
+    _add_books(
+        ("1", "Nineteen Eighty-Four", ["George Orwell"]),
+        ("2", "Emma", ["Jane Austen"]),
+        ("3", "Dracula", ["Bram Stoker"]),
+    )
+
+    titles = [book["title"] for book in get_all_books()]
+    assert titles == ["Emma", "Nineteen Eighty-Four", "Dracula"]
+
+def test_get_books_page_walks_cursor(temp_db):
+    _add_books(*[(str(i), f"Book {i}", [f"Author {name}"]) for i, name in enumerate("edcba")])
+
+    first = get_books_page(2)
+    second = get_books_page(2, first["next_cursor"])
+    last = get_books_page(2, second["next_cursor"])
+
+    authors = [book["authors"][0] for page in (first, second, last) for book in page["books"]]
+    assert authors == ["Author a", "Author b", "Author c", "Author d", "Author e"]
+    assert last["next_cursor"] is None
+
+def test_page_query_uses_author_sort_index(temp_db):
+    with get_db_connection() as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM library WHERE (author_sort, id) > (?, ?) ORDER BY author_sort, id LIMIT 5",
+            ("a", 0),
+        ).fetchall()
+    assert any("idx_library_author_sort" in row["detail"] for row in plan)
+    assert not any("TEMP B-TREE" in row["detail"] for row in plan)
+
+def test_search_library_ranks_and_tracks_deletes(temp_db):
+    _add_books(
+        ("1", "The Hobbit", ["J.R.R. Tolkien"]),
+        ("2", "Tolkien: A Biography", ["Humphrey Carpenter"]),
+        ("3", "Emma", ["Jane Austen"]),
+    )
+
+    results = search_library("tolk")
+    assert [book["isbn"] for book in results] == ["2", "1"]  # Title matches outrank author matches
+    assert results[0]["title_highlight"] == "<mark>Tolkien</mark>: A Biography"
+
+    delete_book_by_isbn("2")
+    assert [book["isbn"] for book in search_library("tolkien")] == ["1"]
+    assert search_library("tolk", prefix=False) == []
+
+def test_search_library_escapes_html_around_highlights(temp_db):
+    add_book_to_library("1", "<script>alert(1)</script> Dune", ["Frank Herbert"], "Spice & <b>sand</b> on Arrakis", "cover.jpg")
+
+    result = search_library("dune arrakis")[0]
+    assert result["title_highlight"] == "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Dune</mark>"
+    assert result["snippet"] == "Spice &amp; &lt;b&gt;sand&lt;/b&gt; on <mark>Arrakis</mark>"
+
+def test_title_lookups_ignore_case_and_spacing(temp_db):
+    _add_books(("1", "The  Hobbit", ["J.R.R. Tolkien"]))
+
+    assert is_book_in_library_by_title("the hobbit")
+    update_book_status_in_db("THE HOBBIT ", "read")
+    assert get_all_books()[0]["status"] == "read"
+
+    with pytest.raises(sqlite3.IntegrityError):
+        _add_books(("2", "the hobbit", ["Someone Else"]))
+
+    with get_db_connection() as conn:
+        plan = conn.execute("EXPLAIN QUERY PLAN SELECT 1 FROM library WHERE title_key = ?", ("x",)).fetchall()
+    assert any("idx_library_title_key" in row["detail"] for row in plan)
+
+def test_initialize_backfills_existing_database(tmp_path):
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE library (id INTEGER PRIMARY KEY AUTOINCREMENT, isbn TEXT UNIQUE, title TEXT NOT NULL, authors TEXT, description TEXT, cover_art TEXT, status TEXT DEFAULT 'unread')")
+    conn.execute("""INSERT INTO library (isbn, title, authors) VALUES ('1', 'Emma', '["Jane Austen"]')""")
+    conn.commit()
+    conn.close()
+
+    configure_database(path)
+    initialize_database()
+    try:
+        with get_db_connection() as conn:
+            row = conn.execute("SELECT author_sort, title_key FROM library").fetchone()
+        assert (row["author_sort"], row["title_key"]) == ("austen", "emma")
+        assert [book["isbn"] for book in search_library("emma")] == ["1"]
+        assert [book["isbn"] for book in get_books_by_author("jane austen")] == ["1"]
+    finally:
+        configure_database(str(tmp_path / "unused.db"))
+
+def test_books_by_author_uses_join_tables(temp_db):
+    _add_books(
+        ("1", "Good Omens", ["Terry Pratchett", "Neil Gaiman"]),
+        ("2", "Mort", ["Terry Pratchett"]),
+        ("3", "Coraline", ["Neil Gaiman"]),
+    )
+
+    assert [book["title"] for book in get_books_by_author("terry pratchett")] == ["Good Omens", "Mort"]
+    assert get_authors() == [
+        {"name": "Neil Gaiman", "book_count": 2},
+        {"name": "Terry Pratchett", "book_count": 2},
+    ]
+
+    delete_book_by_isbn("1")
+    delete_book_by_isbn("3")
+    assert get_authors() == [{"name": "Terry Pratchett", "book_count": 1}]
+    with get_db_connection() as conn:
+        assert conn.execute("SELECT COUNT(*) FROM authors").fetchone()[0] == 1  # Orphaned authors are removed
+
+def test_authors_are_grouped_by_author_name_key(temp_db):
+    _add_books(
+        ("1", "A Wizard of Earthsea", ["Ursula K. Le Guin"]),
+        ("2", "The Dispossessed", ["Le Guin, Ursula K."]),
+        ("3", "Nils Holgersson", ["SELMA LAGERLÖF"]),
+    )
+    add_books_if_absent([{"isbn": "4", "title": "Gösta Berling", "authors": ["Selma Lagerlöf"],
+                          "description": "", "cover_art": None, "status": "unread"}])
+
+    assert get_authors() == [
+        {"name": "SELMA LAGERLÖF", "book_count": 2},  # lower() alone wouldn't fold the Ö
+        {"name": "Ursula K. Le Guin", "book_count": 2},
+    ]
+    assert [book["isbn"] for book in get_books_by_author("le guin, ursula k")] == ["1", "2"]
+
+def test_initialize_rekeys_authors_from_older_databases(tmp_path):
+    path = str(tmp_path / "old.db")
+    configure_database(path)
+    initialize_database()
+    try:
+        _add_books(("1", "Emma", ["Jane Austen"]), ("2", "Persuasion", ["Austen, Jane"]))
+        with get_db_connection() as conn:
+            # Simulate a database keyed on lower(trim(name)) before the migration
+            conn.execute("DELETE FROM library_meta WHERE key = 'author_keys'")
+            conn.execute("DELETE FROM book_authors")
+            conn.execute("DELETE FROM authors")
+            conn.execute("INSERT INTO authors (id, name, name_key) VALUES (1, 'Jane Austen', 'jane austen'), (2, 'Austen, Jane', 'austen, jane')")
+            conn.execute("INSERT INTO book_authors (book_id, author_id, position) SELECT id, id, 0 FROM library")
+            conn.commit()
+        assert len(get_authors()) == 2
+
+        initialize_database()
+        assert get_authors() == [{"name": "Jane Austen", "book_count": 2}]
+    finally:
+        configure_database(str(tmp_path / "unused.db"))
+
+def test_library_version_bumped_by_writes(temp_db):
+    start = get_library_version()
+    _add_books(("1", "Emma", ["Jane Austen"]))
+    update_book_status_in_db("Emma", "read")
+    update_book_status_in_db("Missing Book", "read")  # No rows changed, no bump
+    delete_book_by_isbn("1")
+
+    assert get_library_version() == start + 3
+
+def test_batch_status_update_reports_missing_isbns(temp_db):
+    _add_books(("1", "Emma", ["Jane Austen"]), ("2", "Dracula", ["Bram Stoker"]), ("3", "Beloved", ["Toni Morrison"]))
+    start = get_library_version()
+
+    report = update_book_statuses_in_db([("1", "read"), ("404", "read"), ("2", "unread"), ("2", "currently reading")])
+    assert report == {"updated": 2, "not_found": ["404"]}
+    assert {book["isbn"]: book["status"] for book in get_all_books()} == {"1": "read", "2": "currently reading", "3": "unread"}
+    assert get_library_version() == start + 1  # One transaction, one bump
+
+    with pytest.raises(ValueError):
+        update_book_statuses_in_db([("3", "read"), ("1", "lost")])
+    assert {book["isbn"]: book["status"] for book in get_all_books()}["3"] == "unread"  # Nothing applied
+
+def test_add_if_absent_reports_inserted_and_existing(temp_db):
+    _add_books(("1", "Emma", ["Jane Austen"]))
+    start = get_library_version()
+
+    assert add_book_if_absent("2", "Dracula", ["Bram Stoker"], "", "") is True
+    assert add_book_if_absent("1", "Another Emma", ["Jane Austen"], "", "") is False  # Same ISBN
+    assert add_book_if_absent("3", "  EMMA ", ["Jane Austen"], "", "") is False  # Same normalized title
+
+    books = [
+        {"isbn": "4", "title": "Beloved", "authors": ["Toni Morrison"], "description": "", "cover_art": None, "status": "read"},
+        {"isbn": "2", "title": "Dracula", "authors": ["Bram Stoker"], "description": "", "cover_art": None, "status": "unread"},
+        {"isbn": "5", "title": "beloved", "authors": ["Toni Morrison"], "description": "", "cover_art": None, "status": "unread"},
+    ]
+    assert add_books_if_absent(books) == [True, False, False]
+    assert sorted(book["isbn"] for book in get_all_books()) == ["1", "2", "4"]
+    assert get_library_version() == start + 2  # Only writes that inserted something bump it
+
+def test_add_if_absent_checks_titles_without_a_unique_index(tmp_path):
+    # Legacy databases holding duplicate titles fall back to a non-unique title_key index
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE library (id INTEGER PRIMARY KEY AUTOINCREMENT, isbn TEXT UNIQUE, title TEXT NOT NULL, authors TEXT, description TEXT, cover_art TEXT, status TEXT DEFAULT 'unread')")
+    conn.execute("""INSERT INTO library (isbn, title, authors) VALUES ('1', 'Emma', '["Jane Austen"]'), ('2', 'emma', '["Jane Austen"]')""")
+    conn.commit()
+    conn.close()
+
+    configure_database(path)
+    initialize_database()
+    try:
+        assert add_book_if_absent("3", "Dracula", ["Bram Stoker"], "", "") is True
+        assert add_book_if_absent("4", "Dracula", ["Bram Stoker"], "", "") is False
+        assert sorted(book["isbn"] for book in get_all_books()) == ["1", "2", "3"]
+    finally:
+        configure_database(str(tmp_path / "unused.db"))
@@ -0,0 +1,66 @@
+from unittest.mock import patch
+import pytest
+from database.models import add_book_to_library, get_enrichment_job_counts
+from backend.services import enrichment_service
+from backend.services.enrichment_service import (
+    enqueue_book_enrichment,
+    enqueue_library_backfill,
+    get_stored_book_details,
+    run_until_empty,
+)
+
+
+pytestmark = pytest.mark.usefixtures("temp_db")
+
+
+@pytest.fixture
+def upstream():
+    with patch("backend.services.open_library.fetch_book_summary_by_title", return_value="A wizard's tale.") as summary, \
+         patch("backend.services.open_library.fetch_open_library_author_bio",
+               return_value={"biography": "Wrote Earthsea.", "image_url": None}) as bio, \
+         patch("backend.services.enrichment_service.find_wikiquote_quotes", return_value=["Quote one."]) as quotes:
+        yield summary, bio, quotes
+
+
+def test_enrichment_stores_details_for_reads(upstream):
+    assert get_stored_book_details("A Wizard of Earthsea", "Ursula K. Le Guin") == {}
+    assert enqueue_book_enrichment("A Wizard of Earthsea", ["Ursula K. Le Guin"]) == 3
+    assert enqueue_book_enrichment("A Wizard of Earthsea", ["Le Guin, Ursula K."]) == 0  # Already queued
+
+    assert run_until_empty() == 3
+    assert get_stored_book_details("a wizard of earthsea", "Le Guin, Ursula K.") == {
+        "summary": "A wizard's tale.",
+        "author_bio": {"biography": "Wrote Earthsea.", "image_url": None},
+        "quotes": ["Quote one."],
+    }
+    assert get_enrichment_job_counts() == {"done": 3}
+
+
+def test_failed_jobs_back_off_then_give_up(upstream, monkeypatch):
+    summary, _, _ = upstream
+    summary.side_effect = Exception("Failed to fetch Open Library book search results.")
+    monkeypatch.setattr(enrichment_service, "ENRICHMENT_MAX_ATTEMPTS", 2)
+    clock = [1000.0]
+    with patch("backend.services.enrichment_service._now", side_effect=lambda: clock[0]):
+        enqueue_book_enrichment("The Dispossessed", [])
+        assert run_until_empty() == 1
+        assert get_enrichment_job_counts() == {"pending": 1}
+        assert run_until_empty() == 0  # Not due until the retry delay passes
+
+        clock[0] += enrichment_service.ENRICHMENT_RETRY_DELAY
+        assert run_until_empty() == 1
+        assert get_enrichment_job_counts() == {"failed": 1}
+
+    # A backfill gives failed jobs another chance
+    add_book_to_library("1", "The Dispossessed", [], "", "")
+    summary.side_effect = None
+    assert enqueue_library_backfill() == 1
+    assert run_until_empty() == 1
+    assert get_stored_book_details("The Dispossessed") == {"summary": "A wizard's tale."}
+
+
+def test_backfill_queues_every_book_once(upstream):
+    add_book_to_library("1", "A Wizard of Earthsea", ["Ursula K. Le Guin"], "", "")
+    add_book_to_library("2", "The Dispossessed", ["Le Guin, Ursula K."], "", "")
+    assert enqueue_library_backfill(chunk_size=2) == 4  # Two summaries, one bio, one set of quotes
+    assert enqueue_library_backfill() == 0
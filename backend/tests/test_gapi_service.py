@@ -1,8 +1,13 @@
 import pytest
-from unittest.mock import patch
-from backend.services.gapi_search_service import search_books
+from unittest.mock import MagicMock, patch
+from backend.services.gapi_search_service import search_books, deep_search_books, clear_search_cache, get_search_cache_stats
 
-@patch("backend.services.gapi_search_service.requests.get")
+@pytest.fixture(autouse=True)
+def empty_cache():
+    # Every test starts with an empty search cache
+    clear_search_cache()
+
+@patch("backend.services.gapi_search_service.http_client.get")
 def test_search_books_success(mock_get):
     """
     Test that search_books returns a list of books when a valid query is provided.
@@ -41,4 +46,55 @@ def test_search_books_no_query(mock_search_books):
     mock_search_books.side_effect = ValueError("Query parameter is required")
 
     with pytest.raises(ValueError, match="Query parameter is required"):
-        search_books("")
\ No newline at end of file
+        search_books("")
+
+
+@patch("backend.services.gapi_search_service.http_client.get")
+def test_search_books_cached_by_normalized_query(mock_get):
+    """
+    Test that repeated searches differing only in case and spacing hit the cache,
+    and that empty results are cached while failures are not.
+    """
+    mock_get.return_value.status_code = 200
+    mock_get.return_value.json.return_value = {"items": [{"volumeInfo": {"title": "Example Book"}}]}
+
+    search_books("The Hobbit")
+    search_books("  the   HOBBIT ")
+    assert mock_get.call_count == 1
+
+    mock_get.return_value.json.return_value = {}
+    assert search_books("nothing here") == []
+    assert search_books("nothing here") == []
+    assert mock_get.call_count == 2
+
+    mock_get.return_value.status_code = 503
+    search_books("broken")
+    search_books("broken")
+    assert mock_get.call_count == 4
+
+    stats = get_search_cache_stats()
+    assert stats["memory_hits"] == 2
+    assert stats["misses"] == 4
+
+
+
+@patch("backend.services.gapi_search_service.http_client.get")
+def test_deep_search_books_dedupes_across_pages(mock_get):
+    """
+    Test that deep search requests each page and drops books already seen on another page.
+    """
+    def page_for(url, **kwargs):
+        start = int(url.split("startIndex=")[1]) if "startIndex=" in url else 0
+        isbns = {0: ["1", "2"], 2: ["2", "3"], 4: []}[start]
+        items = [{"volumeInfo": {"title": f"Book {isbn}", "industryIdentifiers": [{"type": "ISBN_13", "identifier": isbn}]}} for isbn in isbns]
+        return MagicMock(status_code=200, json=MagicMock(return_value={"items": items}))
+    mock_get.side_effect = page_for
+
+    pages = list(deep_search_books("The Hobbit", pages=3, max_results=2))
+
+    assert sorted(page["start_index"] for page in pages) == [0, 2, 4]
+    isbns = [book["isbn"] for page in pages for book in page["books"]]
+    assert sorted(isbns) == ["1", "2", "3"]
+
+    with pytest.raises(ValueError, match="Pages must be between"):
+        deep_search_books("The Hobbit", pages=0)
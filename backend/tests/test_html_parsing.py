@@ -0,0 +1,24 @@
+import pytest
+from backend.benchmarks.html_parsing import PAGES, full_parse, load_fixture, targeted_parse
+from backend.services.html_parsing import AUTHOR_PROFILE, BOOK_SEARCH_RESULTS, parse_html
+
+
+@pytest.mark.parametrize("name, only, extractor", PAGES, ids=[f"{name}:{extractor.__name__}" for name, _, extractor in PAGES])
+def test_targeted_parse_extracts_same_results_as_full_parse(name, only, extractor):
+    markup = load_fixture(name)
+    result = targeted_parse(markup, extractor, only)
+    assert result  # The fixture actually exercises the extractor
+    assert result == full_parse(markup, extractor)
+
+
+def test_targeted_parse_skips_the_rest_of_the_page():
+    soup = parse_html(load_fixture("openlibrary_author.html"), AUTHOR_PROFILE)
+    assert soup.find("script") is None
+    assert soup.find("header") is None
+    assert soup.select_one('div[itemprop="description"]') is not None
+    assert soup.select_one(".SRPCover.bookCover img") is not None
+
+
+def test_strainers_match_multi_class_elements():
+    soup = parse_html('<ul><li class="searchResultItem sri--w-main"><a href="/works/OL1W">Book</a></li></ul>', BOOK_SEARCH_RESULTS)
+    assert soup.select_one(".searchResultItem a")["href"] == "/works/OL1W"
@@ -0,0 +1,95 @@
+from http.server import BaseHTTPRequestHandler
+import pytest
+from backend.services import http_cache
+from backend.services.bs_scrape_service import fetch_open_library_book_summary
+from backend.services.cache import ResponseCache
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    version = 1
+    requests = []
+
+    def do_GET(self):
+        etag = f'"v{PageHandler.version}"'
+        PageHandler.requests.append((self.path, self.headers.get("If-None-Match")))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = (
+            f'<html><body><div class="book-description"><p>Summary version {PageHandler.version}.</p>'
+            f'<a class="read-more__toggle">Read more</a></div></body></html>'
+        ).encode()
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server(start_stub_server):
+    PageHandler.version = 1
+    PageHandler.requests = []
+    return start_stub_server(PageHandler)
+
+
+@pytest.fixture
+def response_cache(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "http_cache.db"))
+    monkeypatch.setattr(http_cache, "_cache", cache)
+    http_cache.clear_http_cache()
+    yield cache
+    http_cache.clear_http_cache()
+
+
+def test_fresh_responses_skip_the_network(stub_server, response_cache):
+    first = http_cache.get(f"{stub_server}/page")
+    second = http_cache.get(f"{stub_server}/page")
+    assert second.text == first.text
+    assert len(PageHandler.requests) == 1
+    assert http_cache.get_http_cache_stats()["fresh_hits"] == 1
+
+
+def test_stale_responses_are_revalidated(stub_server, response_cache):
+    http_cache.get(f"{stub_server}/page")
+    response = http_cache.get(f"{stub_server}/page", max_age=0)
+    assert "Summary version 1." in response.text
+    assert PageHandler.requests[-1] == ("/page", '"v1"')
+    assert http_cache.get_http_cache_stats()["revalidated"] == 1
+
+    PageHandler.version = 2
+    response = http_cache.get(f"{stub_server}/page", max_age=0)
+    assert "Summary version 2." in response.text
+
+
+def test_parsed_results_are_reused_until_the_page_changes(stub_server, response_cache):
+    book_url = f"{stub_server}/works/OL1W"
+    assert fetch_open_library_book_summary(book_url) == "Summary version 1."
+    assert fetch_open_library_book_summary(book_url) == "Summary version 1."
+    assert http_cache.get_http_cache_stats()["parsed_hits"] == 1
+
+    PageHandler.version = 2
+    http_cache.get(book_url, max_age=0)  # Revalidation picks up the new page
+    assert fetch_open_library_book_summary(book_url) == "Summary version 2."
+    assert http_cache.get_http_cache_stats()["parsed_misses"] == 2
+
+
+def test_least_recently_used_responses_are_evicted(response_cache):
+    response_cache.max_bytes = 350
+    for name in ("a", "b", "c"):
+        response_cache.put(name, f"http://example.com/{name}", name * 100)
+    response_cache.get("a")  # Touch "a" so "b" is now the oldest
+    response_cache.put("d", "http://example.com/d", "d" * 100)
+
+    assert response_cache.get("b") is None
+    assert all(response_cache.get(name) is not None for name in ("a", "c", "d"))
+    assert response_cache.stats()["size_bytes"] == 300
+    assert response_cache.stats()["evictions"] == 1
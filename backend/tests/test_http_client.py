@@ -0,0 +1,48 @@
+from http.server import BaseHTTPRequestHandler
+import pytest
+from services import http_client
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive
+    failures_left = 1
+
+    def do_GET(self):
+        if self.path == "/flaky" and FlakyHandler.failures_left > 0:
+            FlakyHandler.failures_left -= 1
+            status, body = 503, b"try again"
+        else:
+            status, body = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server(start_stub_server):
+    return start_stub_server(FlakyHandler)
+
+def test_retries_5xx_and_reuses_connections(stub_server):
+    before = http_client.get_stats()
+
+    response = http_client.get(f"{stub_server}/flaky")
+    assert response.status_code == 200
+    for _ in range(3):
+        assert http_client.get(f"{stub_server}/steady").text == "ok"
+
+    after = http_client.get_stats()
+    assert after["retries"] - before["retries"] == 1
+    assert after["requests"] - before["requests"] == 4
+    assert after["connections_reused"] - before["connections_reused"] >= 3
+
+def test_retry_after_is_capped_at_read_timeout(monkeypatch):
+    monkeypatch.setattr(http_client, "READ_TIMEOUT", 2.0)
+    retry = http_client.CountingRetry(total=1, respect_retry_after_header=True)
+    response = type("Response", (), {"headers": {"Retry-After": "3600"}})()
+    assert retry.get_retry_after(response) == 2.0
+    response.headers = {"Retry-After": "1"}
+    assert retry.get_retry_after(response) == 1.0
+    response.headers = {}
+    assert retry.get_retry_after(response) is None
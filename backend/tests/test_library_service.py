@@ -1,34 +1,45 @@
+import json
 import pytest
 from unittest.mock import patch
+from flask import Flask
+from database.models import add_book_to_library, add_books_if_absent, get_enrichment_job_counts
 from services.library_service import (
     add_book,
     get_books,
     is_book_in_library,
     update_book_status,
+    update_book_statuses,
+    stream_books,
+    import_books,
+    get_book,
+    invalidate_library_cache,
+    library_version,
 )
 
-@patch("services.library_service.is_book_in_library")
-@patch("services.library_service.add_book_to_library")
-def test_add_book_success(mock_add_book_to_library, mock_is_book_in_library):
-    # Simulate the book not existing in the library
-    mock_is_book_in_library.return_value = None
+@pytest.fixture(autouse=True)
+def fresh_cache(temp_db):
+    # Start every test with an empty database and library read cache; each fresh database
+    # restarts the version counter the cache is keyed on
+    invalidate_library_cache()
 
+@patch("services.library_service.enqueue_book_enrichment")
+@patch("services.library_service.add_book_if_absent", return_value=True)
+def test_add_book_success(mock_add_book_if_absent, mock_enqueue):
     # Call the service function
-    add_book("The Hobbit", "J.R.R. Tolkien", "A fantasy novel", "cover.jpg")
+    assert add_book("111", "The Hobbit", ["J.R.R. Tolkien"], "A fantasy novel", "cover.jpg", "unread") is True
 
     # Assert that the database function was called with the correct arguments
-    mock_add_book_to_library.assert_called_once_with(
-        "The Hobbit", "J.R.R. Tolkien", "A fantasy novel", "cover.jpg"
+    mock_add_book_if_absent.assert_called_once_with(
+        "111", "The Hobbit", ["J.R.R. Tolkien"], "A fantasy novel", "cover.jpg", "unread"
     )
+    mock_enqueue.assert_called_once_with("The Hobbit", ["J.R.R. Tolkien"], "cover.jpg")
 
-@patch("services.library_service.is_book_in_library")
-def test_add_book_already_exists(mock_is_book_in_library):
-    # Simulate the book already existing in the library
-    mock_is_book_in_library.return_value = {"title": "The Hobbit"}
-
-    # Call the service function and expect an exception
-    with pytest.raises(Exception, match="Book 'The Hobbit' already exists in your library!"):
-        add_book("The Hobbit", "J.R.R. Tolkien", "A fantasy novel", "cover.jpg")
+@patch("services.library_service.enqueue_book_enrichment")
+@patch("services.library_service.add_book_if_absent", return_value=False)
+def test_add_book_already_exists(mock_add_book_if_absent, mock_enqueue):
+    # The insert found the book already there, so nothing else happens
+    assert add_book("111", "The Hobbit", ["J.R.R. Tolkien"], "A fantasy novel", "cover.jpg", "unread") is False
+    mock_enqueue.assert_not_called()
 
 @patch("services.library_service.get_all_books")
 def test_get_books(mock_get_all_books):
@@ -69,4 +80,113 @@ def test_update_book_status_success(mock_update_book_status):
 def test_update_book_status_invalid_status():
     # Call the service function with an invalid status and expect a ValueError
     with pytest.raises(ValueError, match="Invalid status. Valid statuses are: unread, read, currently reading"):
-        update_book_status("The Hobbit", "invalid_status")
\ No newline at end of file
+        update_book_status("The Hobbit", "invalid_status")
+
+@patch("services.library_service.update_book_statuses_in_db", return_value={"updated": 1, "not_found": ["2"]})
+def test_update_book_statuses_validates_every_entry_first(mock_update_statuses):
+    with pytest.raises(ValueError, match="Update 1: invalid status.*Update 2: ISBN is required"):
+        update_book_statuses([{"isbn": "1", "status": "read"}, {"isbn": "2", "status": "lost"}, {"status": "read"}])
+    mock_update_statuses.assert_not_called()
+
+    report = update_book_statuses([{"isbn": " 1 ", "status": "Read"}, {"isbn": "2", "status": "unread"}])
+    assert report == {"updated": 1, "not_found": ["2"]}
+    mock_update_statuses.assert_called_once_with([("1", "read"), ("2", "unread")])
+
+@patch("services.library_service.iter_books")
+def test_stream_books_formats(mock_iter_books):
+    # Simulate the database cursor yielding two books
+    mock_iter_books.side_effect = lambda: iter([
+        {"isbn": "1", "title": "The Hobbit", "authors": ["J.R.R. Tolkien"], "description": "", "cover_art": "", "status": "read"},
+        {"isbn": "2", "title": "1984", "authors": ["George Orwell"], "description": "", "cover_art": "", "status": "unread"},
+    ])
+
+    assert json.loads("".join(stream_books("json")))[1]["title"] == "1984"
+    assert len("".join(stream_books("ndjson")).splitlines()) == 2
+    assert "".join(stream_books("csv")).splitlines()[1].startswith("1,The Hobbit,J.R.R. Tolkien")
+
+    with pytest.raises(ValueError, match="Invalid format"):
+        stream_books("xml")
+
+
+@patch("services.library_service.add_books_if_absent")
+def test_import_books_dedupes_and_reports_failures(mock_add_books_if_absent):
+    # Simulate one ISBN already being in the library
+    mock_add_books_if_absent.side_effect = lambda books: [book["isbn"] != "111" for book in books]
+
+    report = import_books([
+        {"isbn": "111", "title": "The Hobbit", "authors": "J.R.R. Tolkien", "description": "A fantasy novel"},
+        {"isbn": "222", "title": "1984", "authors": ["George Orwell"], "description": "A dystopia"},
+        {"isbn": "333", "title": "1984", "authors": ["George Orwell"], "description": "Duplicate title"},
+        {"isbn": "444", "title": "", "authors": "Nobody", "description": ""},
+    ], chunk_size=10)
+
+    assert report["received"] == 4
+    assert report["inserted"] == 1
+    assert report["duplicates"] == 2
+    assert [failure["row"] for failure in report["failed"]] == [3]
+    attempted = mock_add_books_if_absent.call_args[0][0]
+    assert [book["isbn"] for book in attempted] == ["111", "222"]
+
+
+def test_import_books_shows_committed_chunks_when_a_later_chunk_fails():
+    assert get_books() == []
+    calls = []
+
+    def insert_then_fail(books):
+        calls.append(books)
+        if len(calls) > 1:
+            raise Exception("disk I/O error")
+        return add_books_if_absent(books)
+
+    records = [{"isbn": str(i), "title": f"Book {i}", "authors": "Someone", "description": "A book"} for i in range(2)]
+    with patch("services.library_service.add_books_if_absent", side_effect=insert_then_fail), \
+         patch("services.library_service.enqueue_book_enrichment"):
+        with pytest.raises(Exception, match="disk I/O error"):
+            import_books(records, chunk_size=1)
+    assert [book["isbn"] for book in get_books()] == ["0"]  # The committed first chunk is visible
+
+def test_import_books_queues_enrichment_for_new_books():
+    add_book_to_library("111", "The Hobbit", ["J.R.R. Tolkien"], "A fantasy novel", "")
+    report = import_books([
+        {"isbn": "111", "title": "The Hobbit", "authors": "J.R.R. Tolkien", "description": "Already there"},
+        {"isbn": "222", "title": "1984", "authors": ["George Orwell"], "description": "A dystopia",
+         "cover_art": "http://books.google.com/1984.jpg"},
+        {"isbn": "333", "title": "Emma", "authors": ["Jane Austen"], "description": "A comedy"},
+    ], chunk_size=2)
+
+    assert report["inserted"] == 2
+    # A summary, bio, and quotes for each new book, plus the cover of 1984; nothing for the duplicate
+    assert get_enrichment_job_counts() == {"pending": 7}
+
+@patch("services.library_service.enqueue_book_enrichment")
+@patch("services.library_service.get_book_by_isbn")
+def test_reads_are_cached_until_a_write(mock_get_book_by_isbn, mock_enqueue):
+    mock_get_book_by_isbn.return_value = {"isbn": "111", "title": "The Hobbit"}
+
+    assert get_book("111")["title"] == "The Hobbit"
+    assert get_book("111")["title"] == "The Hobbit"
+    assert mock_get_book_by_isbn.call_count == 1
+
+    # Adding a book bumps the library version, so the next read goes back to the database
+    add_book("222", "1984", ["George Orwell"], "A dystopia", "cover.jpg", "unread")
+    get_book("111")
+    assert mock_get_book_by_isbn.call_count == 2
+
+def test_writes_outside_the_service_are_seen_by_cached_reads():
+    from routes.library_routes import library_bp
+
+    app = Flask(__name__)
+    app.register_blueprint(library_bp)
+    client = app.test_client()
+    first = client.get("/api/get_books")
+    assert first.get_json() == []
+    assert first.headers["ETag"] == f'"library-{library_version()}"'
+
+    # Another process (manage.py, a second worker) writes straight to the database
+    add_book_to_library("111", "The Hobbit", ["J.R.R. Tolkien"], "A fantasy novel", "cover.jpg")
+
+    second = client.get("/api/get_books", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert [book["isbn"] for book in second.get_json()] == ["111"]
+    assert [book["isbn"] for book in get_books()] == ["111"]
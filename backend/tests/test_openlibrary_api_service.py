@@ -0,0 +1,96 @@
+import json
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import parse_qs, urlparse
+import pytest
+from backend.services import open_library, openlibrary_api_service
+
+# Canned Open Library API responses, keyed by path
+RESPONSES = {
+    "/search/authors.json": {"numFound": 2, "docs": [
+        {"key": "OL1A", "name": "Ursula Le Guin Society"},
+        {"key": "OL26320A", "name": "Ursula K. Le Guin"},
+    ]},
+    "/authors/OL26320A.json": {
+        "name": "Ursula K. Le Guin",
+        "bio": {"type": "/type/text", "value": "First paragraph.\r\n\r\nSecond paragraph."},
+        "photos": [-1, 6188455],
+    },
+    "/search.json": {"numFound": 1, "docs": [{"key": "/books/OL7M"}]},
+    "/books/OL7M.json": {"title": "The Left Hand of Darkness", "works": [{"key": "/works/OL59863W"}]},
+    "/works/OL59863W.json": {"title": "The Left Hand of Darkness", "description": "A summary from the work."},
+}
+
+
+class OpenLibraryHandler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        OpenLibraryHandler.requests.append((url.path, parse_qs(url.query)))
+        query = parse_qs(url.query).get("q", [""])[0]
+        data = RESPONSES.get(url.path)
+        if url.path.startswith("/search") and query == "nothing":
+            data = {"numFound": 0, "docs": []}
+        status, body = (200, json.dumps(data).encode()) if data is not None else (404, b"{}")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# Resolved authors are memoized in the database, so give each test a fresh one
+pytestmark = pytest.mark.usefixtures("temp_db")
+
+
+@pytest.fixture
+def stub_server(start_stub_server, monkeypatch):
+    OpenLibraryHandler.requests = []
+    base_url = start_stub_server(OpenLibraryHandler)
+    monkeypatch.setattr(openlibrary_api_service, "OPEN_LIBRARY_URL", base_url)
+    return base_url
+
+
+def test_search_author_picks_best_match(stub_server):
+    assert openlibrary_api_service.search_open_library_author("Ursula K. Le Guin") == f"{stub_server}/authors/OL26320A"
+    assert OpenLibraryHandler.requests[0][1]["q"] == ["Ursula K Le Guin"]
+
+
+def test_author_bio_matches_scraper_shape(stub_server):
+    bio = openlibrary_api_service.fetch_open_library_author_bio("Ursula K. Le Guin")
+    assert bio == {
+        "biography": "First paragraph.\n\nSecond paragraph.",
+        "image_url": "https://covers.openlibrary.org/a/id/6188455-M.jpg",
+    }
+
+
+def test_author_bio_not_found(stub_server):
+    bio = openlibrary_api_service.fetch_open_library_author_bio("nothing")
+    assert bio == {"biography": "No biography found for this author on Open Library.", "image_url": None}
+
+
+def test_book_summary_falls_back_to_work_description(stub_server):
+    book_url = openlibrary_api_service.search_open_library_book("The Left Hand of Darkness")
+    assert book_url == f"{stub_server}/books/OL7M"
+    assert openlibrary_api_service.fetch_open_library_book_summary(book_url) == "A summary from the work."
+
+
+def test_book_summary_raises_on_upstream_error(stub_server):
+    with pytest.raises(Exception, match="Failed to fetch Open Library book page."):
+        openlibrary_api_service.fetch_open_library_book_summary(f"{stub_server}/books/OL404M")
+
+
+def test_dispatcher_uses_configured_backend(stub_server, monkeypatch):
+    monkeypatch.setattr(open_library, "OPEN_LIBRARY_BACKEND", "api")
+    assert open_library.get_backend() is openlibrary_api_service
+    assert open_library.fetch_book_summary_by_title("The Left Hand of Darkness") == "A summary from the work."
+    assert open_library.fetch_book_summary_by_title("nothing") is None
+
+
+def test_dispatcher_rejects_unknown_backend(monkeypatch):
+    monkeypatch.setattr(open_library, "OPEN_LIBRARY_BACKEND", "carrier-pigeon")
+    with pytest.raises(ValueError, match="Unknown Open Library backend"):
+        open_library.get_backend()
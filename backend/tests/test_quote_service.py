@@ -0,0 +1,91 @@
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from backend.services import quote_service
+
+TODAY = datetime(2025, 3, 2, 12, 0, tzinfo=timezone.utc)
+YESTERDAYS_QUOTE = {"quote": "Yesterday's quote.", "author": "Someone"}
+TODAYS_QUOTE = {"quote": "Today's quote.", "author": "Someone Else"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_quote_cache(monkeypatch):
+    monkeypatch.setattr(quote_service, "_now", lambda: TODAY)
+    quote_service._current.update(date=None, quote=None, fetched_at=None, error=None, failed_at=None)
+    yield
+    quote_service._current.update(date=None, quote=None, fetched_at=None, error=None, failed_at=None)
+
+
+def wait_for_refresh():
+    deadline = time.monotonic() + 2
+    while quote_service._refreshing.locked() and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_first_request_scrapes_then_serves_from_cache():
+    with patch("backend.services.quote_service.quote_of_the_day", return_value=TODAYS_QUOTE) as scrape:
+        assert quote_service.get_quote_of_the_day() == TODAYS_QUOTE
+        assert quote_service.get_quote_of_the_day() == TODAYS_QUOTE
+    assert scrape.call_count == 1
+    assert quote_service.get_quote_cache_stats()["date"] == "2025-03-02"
+
+
+def test_previous_days_quote_is_served_while_refreshing_in_background():
+    quote_service._current.update(date="2025-03-01", quote=YESTERDAYS_QUOTE, fetched_at=time.time())
+
+    def slow_scrape():
+        time.sleep(0.2)
+        return TODAYS_QUOTE
+
+    with patch("backend.services.quote_service.quote_of_the_day", side_effect=slow_scrape):
+        started = time.perf_counter()
+        assert quote_service.get_quote_of_the_day() == YESTERDAYS_QUOTE
+        assert time.perf_counter() - started < 0.1
+        time.sleep(0.05)
+        wait_for_refresh()
+    assert quote_service.get_quote_of_the_day() == TODAYS_QUOTE
+
+
+def test_failed_refresh_keeps_previous_quote():
+    quote_service._current.update(date="2025-03-01", quote=YESTERDAYS_QUOTE, fetched_at=time.time())
+    with patch("backend.services.quote_service.quote_of_the_day", return_value={"error": "No quote of the day found."}):
+        assert quote_service.refresh_quote_of_the_day(wait=True) is False
+        assert quote_service.get_quote_of_the_day() == YESTERDAYS_QUOTE
+        wait_for_refresh()
+    assert quote_service.get_quote_cache_stats()["last_error"] == "No quote of the day found."
+
+
+def test_cold_start_failure_returns_error():
+    with patch("backend.services.quote_service.quote_of_the_day", return_value={"error": "Failed to fetch the quote of the day."}):
+        assert quote_service.get_quote_of_the_day() == {"error": "Failed to fetch the quote of the day."}
+
+
+def test_failed_scrapes_are_retried_only_after_the_retry_interval(monkeypatch):
+    failure = {"error": "Failed to fetch the quote of the day."}
+    with patch("backend.services.quote_service.quote_of_the_day", return_value=failure) as scrape:
+        assert quote_service.get_quote_of_the_day() == failure
+        assert quote_service.get_quote_of_the_day() == failure
+        assert scrape.call_count == 1  # Cold start: no second blocking scrape
+
+        quote_service._current.update(date="2025-03-01", quote=YESTERDAYS_QUOTE, fetched_at=time.time())
+        for _ in range(3):
+            assert quote_service.get_quote_of_the_day() == YESTERDAYS_QUOTE
+        wait_for_refresh()
+        assert scrape.call_count == 1  # Stale quote: no background scrape per request
+
+    later = TODAY + timedelta(seconds=quote_service.QUOTE_RETRY_INTERVAL)
+    monkeypatch.setattr(quote_service, "_now", lambda: later)
+    with patch("backend.services.quote_service.quote_of_the_day", return_value=TODAYS_QUOTE):
+        assert quote_service.get_quote_of_the_day() == YESTERDAYS_QUOTE
+        time.sleep(0.05)
+        wait_for_refresh()
+    assert quote_service.get_quote_of_the_day() == TODAYS_QUOTE
+
+
+def test_rollover_happens_shortly_after_utc_midnight():
+    just_after_midnight = datetime(2025, 3, 2, 0, 1, tzinfo=timezone.utc)
+    assert quote_service._quote_date(just_after_midnight) == "2025-03-01"
+    assert quote_service._seconds_until_rollover(just_after_midnight) == quote_service.QUOTE_REFRESH_DELAY - 60
+    assert quote_service._quote_date(TODAY) == "2025-03-02"
+    assert quote_service._seconds_until_rollover(TODAY) == 12 * 3600 + quote_service.QUOTE_REFRESH_DELAY
@@ -0,0 +1,38 @@
+from flask import Flask
+from routes.rate_limit import TokenBucketLimiter, rate_limited
+
+def test_bucket_allows_burst_then_refills():
+    limiter = TokenBucketLimiter(rate=1, capacity=3)
+
+    assert [limiter.acquire("client", now=0)[0] for _ in range(4)] == [True, True, True, False]
+    allowed, retry_after = limiter.acquire("client", now=0)
+    assert not allowed and retry_after == 1
+
+    # Another client has its own bucket
+    assert limiter.acquire("other", now=0)[0]
+    # Half a second later the first client still has no whole token; a second later it does
+    assert not limiter.acquire("client", now=0.5)[0]
+    assert limiter.acquire("client", now=1.0)[0]
+
+def test_idle_and_excess_buckets_are_dropped():
+    limiter = TokenBucketLimiter(rate=1, capacity=2, max_keys=2)
+    for client in ("a", "b", "c"):
+        limiter.acquire(client, now=0)
+    assert limiter.stats()["tracked_clients"] == 2
+
+    limiter.acquire("d", now=10)  # Everything else has been idle long enough to refill
+    assert limiter.stats()["tracked_clients"] == 1
+
+def test_decorator_returns_429_with_retry_after():
+    app = Flask(__name__)
+
+    @app.route("/limited")
+    @rate_limited(rate=0.5, burst=1)
+    def limited():
+        return "ok"
+
+    client = app.test_client()
+    assert client.get("/limited").status_code == 200
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "2"
@@ -0,0 +1,62 @@
+import threading
+import time
+from backend.services.single_flight import SingleFlight, coalesced, get_single_flight_stats
+
+
+def run_concurrently(func, count):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def call(i):
+        barrier.wait()
+        try:
+            results[i] = func()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"biography": "Shared."}
+
+    results = run_concurrently(lambda: group.do("Ursula K. Le Guin", fetch), 10)
+    assert len(calls) == 1
+    assert all(result == {"biography": "Shared."} for result in results)
+    assert group.stats() == {"executions": 1, "coalesced": 9, "in_flight": 0, "coalesced_rate": 0.9}
+
+
+def test_errors_are_shared_and_not_remembered():
+    group = SingleFlight()
+
+    def failing():
+        time.sleep(0.2)
+        raise Exception("Failed to fetch Open Library author page.")
+
+    results = run_concurrently(lambda: group.do("key", failing), 5)
+    assert all(str(result) == "Failed to fetch Open Library author page." for result in results)
+    assert group.do("key", lambda: "recovered") == "recovered"  # Finished calls aren't reused
+
+
+def test_different_keys_run_separately():
+    @coalesced
+    def lookup_for_test(name):
+        time.sleep(0.1)
+        return name.upper()
+
+    results = run_concurrently(lambda: [lookup_for_test("a"), lookup_for_test("b")], 4)
+    assert results == [["A", "B"]] * 4
+    stats = get_single_flight_stats()["test_different_keys_run_separately.<locals>.lookup_for_test"]
+    assert stats["executions"] + stats["coalesced"] == 8
+    assert stats["executions"] >= 2